@@ -0,0 +1,8 @@
+"""
+합성 공장 데이터 생성기와 라우터 엔드포인트 벤치마크.
+
+    python -m bench.generate --scale small --out bench-data          # Turtle + Cypher 파일 생성
+    python -m bench.run --mode fake --scale small --save base.json   # 가짜 DB 실행 함수 (Python 측 오버헤드만)
+    python -m bench.run --mode neo4j --scale small --load            # 로컬 Neo4j에 적재 후 측정
+    python -m bench.run --mode fake --compare base.json              # 저장된 결과와 비교
+"""
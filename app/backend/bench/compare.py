@@ -0,0 +1,74 @@
+"""
+저장된 벤치마크 결과 비교 (커밋 간 회귀 확인).
+
+    python -m bench.compare base.json new.json --threshold 0.1 --fail-on-regression
+"""
+import argparse
+import json
+from typing import List
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old if old else 0.0
+
+
+def compare(base: dict, new: dict, threshold: float = 0.1) -> List[dict]:
+    """시나리오별 p50·p99·처리량 변화율. p50 또는 p99가 threshold 이상 느려지면 regression."""
+    rows = []
+    for name, cur in new["results"].items():
+        old = base["results"].get(name)
+        if old is None:
+            continue
+        p50 = _change(old["p50"], cur["p50"])
+        p99 = _change(old["p99"], cur["p99"])
+        rows.append({
+            "scenario": name,
+            "p50": (old["p50"], cur["p50"], p50),
+            "p99": (old["p99"], cur["p99"], p99),
+            "throughput": (old["throughput"], cur["throughput"], _change(old["throughput"], cur["throughput"])),
+            "regression": p50 >= threshold or p99 >= threshold,
+        })
+    return rows
+
+
+def _meta(result: dict) -> str:
+    meta = result.get("meta", {})
+    return f"{meta.get('commit', '?')} ({meta.get('mode', '?')}, {meta.get('scale', '?')})"
+
+
+def print_comparison(base: dict, new: dict, rows: List[dict]) -> int:
+    """비교 표 출력. 회귀 건수 반환."""
+    print(f"base: {_meta(base)}  new: {_meta(new)}")
+    print(f"{'scenario':<44} {'p50 ms':>21} {'p99 ms':>21} {'req/s':>19}")
+    for row in rows:
+        cells = []
+        for key in ("p50", "p99", "throughput"):
+            old, cur, change = row[key]
+            cells.append(f"{old:8.2f}->{cur:8.2f} {change:+6.1%}" if key != "throughput"
+                         else f"{old:7.0f}->{cur:7.0f} {change:+6.1%}")
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['scenario']:<44} {cells[0]:>21} {cells[1]:>21} {cells[2]:>19}{flag}")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{len(rows)} scenarios compared, {regressions} regressions")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two saved benchmark runs")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown counted as regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+    base, new = load(args.base), load(args.new)
+    regressions = print_comparison(base, new, compare(base, new, args.threshold))
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
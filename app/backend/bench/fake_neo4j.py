@@ -0,0 +1,474 @@
+"""
+벤치마크용 가짜 Neo4j: 합성 공장을 메모리 그래프로 만들고 등록된 쿼리 이름(db.queries)별로 결과 행을 돌려줌.
+DB 시간을 빼고 라우터·서비스·직렬화의 Python 측 오버헤드만 측정하기 위한 것이며 Cypher를 해석하지 않음.
+쓰기 쿼리는 상태를 바꾸지 않아 반복 실행해도 결과가 같음.
+"""
+import bisect
+import re
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from neo4j import Record
+
+from db.queries import query_name
+from services.oee import COUNTER_FIELDS
+from services.quality import GRANULARITIES, truncate
+
+# (관계 id, 타입, 시작 uri, 끝 uri)
+_Rel = Tuple[str, str, str, str]
+
+
+class FakeGraph:
+    """합성 공장의 노드·관계와 미리 계산한 OEE 카운터·품질 롤업."""
+
+    def __init__(self, plant):
+        self.nodes: Dict[str, dict] = {}
+        self.out: Dict[str, List[_Rel]] = defaultdict(list)
+        self.inc: Dict[str, List[_Rel]] = defaultdict(list)
+        self._n_rels = 0
+        for section, rows in plant.sections():
+            getattr(self, f"_add_{section}")(rows)
+        self.uris = sorted(self.nodes)
+        self.triples = sorted(
+            (rel[2], rel[1], rel[3], rel[0]) for rels in self.out.values() for rel in rels
+        )
+        self.counters = self._counters()
+        self.rollups = self._rollups()
+
+    def _node(self, uri: str, label: str, name: Optional[str] = None, **props) -> None:
+        self.nodes[uri] = {"uri": uri, "types": ["Resource", label], "rdfs__label": name, **props}
+
+    def _rel(self, rel_type: str, src: str, dst: str) -> None:
+        self._n_rels += 1
+        rel = (f"5:fake:{self._n_rels:012d}", rel_type, src, dst)
+        self.out[src].append(rel)
+        self.inc[dst].append(rel)
+
+    def _add_equipment(self, rows) -> None:
+        for row in rows:
+            self._node(row["id"], "Equipment", row["name"], status=row["status"])
+            if row["parent"]:
+                self._rel("hasPart", row["parent"], row["id"])
+
+    def _add_processes(self, rows) -> None:
+        for row in rows:
+            self._node(row["id"], "Process", row["name"])
+            for op in row["operations"]:
+                self._node(op["id"], "Operation", op["name"], duration=op["duration"])
+            for src, dst in row["edges"]:
+                self._rel("precedes", src, dst)
+
+    def _add_products(self, rows) -> None:
+        for row in rows:
+            self._node(row["id"], "Product", row["name"])
+
+    def _add_work_orders(self, rows) -> None:
+        for row in rows:
+            self._node(row["id"], "WorkOrder", **{k: row[k] for k in (
+                "workOrderNumber", "plannedQuantity", "actualQuantity", "status")})
+            self._rel("executedBy", row["id"], row["equipmentId"])
+
+    def _add_quality(self, rows) -> None:
+        for row in rows:
+            self._node(row["id"], "QualityControl", qualityResult=row["qualityResult"],
+                       timestamp=datetime.fromisoformat(row["timestamp"]))
+            self._rel("hasQuality", row["productId"], row["id"])
+
+    def _add_maintenance(self, rows) -> None:
+        for row in rows:
+            self._node(row["id"], "Maintenance", maintenanceType=row["maintenanceType"],
+                       timestamp=datetime.fromisoformat(row["timestamp"]))
+            self._rel("hasMaintenance", row["equipmentId"], row["id"])
+
+    def _counters(self) -> Dict[str, dict]:
+        counters: Dict[str, dict] = {}
+        for uri, node in self.nodes.items():
+            if "WorkOrder" not in node["types"]:
+                continue
+            equipment = self.out[uri][0][3]
+            c = counters.setdefault(equipment, {f: 0 for f in COUNTER_FIELDS})
+            completed = node["status"] == "completed"
+            met = node["actualQuantity"] >= node["plannedQuantity"]
+            c["totalOrders"] += 1
+            c["completedOrders"] += completed
+            c["metTargetOrders"] += met
+            c["completedMetOrders"] += completed and met
+            c["plannedQuantity"] += node["plannedQuantity"]
+            c["actualQuantity"] += node["actualQuantity"]
+        return counters
+
+    def _rollups(self) -> Dict[str, List[dict]]:
+        counts: Dict[Tuple[str, datetime, str], int] = defaultdict(int)
+        for node in self.nodes.values():
+            if "QualityControl" in node["types"]:
+                for g in GRANULARITIES:
+                    counts[(g, truncate(node["timestamp"], g), node["qualityResult"])] += 1
+        rollups: Dict[str, List[dict]] = defaultdict(list)
+        for (g, bucket, result), n in sorted(counts.items()):
+            rollups[g].append({"bucket": bucket, "result": result, "count": n})
+        return rollups
+
+    def label(self, uri: str):
+        node = self.nodes[uri]
+        return node.get("rdfs__label") or node["types"][-1]
+
+    def has_label(self, uri: str, label: str) -> bool:
+        node = self.nodes.get(uri)
+        return node is not None and label in node["types"]
+
+
+# ---- 쿼리 이름별 결과 ----
+def _lines(g: FakeGraph, p: dict) -> List[dict]:
+    return [
+        {"id": u, "name": g.label(u), "types": g.nodes[u]["types"]}
+        for u in g.uris if g.has_label(u, "Equipment") and "Equipment" in u
+    ]
+
+
+def _line(g: FakeGraph, p: dict) -> List[dict]:
+    uri = p["line_id"]
+    if not g.has_label(uri, "Equipment"):
+        return []
+    rels = g.out[uri] or [None]
+    return [
+        {"e": g.nodes[uri], "r": rel and {"type": rel[1]}, "related": rel and g.nodes[rel[3]]}
+        for rel in rels
+    ]
+
+
+def _work_orders(g: FakeGraph, p: dict) -> List[dict]:
+    rows = []
+    for uri, node in g.nodes.items():
+        if "WorkOrder" in node["types"]:
+            equipment = g.out[uri][0][3]
+            rows.append({"id": uri, **{k: node[k] for k in (
+                "workOrderNumber", "plannedQuantity", "actualQuantity", "status")},
+                "equipmentName": g.label(equipment)})
+    return rows
+
+
+def _quality(g: FakeGraph, p: dict) -> List[dict]:
+    return [
+        {"id": rel[3], "qualityResult": g.nodes[rel[3]]["qualityResult"], "timestamp": g.nodes[rel[3]]["timestamp"]}
+        for rel in g.out.get(p["product_id"], ()) if rel[1] == "hasQuality"
+    ]
+
+
+def _maintenance(g: FakeGraph, uri: str) -> List[dict]:
+    rows = [
+        {"id": rel[3], "maintenanceType": g.nodes[rel[3]]["maintenanceType"], "timestamp": g.nodes[rel[3]]["timestamp"]}
+        for rel in g.out.get(uri, ()) if rel[1] == "hasMaintenance"
+    ]
+    rows.sort(key=lambda r: r["timestamp"], reverse=True)
+    return rows
+
+
+def _equipment_status(g: FakeGraph, p: dict) -> List[dict]:
+    uri = p["equipment_id"]
+    if not g.has_label(uri, "Equipment"):
+        return []
+    history = _maintenance(g, uri)
+    last = history[0] if history else {}
+    return [{"id": uri, "status": g.nodes[uri]["status"],
+             "lastMaintenance": last.get("timestamp"), "maintenanceType": last.get("maintenanceType")}]
+
+
+def _set_status(g: FakeGraph, p: dict) -> List[dict]:
+    uri = p["equipment_id"]
+    return [{"id": uri, "status": p["status"]}] if g.has_label(uri, "Equipment") else []
+
+
+def _snapshot(g: FakeGraph, p: dict) -> List[dict]:
+    return [{"equipmentId": u, "status": g.nodes[u]["status"]}
+            for u in p["equipment_ids"] if g.has_label(u, "Equipment")]
+
+
+def _counter_row(equipment: str, c: dict) -> dict:
+    return {"equipmentId": equipment, **c}
+
+
+def _fleet(g: FakeGraph, p: dict) -> List[dict]:
+    ids = p.get("equipment_ids")
+    contains = p.get("contains")
+    return [
+        _counter_row(e, c) for e, c in sorted(g.counters.items())
+        if (ids is None or e in ids) and (contains is None or contains in e)
+    ]
+
+
+def _efficiency(g: FakeGraph, p: dict) -> List[dict]:
+    c = g.counters.get(p["equipment_id"])
+    return [_counter_row(p["equipment_id"], c)] if c else []
+
+
+def _trend(g: FakeGraph, p: dict) -> List[dict]:
+    buckets = g.rollups.get(p["granularity"], [])
+    return [r for r in buckets if r["bucket"] >= p["start"]]
+
+
+def _hierarchy(g: FakeGraph, p: dict) -> List[dict]:
+    return [
+        {"parentId": rel[2], "parentName": g.nodes[rel[2]]["rdfs__label"],
+         "childId": rel[3], "childName": g.nodes[rel[3]]["rdfs__label"]}
+        for rels in g.out.values() for rel in rels if rel[1] == "hasPart"
+    ]
+
+
+def _equipment_index(g: FakeGraph, p: dict) -> List[dict]:
+    return [
+        {"id": u, "name": g.nodes[u]["rdfs__label"],
+         "children": [rel[3] for rel in g.out.get(u, ()) if rel[1] == "hasPart"]}
+        for u in g.uris if g.has_label(u, "Equipment")
+    ]
+
+
+def _process_flow(g: FakeGraph, p: dict) -> List[dict]:
+    root = p["process_id"]
+    if not g.has_label(root, "Process"):
+        return []
+    seen = {root}
+    frontier = [root]
+    edges = []
+    for _ in range(p["max_depth"]):
+        nxt = []
+        for uri in frontier:
+            for rel in g.out.get(uri, ()):
+                if rel[1] != "precedes":
+                    continue
+                edges.append([rel[2], rel[3]])
+                if rel[3] not in seen:
+                    seen.add(rel[3])
+                    nxt.append(rel[3])
+        frontier = nxt
+    truncated = any(rel[1] == "precedes" for uri in frontier for rel in g.out.get(uri, ()))
+    operations = [
+        {"id": u, "name": g.nodes[u]["rdfs__label"], "labels": g.nodes[u]["types"],
+         "duration": g.nodes[u].get("duration", 1)}
+        for u in seen if u != root
+    ]
+    return [{"operations": operations, "edges": edges, "truncated": truncated}]
+
+
+def _node_summary(g: FakeGraph, uri: str) -> dict:
+    return {"label": g.label(uri), "types": g.nodes[uri]["types"]}
+
+
+def _elements(g: FakeGraph, p: dict) -> List[dict]:
+    start = bisect.bisect_right(g.uris, p["after"]) if p.get("after") else 0
+    rows = []
+    for uri in g.uris[start:start + p["fetch"]]:
+        edges = [
+            {"id": rel[0], "rel": rel[1], "target": rel[3], **_node_summary(g, rel[3])}
+            for rel in g.out.get(uri, ())[:p["edge_limit"]]
+        ]
+        rows.append({"id": uri, **_node_summary(g, uri), "edges": edges})
+    return rows
+
+
+def _expand(direction: str) -> Callable[[FakeGraph, dict], List[dict]]:
+    def run(g: FakeGraph, p: dict) -> List[dict]:
+        uri = p["node_id"]
+        if uri not in g.nodes:
+            return []
+        rels = []
+        if direction in ("out", "both"):
+            rels += [(rel, True, rel[3]) for rel in g.out.get(uri, ())]
+        if direction in ("in", "both"):
+            rels += [(rel, False, rel[2]) for rel in g.inc.get(uri, ())]
+        rel_types = p.get("rel_types")
+        after = p.get("after")
+        rels = sorted(
+            (r for r in rels if (rel_types is None or r[0][1] in rel_types) and (after is None or r[0][0] > after)),
+            key=lambda r: r[0][0],
+        )[:p["fetch"]]
+        edges = [
+            {"id": rel[0], "rel": rel[1], "outgoing": outgoing, "neighbor": other, **_node_summary(g, other)}
+            for rel, outgoing, other in rels
+        ]
+        return [{"id": uri, **_node_summary(g, uri), "edges": edges}]
+    return run
+
+
+_TRIPLE_TYPE = re.compile(r"-\[r?:`((?:[^`]|``)*)`\]->")
+
+
+def _triple_filter(cypher: str, params: dict) -> dict:
+    """플래너 Cypher의 관계 타입(패턴에 포함)과 estimate 컬럼 여부를 파라미터로 추출."""
+    m = _TRIPLE_TYPE.search(cypher)
+    extra = {"estimate": "AS estimate" in cypher}
+    if m:
+        extra["predicate"] = m.group(1).replace("``", "`")
+    return {**params, **extra}
+
+
+def _triples(g: FakeGraph, p: dict) -> List[dict]:
+    start = bisect.bisect_left(g.triples, (p.get("subject") or p.get("subject_prefix") or "",))
+    if "c_s" in p:
+        start = max(start, bisect.bisect_right(g.triples, (p["c_s"], p["c_p"], p["c_o"], p["c_r"])))
+    rows = []
+    limit = p.get("limit")
+    for s, pred, o, rid in g.triples[start:]:
+        if ("subject" in p and s != p["subject"]) or ("subject_prefix" in p and not s.startswith(p["subject_prefix"])):
+            break
+        if ("predicate" in p and pred != p["predicate"]) or ("object" in p and o != p["object"]) \
+                or ("object_prefix" in p and not o.startswith(p["object_prefix"])):
+            continue
+        rows.append({"subject": s, "predicate": pred, "object": o,
+                     "subject_label": g.nodes[s]["rdfs__label"], "object_label": g.nodes[o]["rdfs__label"],
+                     "rid": rid})
+        if limit and len(rows) >= limit:
+            break
+    if p["estimate"]:
+        anchor, rels = (p["subject"], g.out) if "subject" in p else (p["object"], g.inc)
+        degree = sum(1 for rel in rels.get(anchor, ()) if "predicate" not in p or rel[1] == p["predicate"])
+        for row in rows:
+            row["estimate"] = degree
+    return rows
+
+
+def _triple_stats(g: FakeGraph, p: dict) -> List[dict]:
+    types: Dict[str, int] = defaultdict(int)
+    for _, pred, _, _ in g.triples:
+        types[pred] += 1
+    resources = sum(1 for n in g.nodes.values() if "Resource" in n["types"])
+    return [{"resources": resources, "relationships": len(g.triples), "types": dict(types)}]
+
+
+def _ingest(p: dict) -> List[dict]:
+    return [{"idx": row["idx"], "created": True, "linked": True} for row in p["rows"]]
+
+
+HANDLERS: Dict[str, Callable[[FakeGraph, dict], List[dict]]] = {
+    "manufacturing.lines": _lines,
+    "manufacturing.line": _line,
+    "manufacturing.work_orders": _work_orders,
+    "manufacturing.quality": _quality,
+    "manufacturing.equipment.status": _equipment_status,
+    "manufacturing.equipment.status.update": _set_status,
+    "manufacturing.equipment.maintenance_history": lambda g, p: _maintenance(g, p["equipment_id"]),
+    "manufacturing.events.snapshot": _snapshot,
+    "manufacturing.work_order.create": lambda g, p: [{"id": p["id"], "linked": p["equipmentId"] in g.nodes}],
+    "manufacturing.work_order.update": lambda g, p: [
+        {"id": p["id"], "status": p["status"], "actualQuantity": p["actualQuantity"],
+         "equipmentId": g.out[p["id"]][0][3]}
+    ] if p["id"] in g.nodes else [],
+    "manufacturing.ingest.work_orders": lambda g, p: _ingest(p),
+    "manufacturing.ingest.quality": lambda g, p: _ingest(p),
+    "manufacturing.ingest.maintenance": lambda g, p: _ingest(p),
+    "analytics.efficiency": _efficiency,
+    "analytics.efficiency.fleet": _fleet,
+    "analytics.efficiency.fleet.ids": _fleet,
+    "analytics.efficiency.fleet.contains": _fleet,
+    "analytics.efficiency.rebuild": lambda g, p: [{"equipmentCount": len(g.counters)}],
+    "analytics.quality_trend": _trend,
+    "analytics.quality_trend.rebuild": lambda g, p: [{"bucketCount": sum(map(len, g.rollups.values()))}],
+    "graph.elements": _elements,
+    "graph.elements.after": _elements,
+    "graph.expand.out": _expand("out"),
+    "graph.expand.in": _expand("in"),
+    "graph.expand.both": _expand("both"),
+    "graph.process_flow": _process_flow,
+    "graph.equipment_hierarchy": _hierarchy,
+    "graph.equipment_index.load": _equipment_index,
+    "ontology.triples": _triples,
+    "ontology.triples.stats": _triple_stats,
+    "ontology.triple_index.load": _triples,
+    "ontology.triples.create": lambda g, p: [{"rel": None}],
+    "ontology.triples.delete": lambda g, p: [{"deleted": 1}],
+    "ontology.nodes.delete": lambda g, p: [
+        {"deleted": 1, "labels": g.nodes[p["node_id"]]["types"], "rels": []}
+    ] if p["node_id"] in g.nodes else [{"deleted": 0, "labels": [], "rels": []}],
+}
+
+
+class _FakeResult(list):
+    def consume(self):
+        return None
+
+
+class FakeNeo4j:
+    """neo4j_read / neo4j_write / neo4j_run / neo4j_read_async / neo4j_stream_async / neo4j_transaction 대체. 처리하지 못한 쿼리 이름을 집계."""
+
+    def __init__(self, graph: FakeGraph):
+        self.graph = graph
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.unhandled: Dict[str, int] = defaultdict(int)
+
+    def rows(self, cypher: str, params: dict) -> List[Record]:
+        """핸들러 결과를 드라이버와 같은 Record로 반환 (응답 직렬화 경로도 실제와 동일하게 측정)."""
+        return [Record(row) for row in self._rows(cypher, params)]
+
+    def _rows(self, cypher: str, params: dict) -> List[dict]:
+        name = query_name(cypher)
+        if "AS subject_label" in cypher:
+            # Triple 조회 플래너의 모든 변형과 Triple 미러 로드 (관계 타입은 Cypher 패턴에 포함)
+            name = "ontology.triples" if "AS rid" in cypher else "ontology.triple_index.load"
+            params = _triple_filter(cypher, params)
+        elif name is None:
+            # 등록되지 않은 동적 변형: predicate별 벌크 Triple 쿼리
+            if "subjectFound" in cypher:
+                name = "ontology.triples.bulk_add"
+            elif "size(rels) AS deleted" in cypher:
+                name = "ontology.triples.bulk_delete"
+        self.calls[name or "unregistered"] += 1
+        if name == "ontology.triples.bulk_add":
+            return [{"idx": r["idx"], "subjectFound": True, "objectFound": True} for r in params["rows"]]
+        if name == "ontology.triples.bulk_delete":
+            return [{"idx": r["idx"], "deleted": 1} for r in params["rows"]]
+        handler = HANDLERS.get(name)
+        if handler is None:
+            self.unhandled[name or cypher.split("\n", 2)[1][:60]] += 1
+            return []
+        return handler(self.graph, params)
+
+    def run(self, cypher: str, **params):
+        return self.rows(cypher, params)
+
+    async def run_async(self, cypher: str, **params):
+        return self.rows(cypher, params)
+
+    async def stream_async(self, cypher: str, **params):
+        for row in self.rows(cypher, params):
+            yield row
+
+    @contextmanager
+    def transaction(self, name: str = "transaction"):
+        fake = self
+
+        class _Tx:
+            def run(self, cypher: str, **params):
+                return _FakeResult(fake.rows(cypher, params))
+
+        yield _Tx()
+
+
+def install(fake: FakeNeo4j) -> int:
+    """
+    로드된 모듈(db·routers·services·bench)에서 db.neo4j 실행 함수를 import한 이름을 가짜로 교체.
+    라우터 import 이후에 호출해야 함. 교체한 속성 수 반환.
+    """
+    import db.neo4j as real
+    replacements = {
+        real.neo4j_read: fake.run,
+        real.neo4j_write: fake.run,
+        real.neo4j_run: fake.run,
+        real.neo4j_read_async: fake.run_async,
+        real.neo4j_stream_async: fake.stream_async,
+        real.neo4j_transaction: fake.transaction,
+    }
+    patched = 0
+    for module_name, module in list(sys.modules.items()):
+        if module is None or module_name.split(".")[0] not in ("db", "routers", "services", "bench"):
+            continue
+        for attr, value in list(vars(module).items()):
+            try:
+                replacement = replacements.get(value)
+            except TypeError:
+                continue
+            if replacement is not None:
+                setattr(module, attr, replacement)
+                patched += 1
+    return patched
@@ -0,0 +1,353 @@
+"""
+합성 공장 데이터 생성 (설비 트리, 프로세스·공정 DAG, 제품, 작업지시, 품질 측정, 보전 이력).
+같은 scale·seed면 항상 같은 데이터. 섹션별로 난수 상태를 따로 두어 큰 규모도 메모리에 모두 올리지 않고 스트리밍.
+
+출력:
+  - Turtle: /ontology/validate-and-import·온톨로지 디렉터리 로드용 (ex: 네임스페이스)
+  - Cypher: 라우터 쿼리가 읽는 모양 그대로 (:Resource:<Label> {uri: 'ex:...'}) 적재하는 UNWIND 스크립트
+  - load_plant(): 같은 문장을 파라미터로 Neo4j에 직접 적재 (+ OEE 카운터·품질 롤업 재계산)
+
+    python -m bench.generate --scale medium --out bench-data --format ttl,cypher
+"""
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+SCALES: Dict[str, dict] = {
+    "small": dict(lines=2, machines_per_line=5, components_per_machine=2, processes=3,
+                  operations_per_process=8, products=10, work_orders=200,
+                  quality_readings=2_000, maintenance=200),
+    "medium": dict(lines=10, machines_per_line=20, components_per_machine=4, processes=20,
+                   operations_per_process=20, products=100, work_orders=10_000,
+                   quality_readings=100_000, maintenance=5_000),
+    "large": dict(lines=50, machines_per_line=40, components_per_machine=6, processes=100,
+                  operations_per_process=40, products=500, work_orders=100_000,
+                  quality_readings=1_000_000, maintenance=50_000),
+}
+
+EQUIPMENT_STATUSES = ("running", "idle", "down", "maintenance")
+WORK_ORDER_STATUSES = ("planned", "in_progress", "completed")
+MAINTENANCE_TYPES = ("preventive", "corrective", "predictive")
+
+
+class SyntheticPlant:
+    """
+    공장 1개: 루트 설비 → 라인 → 설비 → 부품 (hasPart), 프로세스마다 공정 체인 + 분기·합류 (precedes).
+    branch_probability: 공정 k에서 k+2로 가는 병렬 경로를 추가할 확률.
+    """
+
+    def __init__(self, scale: str = "small", seed: int = 42, branch_probability: float = 0.2,
+                 history_days: int = 90, now: Optional[datetime] = None, **overrides):
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale: {scale} (choose from {', '.join(SCALES)})")
+        self.scale = scale
+        self.seed = seed
+        self.branch_probability = branch_probability
+        self.history_days = history_days
+        # 기본 기준 시각은 날짜 단위로 고정해 같은 날 생성한 데이터는 동일
+        self.now = now or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.config = {**SCALES[scale], **overrides}
+
+    def _rng(self, section: str) -> random.Random:
+        return random.Random(f"{self.seed}:{section}")
+
+    # ---- 식별자 ----
+    @staticmethod
+    def line_id(i: int) -> str:
+        return f"ex:Equipment_L{i}"
+
+    @staticmethod
+    def machine_id(i: int, j: int) -> str:
+        return f"ex:Equipment_L{i}_M{j}"
+
+    def machine_ids(self) -> List[str]:
+        c = self.config
+        return [self.machine_id(i, j) for i in range(1, c["lines"] + 1) for j in range(1, c["machines_per_line"] + 1)]
+
+    def process_ids(self) -> List[str]:
+        return [f"ex:Process_{p}" for p in range(1, self.config["processes"] + 1)]
+
+    def product_ids(self) -> List[str]:
+        return [f"ex:Product_{p}" for p in range(1, self.config["products"] + 1)]
+
+    def _timestamp(self, rng: random.Random) -> str:
+        ts = self.now - timedelta(seconds=rng.randrange(self.history_days * 86400))
+        return ts.isoformat()
+
+    # ---- 섹션별 스트림 ----
+    def equipment(self) -> Iterator[dict]:
+        """부모가 자식보다 먼저 나오는 순서 (적재 시 parent MATCH 가능)."""
+        rng = self._rng("equipment")
+        c = self.config
+        root = "ex:Equipment_Plant"
+        yield {"id": root, "name": "Plant", "status": "running", "parent": None}
+        for i in range(1, c["lines"] + 1):
+            yield {"id": self.line_id(i), "name": f"Line {i}", "status": "running", "parent": root}
+        for i in range(1, c["lines"] + 1):
+            for j in range(1, c["machines_per_line"] + 1):
+                yield {"id": self.machine_id(i, j), "name": f"Machine {i}-{j}",
+                       "status": rng.choice(EQUIPMENT_STATUSES), "parent": self.line_id(i)}
+        for i in range(1, c["lines"] + 1):
+            for j in range(1, c["machines_per_line"] + 1):
+                for k in range(1, c["components_per_machine"] + 1):
+                    yield {"id": f"{self.machine_id(i, j)}_C{k}", "name": f"Component {i}-{j}-{k}",
+                           "status": rng.choice(EQUIPMENT_STATUSES), "parent": self.machine_id(i, j)}
+
+    def processes(self) -> Iterator[dict]:
+        rng = self._rng("processes")
+        n_ops = self.config["operations_per_process"]
+        for p, process_id in enumerate(self.process_ids(), start=1):
+            ops = [f"ex:Operation_{p}_{k}" for k in range(1, n_ops + 1)]
+            edges = [[process_id, ops[0]]] + [[ops[k], ops[k + 1]] for k in range(n_ops - 1)]
+            edges += [
+                [ops[k], ops[k + 2]] for k in range(n_ops - 2) if rng.random() < self.branch_probability
+            ]
+            yield {
+                "id": process_id,
+                "name": f"Process {p}",
+                "operations": [
+                    {"id": op, "name": f"Operation {p}-{k}", "duration": rng.randint(1, 10)}
+                    for k, op in enumerate(ops, start=1)
+                ],
+                "edges": edges,
+            }
+
+    def products(self) -> Iterator[dict]:
+        for p, product_id in enumerate(self.product_ids(), start=1):
+            yield {"id": product_id, "name": f"Product {p}"}
+
+    def work_orders(self) -> Iterator[dict]:
+        rng = self._rng("work_orders")
+        machines = self.machine_ids()
+        for n in range(1, self.config["work_orders"] + 1):
+            planned = rng.randint(50, 500)
+            status = rng.choice(WORK_ORDER_STATUSES)
+            actual = 0 if status == "planned" else int(planned * rng.uniform(0.6, 1.1))
+            yield {"id": f"ex:WO_{n}", "workOrderNumber": str(n), "plannedQuantity": planned,
+                   "actualQuantity": actual, "status": status, "equipmentId": rng.choice(machines)}
+
+    def quality_readings(self) -> Iterator[dict]:
+        rng = self._rng("quality")
+        products = self.product_ids()
+        for n in range(1, self.config["quality_readings"] + 1):
+            yield {"id": f"ex:QC_{n}", "productId": rng.choice(products),
+                   "qualityResult": "pass" if rng.random() < 0.95 else "fail",
+                   "timestamp": self._timestamp(rng)}
+
+    def maintenance(self) -> Iterator[dict]:
+        rng = self._rng("maintenance")
+        machines = self.machine_ids()
+        for n in range(1, self.config["maintenance"] + 1):
+            yield {"id": f"ex:MT_{n}", "equipmentId": rng.choice(machines),
+                   "maintenanceType": rng.choice(MAINTENANCE_TYPES), "timestamp": self._timestamp(rng)}
+
+    def sections(self):
+        """(섹션 이름, 행 스트림) — 적재 순서."""
+        return [
+            ("equipment", self.equipment()),
+            ("processes", self.processes()),
+            ("products", self.products()),
+            ("work_orders", self.work_orders()),
+            ("quality", self.quality_readings()),
+            ("maintenance", self.maintenance()),
+        ]
+
+
+# ---- Cypher (라우터 쿼리와 같은 모양) ----
+CYPHER_STATEMENTS = {
+    "equipment": """
+UNWIND $rows AS row
+MERGE (e:Resource {uri: row.id})
+SET e:Equipment, e.`rdfs__label` = row.name, e.status = row.status
+WITH e, row
+MATCH (p:Resource {uri: row.parent})
+MERGE (p)-[:hasPart]->(e)
+""",
+    "processes": """
+UNWIND $rows AS row
+MERGE (p:Resource {uri: row.id})
+SET p:Process, p.`rdfs__label` = row.name
+FOREACH (op IN row.operations |
+    MERGE (o:Resource {uri: op.id})
+    SET o:Operation, o.`rdfs__label` = op.name, o.duration = op.duration
+)
+WITH row
+UNWIND row.edges AS edge
+MATCH (a:Resource {uri: edge[0]})
+MATCH (b:Resource {uri: edge[1]})
+MERGE (a)-[:precedes]->(b)
+""",
+    "products": """
+UNWIND $rows AS row
+MERGE (p:Resource {uri: row.id})
+SET p:Product, p.`rdfs__label` = row.name
+""",
+    "work_orders": """
+UNWIND $rows AS row
+MATCH (e:Resource {uri: row.equipmentId})
+CREATE (w:Resource:WorkOrder {
+    uri: row.id, workOrderNumber: row.workOrderNumber, plannedQuantity: row.plannedQuantity,
+    actualQuantity: row.actualQuantity, status: row.status
+})
+CREATE (w)-[:executedBy]->(e)
+""",
+    "quality": """
+UNWIND $rows AS row
+MATCH (p:Resource {uri: row.productId})
+CREATE (q:Resource:QualityControl {uri: row.id, qualityResult: row.qualityResult, timestamp: datetime(row.timestamp)})
+CREATE (p)-[:hasQuality]->(q)
+""",
+    "maintenance": """
+UNWIND $rows AS row
+MATCH (e:Resource {uri: row.equipmentId})
+CREATE (m:Resource:Maintenance {uri: row.id, maintenanceType: row.maintenanceType, timestamp: datetime(row.timestamp)})
+CREATE (e)-[:hasMaintenance]->(m)
+""",
+}
+
+
+def _batches(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _cypher_literal(value) -> str:
+    """Python 값 → Cypher 리터럴 (문자열은 JSON 이스케이프가 Cypher와 호환)."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_cypher_literal(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"`{k}`: {_cypher_literal(v)}" for k, v in value.items()) + "}"
+    raise TypeError(f"Unsupported Cypher literal: {type(value).__name__}")
+
+
+def write_cypher(plant: SyntheticPlant, path: str, batch_size: int = 1000) -> None:
+    """cypher-shell 등으로 실행 가능한 스크립트. 적재 후 OEE 카운터·품질 롤업 재계산 필요 (파일 끝 주석 참고)."""
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(f"// synthetic plant: scale={plant.scale} seed={plant.seed}\n")
+        fp.write("CREATE CONSTRAINT n10s_uri IF NOT EXISTS FOR (r:Resource) REQUIRE r.uri IS UNIQUE;\n")
+        for section, rows in plant.sections():
+            statement = CYPHER_STATEMENTS[section].strip()
+            for batch in _batches(rows, batch_size):
+                fp.write(statement.replace("$rows", _cypher_literal(batch), 1) + ";\n")
+        fp.write(
+            "// 적재 후: POST /analytics/equipment-efficiency/rebuild, POST /analytics/quality-trend/rebuild\n"
+        )
+
+
+# ---- Turtle ----
+_TTL_PREFIXES = """@prefix ex: <http://example.org/manufacturing#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+"""
+
+
+def _ttl_string(value: str) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _ttl_lines(section: str, row: dict) -> Iterator[str]:
+    if section == "equipment":
+        yield f"{row['id']} a ex:Equipment ; rdfs:label {_ttl_string(row['name'])} ; ex:status {_ttl_string(row['status'])} ."
+        if row["parent"]:
+            yield f"{row['parent']} ex:hasPart {row['id']} ."
+    elif section == "processes":
+        yield f"{row['id']} a ex:Process ; rdfs:label {_ttl_string(row['name'])} ."
+        for op in row["operations"]:
+            yield (f"{op['id']} a ex:Operation ; rdfs:label {_ttl_string(op['name'])} ; "
+                   f"ex:duration {op['duration']} .")
+        for src, dst in row["edges"]:
+            yield f"{src} ex:precedes {dst} ."
+    elif section == "products":
+        yield f"{row['id']} a ex:Product ; rdfs:label {_ttl_string(row['name'])} ."
+    elif section == "work_orders":
+        yield (f"{row['id']} a ex:WorkOrder ; ex:workOrderNumber {_ttl_string(row['workOrderNumber'])} ; "
+               f"ex:plannedQuantity {row['plannedQuantity']} ; ex:actualQuantity {row['actualQuantity']} ; "
+               f"ex:status {_ttl_string(row['status'])} ; ex:executedBy {row['equipmentId']} .")
+    elif section == "quality":
+        yield (f"{row['id']} a ex:QualityControl ; ex:qualityResult {_ttl_string(row['qualityResult'])} ; "
+               f"ex:timestamp \"{row['timestamp']}\"^^xsd:dateTime .")
+        yield f"{row['productId']} ex:hasQuality {row['id']} ."
+    elif section == "maintenance":
+        yield (f"{row['id']} a ex:Maintenance ; ex:maintenanceType {_ttl_string(row['maintenanceType'])} ; "
+               f"ex:timestamp \"{row['timestamp']}\"^^xsd:dateTime .")
+        yield f"{row['equipmentId']} ex:hasMaintenance {row['id']} ."
+
+
+def write_turtle(plant: SyntheticPlant, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(f"# synthetic plant: scale={plant.scale} seed={plant.seed}\n")
+        fp.write(_TTL_PREFIXES)
+        for section, rows in plant.sections():
+            for row in rows:
+                for line in _ttl_lines(section, row):
+                    fp.write(line + "\n")
+
+
+# ---- Neo4j 직접 적재 ----
+def load_plant(plant: SyntheticPlant, batch_size: int = 1000) -> Dict[str, int]:
+    """config의 Neo4j에 적재하고 OEE 카운터·품질 롤업 재계산. 섹션별 행 수 반환."""
+    from db.neo4j import neo4j_write, ensure_n10s_config
+    from db.indexes import ensure_indexes
+    from services.oee import REBUILD_COUNTERS
+    from services.quality import GRANULARITIES, REBUILD_ROLLUPS
+
+    ensure_n10s_config()
+    ensure_indexes()
+    counts = {}
+    for section, rows in plant.sections():
+        counts[section] = 0
+        for batch in _batches(rows, batch_size):
+            neo4j_write(CYPHER_STATEMENTS[section], rows=batch)
+            counts[section] += len(batch)
+    neo4j_write(REBUILD_COUNTERS)
+    neo4j_write(REBUILD_ROLLUPS, granularities=list(GRANULARITIES))
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic manufacturing plant")
+    parser.add_argument("--scale", default="small", choices=sorted(SCALES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="bench-data", help="output directory")
+    parser.add_argument("--format", default="ttl,cypher", help="comma-separated: ttl, cypher")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per UNWIND statement")
+    parser.add_argument("--load", action="store_true", help="load directly into the configured Neo4j")
+    args = parser.parse_args(argv)
+
+    plant = SyntheticPlant(args.scale, args.seed)
+    formats = {f.strip() for f in args.format.split(",") if f.strip()}
+    if formats - {"ttl", "cypher"}:
+        parser.error(f"unknown format: {', '.join(sorted(formats - {'ttl', 'cypher'}))}")
+    os.makedirs(args.out, exist_ok=True)
+    stem = os.path.join(args.out, f"plant-{args.scale}-{args.seed}")
+    if "ttl" in formats:
+        write_turtle(plant, stem + ".ttl")
+        print(f"Wrote {stem}.ttl")
+    if "cypher" in formats:
+        write_cypher(plant, stem + ".cypher", args.batch_size)
+        print(f"Wrote {stem}.cypher")
+    if args.load:
+        print(f"Loaded: {load_plant(plant, args.batch_size)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
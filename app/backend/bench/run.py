@@ -0,0 +1,273 @@
+"""
+라우터 엔드포인트 벤치마크. 앱을 in-process(ASGI)로 호출해 시나리오별 지연 백분위수·처리량 측정.
+
+모드:
+  - fake: bench.fake_neo4j로 DB를 대체해 라우터·서비스·직렬화 오버헤드만 측정 (Neo4j 불필요)
+  - neo4j: config의 Neo4j 사용. --load로 같은 scale·seed의 합성 공장을 먼저 적재
+
+제외: AutoML 학습·SHACL 임포트(각각 scikit-learn·pyshacl 시간이 지배), 재계산(rebuild) 관리 API,
+SSE/WebSocket 구독(장기 연결).
+
+    python -m bench.run --mode fake --scale small --save base.json
+    python -m bench.run --mode fake --scale small --compare base.json --fail-on-regression
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from bench.generate import SCALES, SyntheticPlant
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    # 반복 번호 → (경로, JSON 본문 또는 None)
+    request: Callable[[int], tuple]
+    write: bool = False
+    content_type: Optional[str] = None
+
+
+def _get(path: str) -> Callable[[int], tuple]:
+    return lambda i: (path, None)
+
+
+def build_scenarios(plant: SyntheticPlant, run_id: str) -> List[Scenario]:
+    machines = plant.machine_ids()
+    lines = [plant.line_id(i) for i in range(1, plant.config["lines"] + 1)]
+    processes = plant.process_ids()
+    products = plant.product_ids()
+    n_orders = plant.config["work_orders"]
+
+    def pick(items: List[str]) -> Callable[[int], str]:
+        return lambda i: items[i % len(items)]
+
+    machine, line, process, product = pick(machines), pick(lines), pick(processes), pick(products)
+    component = lambda i: f"{machine(i)}_C1"  # noqa: E731
+    now = plant.now.isoformat()
+
+    def bench_triple(i: int) -> dict:
+        return {"subject": product(i), "predicate": "benchLink", "object": product(i + 1)}
+
+    def ndjson_orders(i: int) -> tuple:
+        body = "\n".join(json.dumps({
+            "workOrderNumber": f"bench-{run_id}-s{i}-{k}", "plannedQuantity": 100, "actualQuantity": 90,
+            "status": "completed", "equipment_id": machine(i + k),
+        }) for k in range(100))
+        return "/manufacturing/work-orders/stream", body
+
+    return [
+        Scenario("health.live", "GET", _get("/health/live")),
+        Scenario("metrics", "GET", _get("/metrics")),
+        Scenario("ontology.triples.page", "GET", _get("/ontology/triples?limit=100")),
+        Scenario("ontology.triples.subject", "GET", lambda i: (f"/ontology/triples?subject={machine(i)}", None)),
+        Scenario("ontology.triples.predicate", "GET", _get("/ontology/triples?predicate=hasPart&limit=100")),
+        Scenario("ontology.triples.object", "GET", lambda i: (f"/ontology/triples?object={machine(i)}", None)),
+        Scenario("ontology.triples.prefix", "GET", _get("/ontology/triples?subject_prefix=ex:Equipment_L1_&limit=100")),
+        Scenario("ontology.triples.stream", "GET", _get("/ontology/triples?predicate=precedes&stream=true")),
+        Scenario("graph.elements", "GET", _get("/graph/elements?limit=100")),
+        Scenario("graph.elements.columnar", "GET", _get("/graph/elements?limit=100&format=columnar")),
+        Scenario("graph.expand", "GET", lambda i: (f"/graph/expand/{line(i)}?direction=both", None)),
+        Scenario("graph.process_flow", "GET", lambda i: (f"/graph/process-flow/{process(i)}", None)),
+        Scenario("graph.equipment_hierarchy", "GET", _get("/graph/equipment-hierarchy")),
+        Scenario("graph.equipment_hierarchy.tree", "GET", _get("/graph/equipment-hierarchy/tree")),
+        Scenario("graph.equipment_hierarchy.subtree", "GET",
+                 lambda i: (f"/graph/equipment-hierarchy/{line(i)}/subtree", None)),
+        Scenario("graph.equipment_hierarchy.ancestors", "GET",
+                 lambda i: (f"/graph/equipment-hierarchy/{component(i)}/ancestors", None)),
+        Scenario("manufacturing.lines", "GET", _get("/manufacturing/lines")),
+        Scenario("manufacturing.line", "GET", lambda i: (f"/manufacturing/lines/{line(i)}", None)),
+        Scenario("manufacturing.work_orders", "GET", _get("/manufacturing/work-orders")),
+        Scenario("manufacturing.quality", "GET", lambda i: (f"/manufacturing/quality/{product(i)}", None)),
+        Scenario("manufacturing.equipment.status", "GET",
+                 lambda i: (f"/manufacturing/equipment/{machine(i)}/status", None)),
+        Scenario("manufacturing.equipment.maintenance_history", "GET",
+                 lambda i: (f"/manufacturing/equipment/{machine(i)}/maintenance-history", None)),
+        Scenario("analytics.quality_trend.day", "GET", _get("/analytics/quality-trend?period=90d&granularity=day")),
+        Scenario("analytics.quality_trend.hour", "GET", _get("/analytics/quality-trend?period=7d&granularity=hour")),
+        Scenario("analytics.efficiency.fleet", "GET", _get("/analytics/equipment-efficiency")),
+        Scenario("analytics.efficiency", "GET", lambda i: (f"/analytics/equipment-efficiency/{machine(i)}", None)),
+        # 쓰기 (neo4j 모드에서는 데이터가 바뀜; --read-only로 제외)
+        Scenario("manufacturing.work_order.create", "POST", lambda i: ("/manufacturing/work-orders", {
+            "workOrderNumber": f"bench-{run_id}-{i}", "plannedQuantity": 100, "actualQuantity": 0,
+            "status": "planned", "equipment_id": machine(i),
+        }), write=True),
+        Scenario("manufacturing.work_order.update", "PATCH", lambda i: (
+            f"/manufacturing/work-orders/ex:WO_{i % n_orders + 1}", {"status": "completed"}), write=True),
+        Scenario("manufacturing.equipment.status.update", "PUT", lambda i: (
+            f"/manufacturing/equipment/{machine(i)}/status", {"status": "running"}), write=True),
+        Scenario("manufacturing.quality.batch", "POST", lambda i: ("/manufacturing/quality/batch", [
+            {"product_id": product(i + k), "qualityResult": "pass", "timestamp": now,
+             "idempotency_key": f"bench-{run_id}-{i}-{k}"}
+            for k in range(100)
+        ]), write=True),
+        Scenario("manufacturing.work_orders.stream", "POST", ndjson_orders, write=True,
+                 content_type="application/x-ndjson"),
+        # 생성한 Triple을 같은 반복 번호로 삭제
+        Scenario("ontology.triples.create", "POST", lambda i: ("/ontology/triples", bench_triple(i)), write=True),
+        Scenario("ontology.triples.delete", "DELETE", lambda i: ("/ontology/triples", bench_triple(i)), write=True),
+    ]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """nearest-rank 백분위수."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+async def _measure(client, scenario: Scenario, iterations: int, warmup: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors: Dict[int, int] = {}
+    counter = iter(range(warmup + iterations))
+
+    async def send(i: int) -> None:
+        path, body = scenario.request(i)
+        kwargs = {}
+        if isinstance(body, str):
+            kwargs = {"content": body, "headers": {"content-type": scenario.content_type or "text/plain"}}
+        elif body is not None:
+            kwargs = {"json": body}
+        started = time.perf_counter()
+        response = await client.request(scenario.method, path, **kwargs)
+        await response.aread()
+        elapsed = (time.perf_counter() - started) * 1000.0
+        if i >= warmup:
+            latencies.append(elapsed)
+            if response.status_code >= 400:
+                errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    for i in range(warmup):
+        await send(next(counter))
+
+    async def worker() -> None:
+        for i in counter:
+            await send(i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": latencies[-1] if latencies else 0.0,
+        "throughput": len(latencies) / wall if wall else 0.0,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results: Dict[str, dict]) -> None:
+    print(f"{'scenario':<44} {'n':>6} {'err':>5} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'req/s':>8}")
+    for name, r in results.items():
+        print(f"{name:<44} {r['count']:>6} {sum(r['errors'].values()):>5} {r['p50']:>9.2f} {r['p90']:>9.2f} "
+              f"{r['p99']:>9.2f} {r['max']:>9.2f} {r['throughput']:>8.0f}")
+
+
+async def run(args) -> dict:
+    import httpx
+    from main import app
+
+    plant = SyntheticPlant(args.scale, args.seed)
+    if args.mode == "fake":
+        from bench.fake_neo4j import FakeGraph, FakeNeo4j, install
+        started = time.perf_counter()
+        fake = FakeNeo4j(FakeGraph(plant))
+        install(fake)
+        print(f"Fake graph built in {time.perf_counter() - started:.1f}s ({len(fake.graph.nodes)} nodes)")
+    else:
+        fake = None
+        if args.load:
+            from bench.generate import load_plant
+            print(f"Loaded into Neo4j: {load_plant(plant)}")
+
+    run_id = str(int(time.time()))
+    scenarios = [
+        s for s in build_scenarios(plant, run_id)
+        if not (args.read_only and s.write) and (not args.only or any(key in s.name for key in args.only))
+    ]
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for scenario in scenarios:
+            results[scenario.name] = await _measure(
+                client, scenario, args.iterations, args.warmup, args.concurrency
+            )
+    if fake is not None and fake.unhandled:
+        print(f"Warning: fake backend had no handler for: {dict(fake.unhandled)}")
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "mode": args.mode,
+            "scale": args.scale,
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "readCache": not args.no_cache,
+            "python": platform.python_version(),
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark router endpoints against a synthetic plant")
+    parser.add_argument("--mode", choices=("fake", "neo4j"), default="fake")
+    parser.add_argument("--scale", default="small", choices=sorted(SCALES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--load", action="store_true", help="neo4j mode: load the synthetic plant first")
+    parser.add_argument("--iterations", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1, help="concurrent in-flight requests")
+    parser.add_argument("--read-only", action="store_true", help="skip write scenarios")
+    parser.add_argument("--no-cache", action="store_true", help="disable the read-through cache")
+    parser.add_argument("--only", nargs="*", help="run scenarios whose name contains any of these")
+    parser.add_argument("--save", help="write results JSON to this path")
+    parser.add_argument("--compare", help="compare with a saved results JSON")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    # config는 import 시 환경 변수를 읽으므로 앱 import 전에 설정
+    if args.no_cache:
+        os.environ["READ_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("QUERY_PLAN_AUDIT", "false")
+
+    result = asyncio.run(run(args))
+    print_results(result["results"])
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fp:
+            json.dump(result, fp, indent=2)
+        print(f"Saved {args.save}")
+    if args.compare:
+        from bench.compare import compare, load, print_comparison
+        base = load(args.compare)
+        regressions = print_comparison(base, result, compare(base, result, args.threshold))
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,5 +7,109 @@ NEO4J_URI = os.getenv("NEO4J_URI", "neo4j://127.0.0.1:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASS = os.getenv("NEO4J_PASS", "passwd")
 
+# 커넥션 풀 (sync/async 드라이버 공통)
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "200"))
+NEO4J_POOL_ACQUIRE_TIMEOUT = float(os.getenv("NEO4J_POOL_ACQUIRE_TIMEOUT", "30"))
+NEO4J_CONNECTION_TIMEOUT = float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "15"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+# 기동 시 연결 확인: 최대 시도 횟수, 첫 대기(초, 시도마다 2배), 대기 상한(초)
+NEO4J_CONNECT_RETRIES = int(os.getenv("NEO4J_CONNECT_RETRIES", "5"))
+NEO4J_CONNECT_RETRY_DELAY = float(os.getenv("NEO4J_CONNECT_RETRY_DELAY", "1"))
+NEO4J_CONNECT_RETRY_MAX_DELAY = float(os.getenv("NEO4J_CONNECT_RETRY_MAX_DELAY", "10"))
+# managed 트랜잭션(neo4j_read/neo4j_write) 재시도: 총 재시도 시간(초), 첫 대기(초, 시도마다 2배), 대기 jitter 비율
+NEO4J_TX_RETRY_TIME = float(os.getenv("NEO4J_TX_RETRY_TIME", "15"))
+NEO4J_TX_RETRY_DELAY = float(os.getenv("NEO4J_TX_RETRY_DELAY", "0.2"))
+NEO4J_TX_RETRY_JITTER = float(os.getenv("NEO4J_TX_RETRY_JITTER", "0.2"))
+# 재시도 후에도 실패한 일시 오류(503) 응답의 Retry-After(초)
+NEO4J_RETRY_AFTER_SECONDS = int(os.getenv("NEO4J_RETRY_AFTER_SECONDS", "2"))
+# 모든 세션이 bookmark를 공유해 쓰기 직후 읽기가 (클러스터 follower에서도) 해당 쓰기를 보도록 보장
+NEO4J_CAUSAL_CONSISTENCY = os.getenv("NEO4J_CAUSAL_CONSISTENCY", "true").lower() == "true"
+# 스트리밍 조회 시 한 번에 가져오는 레코드 수
+NEO4J_STREAM_FETCH_SIZE = int(os.getenv("NEO4J_STREAM_FETCH_SIZE", "1000"))
+
 # 온톨로지 파일 로드 경로 (Docker 기본값)
 ONTOLOGY_DIR = os.getenv("ONTOLOGY_DIR", "/app/ontology")
+# 이 크기(bytes)를 넘는 파일은 N-Triples로 변환해 청크 단위로 임포트
+ONTOLOGY_INLINE_MAX_BYTES = int(os.getenv("ONTOLOGY_INLINE_MAX_BYTES", str(8 * 1024 * 1024)))
+ONTOLOGY_CHUNK_TRIPLES = int(os.getenv("ONTOLOGY_CHUNK_TRIPLES", "50000"))
+
+# Triple 벌크 연산: UNWIND 배치 크기
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "5000"))
+
+# Triple 조회 페이지 크기 (keyset pagination)
+TRIPLES_PAGE_SIZE = int(os.getenv("TRIPLES_PAGE_SIZE", "1000"))
+TRIPLES_MAX_PAGE_SIZE = int(os.getenv("TRIPLES_MAX_PAGE_SIZE", "10000"))
+# Triple 조회 플래너가 쓰는 count store 통계 캐시 TTL (초)
+TRIPLES_STATS_TTL_SECONDS = float(os.getenv("TRIPLES_STATS_TTL_SECONDS", "30"))
+# 온톨로지 계층 Triple in-process 미러: 대상 관계면 GET /ontology/triples를 메모리에서 응답
+TRIPLE_INDEX_ENABLED = os.getenv("TRIPLE_INDEX_ENABLED", "false").lower() == "true"
+# 미러 로드 원본: neo4j 또는 ttl (ONTOLOGY_DIR의 TTL, 표준 어휘는 rdfs__subClassOf처럼 n10s 접두사 표기)
+TRIPLE_INDEX_SOURCE = os.getenv("TRIPLE_INDEX_SOURCE", "neo4j")
+# 미러할 관계 타입 (쉼표 구분)
+TRIPLE_INDEX_PREDICATES = [
+    p.strip() for p in os.getenv(
+        "TRIPLE_INDEX_PREDICATES",
+        "hasPart,precedes,rdfs__subClassOf,rdfs__subPropertyOf,rdfs__domain,rdfs__range",
+    ).split(",") if p.strip()
+]
+
+# 참조 데이터 read-through 캐시 (쓰기 경로에서 태그 단위 무효화)
+READ_CACHE_ENABLED = os.getenv("READ_CACHE_ENABLED", "true").lower() == "true"
+READ_CACHE_TTL_SECONDS = float(os.getenv("READ_CACHE_TTL_SECONDS", "300"))
+READ_CACHE_MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", "1024"))
+
+# 업로드 임시 저장 경로 (None이면 시스템 기본 temp)
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+
+# SHACL 검증·임포트: 프로세스 풀 크기, 업로드 크기·시간 제한
+SHACL_MAX_WORKERS = int(os.getenv("SHACL_MAX_WORKERS", "2"))
+SHACL_MAX_UPLOAD_BYTES = int(os.getenv("SHACL_MAX_UPLOAD_BYTES", str(1024 * 1024 * 1024)))
+SHACL_TIMEOUT_SECONDS = float(os.getenv("SHACL_TIMEOUT_SECONDS", "600"))
+
+# AutoML: 병렬 프로세스 수(0 이하 = CPU 수), 요청당 시간 예산(초)
+AUTOML_N_JOBS = int(os.getenv("AUTOML_N_JOBS", "0"))
+AUTOML_TIME_BUDGET_SECONDS = float(os.getenv("AUTOML_TIME_BUDGET_SECONDS", "300"))
+# 이보다 샘플 수가 적으면 프로세스 기동 비용이 더 커서 순차 실행
+AUTOML_PARALLEL_MIN_SAMPLES = int(os.getenv("AUTOML_PARALLEL_MIN_SAMPLES", "2000"))
+# 이보다 큰 학습 배열은 임시 .npy로 저장해 워커들이 memmap으로 공유
+AUTOML_MEMMAP_MIN_BYTES = int(os.getenv("AUTOML_MEMMAP_MIN_BYTES", str(1024 * 1024)))
+# AutoML 비동기 작업 큐: 동시 실행 수, 대기열 상한, 완료 작업 보관 시간(초)
+AUTOML_MAX_CONCURRENT_JOBS = int(os.getenv("AUTOML_MAX_CONCURRENT_JOBS", "1"))
+AUTOML_MAX_QUEUED_JOBS = int(os.getenv("AUTOML_MAX_QUEUED_JOBS", "16"))
+AUTOML_JOB_RETENTION_SECONDS = float(os.getenv("AUTOML_JOB_RETENTION_SECONDS", "3600"))
+# AutoML 학습 파일 업로드 상한
+AUTOML_MAX_UPLOAD_BYTES = int(os.getenv("AUTOML_MAX_UPLOAD_BYTES", str(4 * 1024 * 1024 * 1024)))
+
+# 학습된 모델 저장 경로, 메모리에 유지할 로드된 모델 수 (LRU)
+MODEL_DIR = os.getenv("MODEL_DIR", "model_store")
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "16"))
+
+# 품질 트렌드 롤업: 한 번의 조회에서 허용하는 최대 버킷 수 (기간 / 단위)
+QUALITY_TREND_MAX_BUCKETS = int(os.getenv("QUALITY_TREND_MAX_BUCKETS", "10000"))
+
+# 기동 시 등록된 라우터 쿼리를 EXPLAIN해 전체 스캔이 있는 실행 계획을 로그로 경고
+QUERY_PLAN_AUDIT = os.getenv("QUERY_PLAN_AUDIT", "false").lower() == "true"
+
+# 쿼리 메트릭(/metrics): 템플릿(등록 쿼리 이름) 수 상한 — 초과분은 "other"로 집계
+METRICS_MAX_TEMPLATES = int(os.getenv("METRICS_MAX_TEMPLATES", "500"))
+# 느린 쿼리 로그: 기준(ms), 보관 건수, 읽기 전용 느린 쿼리를 PROFILE로 재실행할 비율(0~1)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+SLOW_QUERY_PROFILE_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_PROFILE_SAMPLE_RATE", "0.1"))
+
+# 작업지시·품질·보전 이벤트 일괄 수집: UNWIND 청크 크기, 요청당 최대 건수
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "1000"))
+INGEST_MAX_BATCH = int(os.getenv("INGEST_MAX_BATCH", "10000"))
+# 역압: 동시에 쓰는 청크 수, 대기 가능한 청크 수(초과 시 429), 대기 시간 상한(초과 시 503), Retry-After(초)
+INGEST_MAX_CONCURRENT = int(os.getenv("INGEST_MAX_CONCURRENT", "4"))
+INGEST_MAX_WAITING = int(os.getenv("INGEST_MAX_WAITING", "32"))
+INGEST_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("INGEST_ACQUIRE_TIMEOUT_SECONDS", "10"))
+INGEST_RETRY_AFTER_SECONDS = int(os.getenv("INGEST_RETRY_AFTER_SECONDS", "5"))
+
+# 설비·품질 이벤트 구독(SSE/WebSocket): 최대 구독자 수, 구독자별 미전달 이벤트 보관 수, keepalive 간격(초)
+EVENTS_MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "1000"))
+EVENTS_SUBSCRIBER_BUFFER = int(os.getenv("EVENTS_SUBSCRIBER_BUFFER", "256"))
+EVENTS_KEEPALIVE_SECONDS = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+
+# 프로세스 플로우: precedes 탐색 깊이 상한 (요청의 depth는 이 값 이하로 제한)
+PROCESS_FLOW_MAX_DEPTH = int(os.getenv("PROCESS_FLOW_MAX_DEPTH", "100"))
@@ -1,3 +1,30 @@
-from .neo4j import neo4j_run, ensure_n10s_config, load_ontology_files
+from .neo4j import (
+    neo4j_read,
+    neo4j_write,
+    neo4j_read_async,
+    neo4j_run,
+    neo4j_stream_async,
+    neo4j_transaction,
+    close_async_driver,
+    open_driver,
+    close_driver,
+    wait_for_neo4j,
+    ensure_n10s_config,
+)
+from .ontology_loader import load_ontology_files, ONTOLOGY_LOAD_STATUS
 
-__all__ = ["neo4j_run", "ensure_n10s_config", "load_ontology_files"]
+__all__ = [
+    "neo4j_read",
+    "neo4j_write",
+    "neo4j_read_async",
+    "neo4j_run",
+    "neo4j_stream_async",
+    "neo4j_transaction",
+    "close_async_driver",
+    "open_driver",
+    "close_driver",
+    "wait_for_neo4j",
+    "ensure_n10s_config",
+    "load_ontology_files",
+    "ONTOLOGY_LOAD_STATUS",
+]
@@ -0,0 +1,175 @@
+"""
+라우터 쿼리가 사용하는 인덱스·제약 선언 및 기동 시 생성 (IF NOT EXISTS로 멱등).
+등록된 쿼리(db.queries)를 EXPLAIN해 전체 노드/라벨 스캔이 있는 실행 계획을 찾는 감사 포함.
+
+    python -m db.indexes --create --audit   # 인덱스 생성 후 감사, 경고가 있으면 종료 코드 1
+"""
+import argparse
+import sys
+from typing import Dict, List
+
+from neo4j import READ_ACCESS
+
+from config import QUERY_PLAN_AUDIT
+from db.neo4j import neo4j_run, neo4j_transaction
+from db.queries import QUERY_REGISTRY
+
+# (이름, 생성 문) — n10s용 Resource.uri 제약은 ensure_n10s_config에서 생성
+INDEXES = [
+    # 라우터의 {uri: $id} 조회 (n10s 노드는 Resource 외 라벨별 인덱스가 있어야 라벨 패턴에서 사용됨)
+    ("equipment_uri", "CREATE RANGE INDEX equipment_uri IF NOT EXISTS FOR (n:Equipment) ON (n.uri)"),
+    ("process_uri", "CREATE RANGE INDEX process_uri IF NOT EXISTS FOR (n:Process) ON (n.uri)"),
+    ("product_uri", "CREATE RANGE INDEX product_uri IF NOT EXISTS FOR (n:Product) ON (n.uri)"),
+    ("work_order_uri", "CREATE RANGE INDEX work_order_uri IF NOT EXISTS FOR (n:WorkOrder) ON (n.uri)"),
+    ("quality_uri", "CREATE RANGE INDEX quality_uri IF NOT EXISTS FOR (n:QualityControl) ON (n.uri)"),
+    ("maintenance_uri", "CREATE RANGE INDEX maintenance_uri IF NOT EXISTS FOR (n:Maintenance) ON (n.uri)"),
+    # 품질 데이터 기간 조회·롤업
+    ("quality_timestamp", "CREATE RANGE INDEX quality_timestamp IF NOT EXISTS FOR (q:QualityControl) ON (q.timestamp)"),
+    ("quality_rollup_bucket",
+     "CREATE RANGE INDEX quality_rollup_bucket IF NOT EXISTS FOR (r:QualityRollup) ON (r.granularity, r.bucket, r.result)"),
+    # Equipment.uri CONTAINS 필터 (/manufacturing/lines)
+    ("equipment_uri_text", "CREATE TEXT INDEX equipment_uri_text IF NOT EXISTS FOR (n:Equipment) ON (n.uri)"),
+    ("oee_counter_equipment",
+     "CREATE CONSTRAINT oee_counter_equipment IF NOT EXISTS FOR (c:OEECounter) REQUIRE c.equipment IS UNIQUE"),
+    ("ontology_file_name",
+     "CREATE CONSTRAINT ontology_file_name IF NOT EXISTS FOR (m:OntologyFile) REQUIRE m.name IS UNIQUE"),
+    ("schema_migration_name",
+     "CREATE CONSTRAINT schema_migration_name IF NOT EXISTS FOR (m:SchemaMigration) REQUIRE m.name IS UNIQUE"),
+]
+
+# 한 번만 실행하는 데이터 마이그레이션 (이름, 문). 완료 시 (:SchemaMigration {name}) 기록.
+# 문이 행을 반환하면 적용하지 않고 건너뛴 항목으로 보고 경고 로그
+MIGRATIONS = [
+    # 이전에 API로 생성된 작업지시·품질·보전 노드에 Resource 라벨 부여 (Triple 조회가 :Resource {uri}로 앵커링).
+    # Resource.uri 유일 제약을 깨지 않도록 이미 같은 uri의 Resource가 있으면 건너뛰고, uri 중복 노드는 하나만 부여
+    ("resource_label_api_nodes", """
+    MATCH (n)
+    WHERE (n:WorkOrder OR n:QualityControl OR n:Maintenance) AND NOT n:Resource AND n.uri IS NOT NULL
+    WITH n.uri AS uri, collect(n) AS nodes
+    WITH uri, nodes, EXISTS { MATCH (:Resource {uri: uri}) } AS taken
+    CALL (nodes, taken) {
+        FOREACH (n IN CASE WHEN taken THEN [] ELSE nodes[0..1] END | SET n:Resource)
+    } IN TRANSACTIONS OF 10000 ROWS
+    WITH uri, size(nodes) - CASE WHEN taken THEN 0 ELSE 1 END AS skipped
+    WHERE skipped > 0
+    RETURN uri, skipped
+    """),
+]
+
+# 감사에서 경고할 연산자 (쿼리 등록 시 allow로 개별 허용)
+FLAGGED_OPERATORS = ("AllNodesScan", "NodeByLabelScan")
+
+
+def ensure_indexes() -> Dict[str, str]:
+    """선언된 인덱스·제약 생성 후 마이그레이션 적용. 실패한 항목의 {이름: 오류} 반환."""
+    failed = {}
+    for name, statement in INDEXES:
+        try:
+            neo4j_run(statement)
+        except Exception as e:
+            failed[name] = str(e)
+            print(f"Warning: Index/constraint {name} creation failed: {e}")
+    failed.update(apply_migrations())
+    return failed
+
+
+def apply_migrations() -> Dict[str, str]:
+    """기록되지 않은 마이그레이션 실행 (auto-commit, 배치 트랜잭션). 실패한 항목의 {이름: 오류} 반환."""
+    try:
+        done = {row["name"] for row in neo4j_run("MATCH (m:SchemaMigration) RETURN m.name AS name")}
+    except Exception as e:
+        print(f"Warning: Migration state unavailable: {e}")
+        return {"migrations": str(e)}
+    failed = {}
+    for name, statement in MIGRATIONS:
+        if name in done:
+            continue
+        try:
+            skipped = neo4j_run(statement)
+            if skipped:
+                print(f"Warning: Migration {name} skipped {len(skipped)} item(s): "
+                      f"{[dict(row) for row in skipped[:20]]}")
+            neo4j_run("MERGE (m:SchemaMigration {name: $name}) SET m.appliedAt = datetime()", name=name)
+        except Exception as e:
+            failed[name] = str(e)
+            print(f"Warning: Migration {name} failed: {e}")
+    return failed
+
+
+def _operators(plan) -> List[str]:
+    """실행 계획 트리의 연산자 이름 목록 (버전 접미사 '@neo4j' 제거)."""
+    if not plan:
+        return []
+    ops = [plan.get("operatorType", "").split("@")[0]]
+    for child in plan.get("children", []):
+        ops.extend(_operators(child))
+    return ops
+
+
+def explain(cypher: str, **params) -> List[str]:
+    """EXPLAIN으로 실행 계획만 받아 연산자 목록 반환 (쿼리는 실행되지 않음)."""
+    with neo4j_transaction("db.explain", access=READ_ACCESS) as tx:
+        summary = tx.run(f"EXPLAIN {cypher}", **params).consume()
+    return _operators(summary.plan)
+
+
+def audit_queries() -> List[dict]:
+    """등록된 모든 쿼리를 EXPLAIN해 허용되지 않은 전체 스캔 연산자를 보고."""
+    report = []
+    for name, query in sorted(QUERY_REGISTRY.items()):
+        entry = {"name": name, "flagged": [], "error": None}
+        try:
+            ops = explain(query.cypher, **query.params)
+            entry["flagged"] = sorted({
+                op for op in ops if op in FLAGGED_OPERATORS and op not in query.allow
+            })
+        except Exception as e:
+            entry["error"] = getattr(e, "detail", None) or str(e)
+        report.append(entry)
+    return report
+
+
+def print_audit(report: List[dict]) -> int:
+    """감사 결과 출력. 경고·오류 건수 반환."""
+    problems = 0
+    for entry in report:
+        if entry["error"]:
+            problems += 1
+            print(f"Query plan audit: {entry['name']}: EXPLAIN failed: {entry['error']}")
+        elif entry["flagged"]:
+            problems += 1
+            print(f"Query plan audit: {entry['name']}: {', '.join(entry['flagged'])}")
+    print(f"Query plan audit: {len(report)} queries, {problems} with problems")
+    return problems
+
+
+def run_startup_audit() -> None:
+    """QUERY_PLAN_AUDIT가 켜져 있으면 기동 시 감사 결과를 로그로 출력."""
+    if QUERY_PLAN_AUDIT:
+        print_audit(audit_queries())
+
+
+def _load_router_queries() -> None:
+    """라우터 모듈을 import해 쿼리 등록."""
+    from routers import ontology, graph, manufacturing, analytics, events  # noqa: F401
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Neo4j index provisioning and query plan audit")
+    parser.add_argument("--create", action="store_true", help="create declared indexes and constraints")
+    parser.add_argument("--audit", action="store_true", help="EXPLAIN registered queries and flag full scans")
+    args = parser.parse_args(argv)
+    if not (args.create or args.audit):
+        parser.error("nothing to do (use --create and/or --audit)")
+    status = 0
+    if args.create and ensure_indexes():
+        status = 1
+    if args.audit:
+        _load_router_queries()
+        if print_audit(audit_queries()):
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
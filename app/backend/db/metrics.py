@@ -0,0 +1,226 @@
+"""
+Neo4j 쿼리 메트릭과 느린 쿼리 로그.
+쿼리 템플릿(db.queries 등록 이름, 미등록이면 Cypher 해시)별 지연 히스토그램·행 수·오류 수·풀 대기 시간을
+집계해 Prometheus 텍스트 형식으로 출력. 느린 읽기 전용 쿼리 일부는 백그라운드에서 PROFILE로 재실행해 db hits 기록.
+"""
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from config import (
+    METRICS_MAX_TEMPLATES,
+    SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_PROFILE_SAMPLE_RATE,
+)
+from db.queries import query_name
+
+# 지연 히스토그램 버킷 (초)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 동시에 대기할 수 있는 PROFILE 재실행 수 (초과 시 샘플 버림)
+_MAX_PENDING_PROFILES = 4
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class _TemplateStats:
+    __slots__ = ("duration", "rows", "errors", "retries", "slow", "pool_wait")
+
+    def __init__(self):
+        self.duration = _Histogram()
+        self.rows = 0
+        self.errors = 0
+        self.retries = 0
+        self.slow = 0
+        self.pool_wait = 0.0
+
+
+_stats: Dict[str, _TemplateStats] = {}
+_pool_wait = _Histogram()
+_in_flight = 0
+_lock = threading.Lock()
+
+SLOW_QUERIES: "deque[dict]" = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_profiler: Optional[ThreadPoolExecutor] = None
+_pending_profiles = 0
+
+
+def template_name(cypher: str) -> str:
+    """등록된 쿼리 이름, 미등록 쿼리는 정규화한 Cypher의 해시."""
+    name = query_name(cypher)
+    if name:
+        return name
+    digest = hashlib.sha1(" ".join(cypher.split()).encode("utf-8")).hexdigest()[:12]
+    return f"adhoc:{digest}"
+
+
+def query_started() -> float:
+    global _in_flight
+    with _lock:
+        _in_flight += 1
+    return time.perf_counter()
+
+
+def record_query(
+    cypher: str,
+    started: float,
+    rows: int = 0,
+    summary=None,
+    first_response: Optional[float] = None,
+    error: bool = False,
+    name: Optional[str] = None,
+    retries: int = 0,
+) -> Optional[dict]:
+    """
+    쿼리 1건 기록. 느린 쿼리면 로그 항목을 반환 (PROFILE 재실행 대상이면 항목에 "profile": True).
+    first_response: 세션 run() 반환까지 걸린 시간. 서버의 result_available_after를 빼서 풀 대기(+왕복) 근사.
+    name: 템플릿 이름 지정 (명시적 트랜잭션 등 Cypher 하나로 식별되지 않는 경우).
+    retries: managed 트랜잭션이 일시 오류로 재시도한 횟수.
+    """
+    global _in_flight
+    duration = time.perf_counter() - started
+    name = name or template_name(cypher)
+    wait = None
+    if first_response is not None and summary is not None:
+        server = (getattr(summary, "result_available_after", None) or 0) / 1000.0
+        wait = max(0.0, first_response - server)
+    slow = duration * 1000.0 >= SLOW_QUERY_THRESHOLD_MS
+    with _lock:
+        _in_flight -= 1
+        stats = _stats.get(name)
+        if stats is None:
+            if len(_stats) >= METRICS_MAX_TEMPLATES:
+                name = "other"
+            stats = _stats.setdefault(name, _TemplateStats())
+        stats.duration.observe(duration)
+        stats.rows += rows
+        if error:
+            stats.errors += 1
+        stats.retries += retries
+        if wait is not None:
+            stats.pool_wait += wait
+            _pool_wait.observe(wait)
+        if slow:
+            stats.slow += 1
+    if not slow or error:
+        return None
+    entry = {
+        "query": name,
+        "durationMs": round(duration * 1000.0, 3),
+        "rows": rows,
+        "at": time.time(),
+        "profile": (
+            getattr(summary, "query_type", None) == "r"
+            and random.random() < SLOW_QUERY_PROFILE_SAMPLE_RATE
+        ),
+        "dbHits": None,
+    }
+    SLOW_QUERIES.append(entry)
+    return entry
+
+
+def _sum_db_hits(plan) -> int:
+    if not plan:
+        return 0
+    own = plan.get("dbHits", 0) or 0
+    return own + sum(_sum_db_hits(child) for child in plan.get("children", []))
+
+
+def submit_profile(entry: dict, run_profile: Callable[[], object]) -> None:
+    """run_profile()(PROFILE 재실행, 프로파일 plan dict 반환)을 백그라운드에서 실행해 항목에 db hits 기록."""
+    global _profiler, _pending_profiles
+    with _lock:
+        if _pending_profiles >= _MAX_PENDING_PROFILES:
+            entry["profile"] = False
+            return
+        _pending_profiles += 1
+        if _profiler is None:
+            _profiler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-profile")
+        profiler = _profiler
+
+    def task():
+        global _pending_profiles
+        try:
+            entry["dbHits"] = _sum_db_hits(run_profile())
+        except Exception as e:
+            entry["profileError"] = str(e)
+        finally:
+            with _lock:
+                _pending_profiles -= 1
+
+    profiler.submit(task)
+
+
+def shutdown_profiler() -> None:
+    global _profiler
+    with _lock:
+        profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.shutdown(wait=False, cancel_futures=True)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(metric: str, labels: str, hist: _Histogram) -> List[str]:
+    sep = "," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, n in zip(BUCKETS, hist.counts):
+        cumulative += n
+        lines.append(f'{metric}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{labels}{sep}le="+Inf"}} {hist.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{metric}_sum{suffix} {hist.total}")
+    lines.append(f"{metric}_count{suffix} {hist.count}")
+    return lines
+
+
+def render_prometheus() -> str:
+    """Prometheus 텍스트 노출 형식 (0.0.4)."""
+    with _lock:
+        items = sorted(_stats.items())
+        lines = [
+            "# HELP neo4j_query_duration_seconds Neo4j query latency by query template.",
+            "# TYPE neo4j_query_duration_seconds histogram",
+        ]
+        for name, stats in items:
+            lines.extend(_histogram_lines("neo4j_query_duration_seconds", f'query="{_label(name)}"', stats.duration))
+        for metric, help_text, attr in (
+            ("neo4j_query_rows_total", "Rows returned by query template.", "rows"),
+            ("neo4j_query_errors_total", "Failed queries by query template.", "errors"),
+            ("neo4j_query_retries_total", "Managed transaction retries after transient errors.", "retries"),
+            ("neo4j_query_slow_total", "Queries slower than SLOW_QUERY_THRESHOLD_MS.", "slow"),
+            ("neo4j_query_pool_wait_seconds_total",
+             "Approximate connection pool wait (client time to first response minus server time).", "pool_wait"),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, stats in items:
+                lines.append(f'{metric}{{query="{_label(name)}"}} {getattr(stats, attr)}')
+        lines.append("# HELP neo4j_pool_wait_seconds Approximate connection pool wait per query.")
+        lines.append("# TYPE neo4j_pool_wait_seconds histogram")
+        lines.extend(_histogram_lines("neo4j_pool_wait_seconds", "", _pool_wait))
+        lines.append("# HELP neo4j_queries_in_flight Queries currently executing.")
+        lines.append("# TYPE neo4j_queries_in_flight gauge")
+        lines.append(f"neo4j_queries_in_flight {_in_flight}")
+    return "\n".join(lines) + "\n"
@@ -1,59 +1,311 @@
 """
-Neo4j 연결 및 쿼리 실행. n10s 설정·온톨로지 로드 포함.
+Neo4j 연결 및 쿼리 실행. n10s 설정 포함.
+데이터 조회·변경은 managed 트랜잭션(neo4j_read / neo4j_write): 읽기는 클러스터 follower로 라우팅,
+일시 오류·deadlock·리더 변경은 드라이버가 jitter backoff로 재시도, 세션 간 bookmark 공유로 쓰기 후 읽기 일관성 보장.
 """
-import os
-import glob
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
 from fastapi import HTTPException
-from neo4j import GraphDatabase
-from neo4j.exceptions import ServiceUnavailable, AuthError, TransientError
+from neo4j import GraphDatabase, AsyncGraphDatabase, READ_ACCESS, WRITE_ACCESS
+from neo4j.exceptions import (
+    ServiceUnavailable, SessionExpired, AuthError, TransientError, ConstraintError, Neo4jError, DriverError,
+)
 
-from config import NEO4J_URI, NEO4J_USER, NEO4J_PASS, ONTOLOGY_DIR
+from config import (
+    NEO4J_URI, NEO4J_USER, NEO4J_PASS,
+    NEO4J_MAX_POOL_SIZE, NEO4J_POOL_ACQUIRE_TIMEOUT,
+    NEO4J_CONNECTION_TIMEOUT, NEO4J_MAX_CONNECTION_LIFETIME,
+    NEO4J_CONNECT_RETRIES, NEO4J_CONNECT_RETRY_DELAY, NEO4J_CONNECT_RETRY_MAX_DELAY,
+    NEO4J_TX_RETRY_TIME, NEO4J_TX_RETRY_DELAY, NEO4J_TX_RETRY_JITTER, NEO4J_RETRY_AFTER_SECONDS,
+    NEO4J_CAUSAL_CONSISTENCY, NEO4J_STREAM_FETCH_SIZE,
+)
+from db.metrics import query_started, record_query, submit_profile
+
+# sync/async 드라이버가 공유하는 커넥션 풀 설정
+DRIVER_CONFIG = {
+    "max_connection_pool_size": NEO4J_MAX_POOL_SIZE,
+    "connection_acquisition_timeout": NEO4J_POOL_ACQUIRE_TIMEOUT,
+    "connection_timeout": NEO4J_CONNECTION_TIMEOUT,
+    "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME,
+    "max_transaction_retry_time": NEO4J_TX_RETRY_TIME,
+    "initial_retry_delay": NEO4J_TX_RETRY_DELAY,
+    "retry_delay_jitter_factor": NEO4J_TX_RETRY_JITTER,
+}
+
+# sync/async 세션이 함께 쓰는 bookmark 관리자 (드라이버가 sync 콜백도 지원)
+bookmark_manager = GraphDatabase.bookmark_manager() if NEO4J_CAUSAL_CONSISTENCY else None
 
 driver = None
+async_driver = None
+_async_driver_lock = asyncio.Lock()
+_driver_lock = threading.Lock()
+
+# 기동 시 연결 확인 결과 (GET /health/startup)
+NEO4J_CONNECT_STATUS = {"connected": False, "attempts": 0, "seconds": None, "error": None}
+
+
+def open_driver():
+    """sync 드라이버 생성 (연결은 첫 세션에서 lazy하게). lifespan에서 호출, CLI 등에서는 첫 쿼리 시."""
+    global driver
+    if driver is None:
+        with _driver_lock:
+            if driver is None:
+                driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS), **DRIVER_CONFIG)
+    return driver
+
+
+def close_driver():
+    """sync 드라이버 종료 (앱 shutdown 시)."""
+    global driver
+    with _driver_lock:
+        d, driver = driver, None
+    if d is not None:
+        d.close()
+
+
+def wait_for_neo4j(
+    retries: int = NEO4J_CONNECT_RETRIES,
+    delay: float = NEO4J_CONNECT_RETRY_DELAY,
+    max_delay: float = NEO4J_CONNECT_RETRY_MAX_DELAY,
+) -> bool:
+    """연결 확인을 지수 backoff로 최대 retries번 시도. DB가 늦게 뜨는 경우용 (기동 백그라운드 작업에서 호출)."""
+    d = open_driver()
+    started = time.perf_counter()
+    for attempt in range(1, retries + 1):
+        NEO4J_CONNECT_STATUS["attempts"] = attempt
+        try:
+            d.verify_connectivity()
+        except Exception as e:
+            NEO4J_CONNECT_STATUS["error"] = str(e)
+            if attempt == retries:
+                print(f"Warning: Neo4j connection failed after {attempt} attempts: {e}")
+                break
+            time.sleep(min(delay * 2 ** (attempt - 1), max_delay))
+            continue
+        NEO4J_CONNECT_STATUS.update(connected=True, error=None)
+        print(f"Neo4j connected successfully to {NEO4J_URI}")
+        break
+    NEO4J_CONNECT_STATUS["seconds"] = time.perf_counter() - started
+    return NEO4J_CONNECT_STATUS["connected"]
+
+
+RETRY_AFTER = {"Retry-After": str(NEO4J_RETRY_AFTER_SECONDS)}
+
+
+def _driver_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Neo4j driver is not initialized. Please check the connection.",
+        headers=RETRY_AFTER,
+    )
+
+
+def _to_http_exception(e: Exception) -> HTTPException:
+    """드라이버 예외를 HTTP 응답용 예외로 변환. managed 트랜잭션은 재시도가 모두 실패한 뒤에만 여기에 도달."""
+    if isinstance(e, (ServiceUnavailable, SessionExpired)):
+        return HTTPException(status_code=503, detail=f"Neo4j service unavailable: {str(e)}", headers=RETRY_AFTER)
+    if isinstance(e, AuthError):
+        return HTTPException(status_code=401, detail=f"Neo4j authentication failed: {str(e)}")
+    if isinstance(e, TransientError):
+        return HTTPException(status_code=503, detail=f"Neo4j transient error: {str(e)}", headers=RETRY_AFTER)
+    if isinstance(e, ConstraintError):
+        return HTTPException(status_code=409, detail=f"Neo4j constraint violation: {str(e)}")
+    return HTTPException(status_code=500, detail=f"Neo4j query error: {str(e)}")
+
+
+def _session_config(access: str, **extra) -> dict:
+    return {"default_access_mode": access, "bookmark_manager": bookmark_manager, **extra}
+
+
+def _get_driver():
+    """sync driver 반환 (없으면 생성). 연결 실패는 쿼리 실행 시 503으로 변환."""
+    return open_driver()
+
+
+def _observe(
+    cypher: str, params: dict, started: float, rows: int, summary, first_response: float, retries: int = 0
+) -> None:
+    """메트릭 기록. 느린 읽기 전용 쿼리가 샘플링되면 PROFILE 재실행을 백그라운드로 예약."""
+    entry = record_query(cypher, started, rows, summary, first_response, retries=retries)
+    if entry and entry["profile"]:
+        submit_profile(entry, lambda: _profile_plan(cypher, params))
+
+
+def _profile_plan(cypher: str, params: dict):
+    """PROFILE로 재실행해 프로파일 plan(dict, 연산자별 dbHits 포함) 반환."""
+    with _get_driver().session(**_session_config(READ_ACCESS)) as s:
+        return s.run(f"PROFILE {cypher}", **params).consume().profile
+
+
+class _Attempts:
+    """managed 트랜잭션 작업 함수가 드라이버 재시도마다 다시 호출될 때 시도 횟수·마지막 시도의 첫 응답 시간 기록."""
+    __slots__ = ("count", "started", "first_response")
+
+    def __init__(self):
+        self.count = 0
+        self.started = 0.0
+        self.first_response = None
+
+    def begin(self) -> None:
+        self.count += 1
+        self.started = time.perf_counter()
 
-try:
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
-    driver.verify_connectivity()
-    print(f"Neo4j connected successfully to {NEO4J_URI}")
-except Exception as e:
-    print(f"Warning: Neo4j connection failed: {e}")
-    driver = None
+    def responded(self) -> None:
+        self.first_response = time.perf_counter() - self.started
 
+    @property
+    def retries(self) -> int:
+        return max(self.count - 1, 0)
+
+
+def _execute(access: str, cypher: str, params: dict):
+    d = _get_driver()
+    started = query_started()
+    attempts = _Attempts()
+
+    def work(tx):
+        attempts.begin()
+        result = tx.run(cypher, **params)
+        attempts.responded()
+        return list(result), result.consume()
 
-def _try_connect_neo4j():
-    """Neo4j 연결 시도. 성공 시 driver 반환, 실패 시 None. (lazy reconnection용)"""
     try:
-        d = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
-        d.verify_connectivity()
-        return d
-    except Exception:
-        return None
+        with d.session(**_session_config(access)) as s:
+            execute = s.execute_read if access == READ_ACCESS else s.execute_write
+            records, summary = execute(work)
+    except Exception as e:
+        record_query(cypher, started, error=True, retries=attempts.retries)
+        raise _to_http_exception(e)
+    _observe(cypher, params, started, len(records), summary, attempts.first_response, attempts.retries)
+    return records
+
+
+def neo4j_read(cypher: str, **params):
+    """읽기 트랜잭션 (follower 라우팅, 일시 오류 시 재시도)."""
+    return _execute(READ_ACCESS, cypher, params)
+
+
+def neo4j_write(cypher: str, **params):
+    """쓰기 트랜잭션 (리더 라우팅, 일시 오류·deadlock·리더 변경 시 재시도). 재시도될 수 있으므로 멱등하게 작성."""
+    return _execute(WRITE_ACCESS, cypher, params)
 
 
 def neo4j_run(cypher: str, **params):
-    """Neo4j 쿼리 실행. driver가 None이면 한 번 재연결 시도."""
-    global driver
-    if driver is None:
-        driver = _try_connect_neo4j()
-        if driver is not None:
-            print(f"Neo4j reconnected successfully to {NEO4J_URI}")
-        else:
-            raise HTTPException(
-                status_code=503,
-                detail="Neo4j driver is not initialized. Please check the connection."
-            )
+    """
+    auto-commit 실행 (재시도 없음). 트랜잭션 안에서 실행할 수 없는 스키마·관리 명령
+    (인덱스·제약 조건 생성, n10s 설정) 전용. 데이터 조회·변경은 neo4j_read / neo4j_write.
+    """
+    d = _get_driver()
+    started = query_started()
     try:
-        with driver.session() as s:
+        with d.session(**_session_config(WRITE_ACCESS)) as s:
             result = s.run(cypher, **params)
-            return list(result)
-    except ServiceUnavailable as e:
-        raise HTTPException(status_code=503, detail=f"Neo4j service unavailable: {str(e)}")
-    except AuthError as e:
-        raise HTTPException(status_code=401, detail=f"Neo4j authentication failed: {str(e)}")
-    except TransientError as e:
-        raise HTTPException(status_code=503, detail=f"Neo4j transient error: {str(e)}")
+            first_response = time.perf_counter() - started
+            records = list(result)
+            summary = result.consume()
+    except Exception as e:
+        record_query(cypher, started, error=True)
+        raise _to_http_exception(e)
+    _observe(cypher, params, started, len(records), summary, first_response)
+    return records
+
+
+@contextmanager
+def neo4j_transaction(name: str = "transaction", access: str = WRITE_ACCESS):
+    """
+    명시적 트랜잭션. 블록이 정상 종료되면 커밋, 예외 시 롤백 (재시도 없음).
+    여러 쿼리를 한 번의 세션·트랜잭션으로 묶을 때 사용. 메트릭은 트랜잭션 전체를 tx:{name}으로 기록.
+    """
+    d = _get_driver()
+    started = query_started()
+    try:
+        with d.session(**_session_config(access)) as s:
+            with s.begin_transaction() as tx:
+                yield tx
+    except (Neo4jError, DriverError) as e:
+        record_query("", started, error=True, name=f"tx:{name}")
+        raise _to_http_exception(e)
+    except BaseException:
+        record_query("", started, error=True, name=f"tx:{name}")
+        raise
+    record_query("", started, name=f"tx:{name}")
+
+
+async def _get_async_driver():
+    """공유 AsyncDriver 반환. 최초 호출 시(또는 연결 실패 후) 생성·검증."""
+    global async_driver
+    if async_driver is not None:
+        return async_driver
+    async with _async_driver_lock:
+        if async_driver is None:
+            d = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS), **DRIVER_CONFIG)
+            try:
+                await d.verify_connectivity()
+            except Exception:
+                await d.close()
+                raise _driver_unavailable()
+            async_driver = d
+            print(f"Neo4j async driver connected to {NEO4J_URI}")
+    return async_driver
+
+
+async def neo4j_read_async(cypher: str, **params):
+    """읽기 트랜잭션 비동기 실행 (neo4j_read와 같은 라우팅·재시도). 이벤트 루프를 막지 않고 공유 커넥션 풀을 사용."""
+    d = await _get_async_driver()
+    started = query_started()
+    attempts = _Attempts()
+
+    async def work(tx):
+        attempts.begin()
+        result = await tx.run(cypher, **params)
+        attempts.responded()
+        return [record async for record in result], await result.consume()
+
+    try:
+        async with d.session(**_session_config(READ_ACCESS)) as s:
+            records, summary = await s.execute_read(work)
+    except Exception as e:
+        record_query(cypher, started, error=True, retries=attempts.retries)
+        raise _to_http_exception(e)
+    _observe(cypher, params, started, len(records), summary, attempts.first_response, attempts.retries)
+    return records
+
+
+async def neo4j_stream_async(cypher: str, **params):
+    """
+    Neo4j 읽기 쿼리 결과를 레코드 단위로 비동기 스트리밍.
+    드라이버가 fetch_size 단위로 lazy하게 가져오므로 결과 크기와 무관하게 메모리가 일정.
+    이미 보낸 레코드를 되돌릴 수 없으므로 재시도하지 않음 (follower 라우팅·bookmark는 동일).
+    """
+    d = await _get_async_driver()
+    started = query_started()
+    rows = 0
+    try:
+        async with d.session(**_session_config(READ_ACCESS, fetch_size=NEO4J_STREAM_FETCH_SIZE)) as s:
+            result = await s.run(cypher, **params)
+            first_response = time.perf_counter() - started
+            async for record in result:
+                rows += 1
+                yield record
+            summary = await result.consume()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Neo4j query error: {str(e)}")
+        record_query(cypher, started, rows, error=True)
+        raise _to_http_exception(e)
+    except BaseException:
+        # 클라이언트 연결 종료 등으로 스트림이 중간에 닫힌 경우
+        record_query(cypher, started, rows)
+        raise
+    _observe(cypher, params, started, rows, summary, first_response)
+
+
+async def close_async_driver():
+    """AsyncDriver 종료 (앱 shutdown 시)."""
+    global async_driver
+    if async_driver is not None:
+        await async_driver.close()
+        async_driver = None
 
 
 def ensure_n10s_config():
@@ -79,25 +331,3 @@ def ensure_n10s_config():
         neo4j_run("CREATE CONSTRAINT n10s_uri IF NOT EXISTS FOR (r:Resource) REQUIRE r.uri IS UNIQUE")
     except Exception as e:
         print(f"Warning: Constraint creation failed: {e}")
-
-
-def load_ontology_files():
-    """온톨로지 파일들을 자동으로 로딩."""
-    if not os.path.exists(ONTOLOGY_DIR):
-        return
-    ttl_files = [
-        f for f in glob.glob(os.path.join(ONTOLOGY_DIR, "*.ttl"))
-        if not os.path.basename(f).lower().startswith("shapes")
-    ]
-    for ttl_file in ttl_files:
-        try:
-            with open(ttl_file, "r", encoding="utf-8") as f:
-                ttl_content = f.read()
-            neo4j_run("""
-            CALL n10s.rdf.import.inline($ttl, "Turtle")
-            YIELD terminationStatus, triplesLoaded
-            RETURN terminationStatus AS status, triplesLoaded AS count
-            """, ttl=ttl_content)
-            print(f"Loaded ontology file: {os.path.basename(ttl_file)}")
-        except Exception as e:
-            print(f"Error loading {ttl_file}: {e}")
@@ -0,0 +1,168 @@
+"""
+ONTOLOGY_DIR의 TTL 파일 증분 로드.
+파일 내용 해시(sha256)를 Neo4j의 (:OntologyFile) manifest에 기록해 변경 없는 파일은 건너뜀.
+큰 파일은 N-Triples로 변환 후 청크 단위로 n10s 임포트. 앱 기동을 막지 않도록 백그라운드에서 실행.
+로드 중에도 API가 응답하므로, 파일을 임포트했으면 끝난 뒤 읽기 캐시·메모리 인덱스를 무효화.
+"""
+import glob
+import hashlib
+import os
+import tempfile
+import time
+from typing import Dict, Iterator
+
+from config import ONTOLOGY_DIR, ONTOLOGY_INLINE_MAX_BYTES, ONTOLOGY_CHUNK_TRIPLES
+from db.neo4j import neo4j_read, neo4j_write, ensure_n10s_config, wait_for_neo4j
+from db.indexes import ensure_indexes, run_startup_audit
+
+# 백그라운드 로드 상태 (readiness 엔드포인트용)
+ONTOLOGY_LOAD_STATUS: Dict = {
+    "state": "pending",
+    "loaded": [],
+    "skipped": [],
+    "errors": [],
+    # 인덱스·제약·마이그레이션 실패 ({이름: 오류}). 조회 성능만 저하되므로 readiness는 막지 않음
+    "schemaErrors": {},
+    "startedAt": None,
+    "finishedAt": None,
+}
+
+
+def file_sha256(path: str) -> str:
+    """파일 내용 sha256 (1MB 블록 단위 스트리밍)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def turtle_to_ntriples(src_path: str, dst_path: str) -> None:
+    """
+    Turtle 파일을 N-Triples로 변환. 청크 분할 시 blank node가 끊기지 않도록 skolemize.
+    """
+    from rdflib import Graph
+
+    g = Graph().parse(src_path, format="turtle")
+    g.skolemize().serialize(destination=dst_path, format="nt", encoding="utf-8")
+
+
+def _iter_ntriples_chunks(path: str, chunk_triples: int) -> Iterator[str]:
+    """N-Triples 파일을 chunk_triples 줄 단위 문자열로 분할."""
+    lines = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            lines.append(line)
+            if len(lines) >= chunk_triples:
+                yield "".join(lines)
+                lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def _import_inline(rdf: str, fmt: str) -> int:
+    res = neo4j_write("""
+    CALL n10s.rdf.import.inline($rdf, $fmt)
+    YIELD terminationStatus, triplesLoaded
+    RETURN terminationStatus AS status, triplesLoaded AS count
+    """, rdf=rdf, fmt=fmt)
+    return res[0]["count"] if res else 0
+
+
+def import_ntriples_file(path: str, chunk_triples: int = ONTOLOGY_CHUNK_TRIPLES) -> int:
+    """N-Triples 파일을 청크 단위로 임포트. 메모리에는 한 청크만 유지."""
+    return sum(_import_inline(chunk, "N-Triples") for chunk in _iter_ntriples_chunks(path, chunk_triples))
+
+
+def import_turtle_file(path: str) -> int:
+    """Turtle 파일 임포트. ONTOLOGY_INLINE_MAX_BYTES 이하는 한 번에, 초과 시 N-Triples 청크로."""
+    if os.path.getsize(path) <= ONTOLOGY_INLINE_MAX_BYTES:
+        with open(path, "r", encoding="utf-8") as f:
+            return _import_inline(f.read(), "Turtle")
+    with tempfile.TemporaryDirectory() as tmp:
+        nt_path = os.path.join(tmp, "data.nt")
+        turtle_to_ntriples(path, nt_path)
+        return import_ntriples_file(nt_path)
+
+
+def _read_manifest() -> Dict[str, str]:
+    rows = neo4j_read("MATCH (m:OntologyFile) RETURN m.name AS name, m.sha256 AS sha256")
+    return {row["name"]: row["sha256"] for row in rows}
+
+
+def _write_manifest(name: str, sha256: str, count: int) -> None:
+    neo4j_write("""
+    MERGE (m:OntologyFile {name: $name})
+    SET m.sha256 = $sha256, m.triplesLoaded = $count, m.loadedAt = datetime()
+    """, name=name, sha256=sha256, count=count)
+
+
+def load_ontology_files():
+    """온톨로지 파일들을 자동으로 로딩. manifest 해시가 같은 파일은 건너뜀."""
+    if not os.path.exists(ONTOLOGY_DIR):
+        return
+    ttl_files = [
+        f for f in glob.glob(os.path.join(ONTOLOGY_DIR, "*.ttl"))
+        if not os.path.basename(f).lower().startswith("shapes")
+    ]
+    try:
+        manifest = _read_manifest()
+    except Exception as e:
+        print(f"Warning: ontology manifest unavailable, reloading all files: {e}")
+        manifest = {}
+    # 임포트를 시도한 파일이 있으면 (실패해도 앞선 청크는 커밋됐을 수 있음) 끝난 뒤 무효화
+    imported = False
+    for ttl_file in sorted(ttl_files):
+        name = os.path.basename(ttl_file)
+        try:
+            sha256 = file_sha256(ttl_file)
+            if manifest.get(name) == sha256:
+                ONTOLOGY_LOAD_STATUS["skipped"].append(name)
+                continue
+            imported = True
+            count = import_turtle_file(ttl_file)
+            _write_manifest(name, sha256, count)
+            ONTOLOGY_LOAD_STATUS["loaded"].append(name)
+            print(f"Loaded ontology file: {name} ({count} triples)")
+        except Exception as e:
+            ONTOLOGY_LOAD_STATUS["errors"].append(f"{name}: {e}")
+            print(f"Error loading {ttl_file}: {e}")
+    if imported:
+        _invalidate_derived()
+
+
+def _invalidate_derived() -> None:
+    """임포트 도중 만들어진 캐시·인덱스는 일부 그래프만 반영하므로 폐기 (인덱스는 다음 조회 때 재로드)."""
+    # services 모듈이 db 패키지를 import하므로 순환 import를 피해 함수 안에서 import
+    from services.cache import read_cache
+    from services.equipment_index import equipment_index
+    from services.triple_index import triple_index, NEO4J
+
+    read_cache.clear()
+    equipment_index.mark_stale()
+    # TTL 원본 미러는 Neo4j 임포트 상태와 무관하므로 (재파싱 비용이 큼) 그대로 둠
+    if triple_index.source == NEO4J:
+        triple_index.mark_stale()
+
+
+def run_startup_load():
+    """
+    연결 확인(재시도) + n10s 설정 + 인덱스 생성 + 온톨로지 로드 (백그라운드 스레드에서 실행).
+    진행 상태를 ONTOLOGY_LOAD_STATUS에 기록.
+    """
+    ONTOLOGY_LOAD_STATUS.update(state="loading", startedAt=time.time())
+    try:
+        if not wait_for_neo4j():
+            raise RuntimeError("Neo4j unavailable")
+        ensure_n10s_config()
+        ONTOLOGY_LOAD_STATUS["schemaErrors"] = ensure_indexes()
+        load_ontology_files()
+        run_startup_audit()
+    except Exception as e:
+        ONTOLOGY_LOAD_STATUS["errors"].append(str(e))
+    ONTOLOGY_LOAD_STATUS.update(
+        state="failed" if ONTOLOGY_LOAD_STATUS["errors"] else "ready",
+        finishedAt=time.time(),
+    )
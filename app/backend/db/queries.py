@@ -0,0 +1,35 @@
+"""
+라우터 Cypher 쿼리 레지스트리.
+쿼리를 이름·샘플 파라미터와 함께 등록해 두면 db.indexes의 EXPLAIN 감사 대상이 됨.
+동적으로 조합되는 쿼리는 대표 조합을 각각 등록.
+"""
+from typing import Dict, Iterable, Optional
+
+
+class RegisteredQuery:
+    def __init__(self, name: str, cypher: str, params: dict, allow: Iterable[str]):
+        self.name = name
+        self.cypher = cypher
+        self.params = params
+        # 의도된 전체 스캔 (예: 목록 조회·재계산) — 감사에서 경고하지 않을 연산자
+        self.allow = frozenset(allow)
+
+
+QUERY_REGISTRY: Dict[str, RegisteredQuery] = {}
+_NAMES_BY_CYPHER: Dict[str, str] = {}
+
+
+def _normalize(cypher: str) -> str:
+    return " ".join(cypher.split())
+
+
+def register_query(name: str, cypher: str, allow: Iterable[str] = (), **sample_params) -> str:
+    """쿼리 등록 후 cypher를 그대로 반환 (모듈 상수 정의에 바로 사용)."""
+    QUERY_REGISTRY[name] = RegisteredQuery(name, cypher, sample_params, allow)
+    _NAMES_BY_CYPHER[_normalize(cypher)] = name
+    return cypher
+
+
+def query_name(cypher: str) -> Optional[str]:
+    """등록된 쿼리면 이름, 아니면 None."""
+    return _NAMES_BY_CYPHER.get(_normalize(cypher))
@@ -1,18 +1,60 @@
 """
 Manufacturing Ontology API - 진입점.
-CORS, 전역 예외 처리, 라우터 등록만 수행.
+CORS, 전역 예외 처리, 라우터 등록, lifespan(드라이버 생성·백그라운드 기동 작업·종료 정리)만 수행.
+scikit-learn·rdflib·pyshacl은 해당 엔드포인트 첫 사용 시 import (GET /health/startup에서 확인).
 """
-import traceback
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from neo4j.exceptions import ServiceUnavailable, AuthError, TransientError
+import time
 
-from db.neo4j import ensure_n10s_config, load_ontology_files
-from routers import ontology, graph, manufacturing, analytics, automl
+_IMPORT_STARTED = time.perf_counter()
 
-app = FastAPI(title="Manufacturing Ontology API", version="2.0.0")
+import asyncio  # noqa: E402
+import traceback  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from neo4j.exceptions import ServiceUnavailable, AuthError, TransientError  # noqa: E402
 
+from db.neo4j import open_driver, close_driver, close_async_driver, RETRY_AFTER  # noqa: E402
+from db.metrics import shutdown_profiler  # noqa: E402
+from db.ontology_loader import run_startup_load  # noqa: E402
+from services.shacl import shutdown_pool as shutdown_shacl_pool  # noqa: E402
+from services.jobs import automl_jobs  # noqa: E402
+from services.startup import timed_import, record_phase  # noqa: E402
+from services.serialization import FastJSONResponse  # noqa: E402
+from services.uploads import UploadLimitMiddleware, UPLOAD_BODY_LIMITS  # noqa: E402
+
+ROUTERS = ("ontology", "graph", "manufacturing", "analytics", "automl", "health", "metrics", "events")
+_routers = [timed_import(f"routers.{name}") for name in ROUTERS]
+record_phase("import.main", time.perf_counter() - _IMPORT_STARTED)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    기동: 드라이버 객체 생성(네트워크 대기 없음) 후 연결 확인(재시도)·n10s 설정·온톨로지 로드를 백그라운드로 시작.
+    DB가 늦게 떠도 health 체크는 바로 응답하고, 완료 여부는 /health/ready로 확인.
+    종료: 드라이버 커넥션 풀·SHACL 워커 풀·AutoML 작업 큐·PROFILE 스레드 정리.
+    """
+    started = time.perf_counter()
+    open_driver()
+    app.state.ontology_load_task = asyncio.create_task(asyncio.to_thread(run_startup_load))
+    record_phase("lifespan.startup", time.perf_counter() - started)
+    yield
+    await close_async_driver()
+    close_driver()
+    shutdown_shacl_pool()
+    automl_jobs.shutdown()
+    shutdown_profiler()
+
+
+app = FastAPI(
+    title="Manufacturing Ontology API", version="2.0.0",
+    lifespan=lifespan, default_response_class=FastJSONResponse,
+)
+
+# 나중에 추가한 미들웨어가 바깥쪽 → 413 응답에도 CORS 헤더가 붙도록 CORS를 마지막에 추가
+app.add_middleware(UploadLimitMiddleware, limits=UPLOAD_BODY_LIMITS)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3001", "http://localhost:80", "http://localhost:3000"],
@@ -41,6 +83,7 @@ async def global_exception_handler(request: Request, exc: Exception):
                 "detail": "Neo4j database is not available. Please check the connection.",
                 "type": error_type,
             },
+            headers=RETRY_AFTER,
         )
     if isinstance(exc, AuthError):
         return JSONResponse(
@@ -59,6 +102,7 @@ async def global_exception_handler(request: Request, exc: Exception):
                 "detail": "Temporary error occurred. Please try again later.",
                 "type": error_type,
             },
+            headers=RETRY_AFTER,
         )
     return JSONResponse(
         status_code=500,
@@ -71,15 +115,5 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
-@app.on_event("startup")
-def startup():
-    """앱 기동 시 n10s 설정 및 온톨로지 파일 로드."""
-    ensure_n10s_config()
-    load_ontology_files()
-
-
-app.include_router(ontology.router)
-app.include_router(graph.router)
-app.include_router(manufacturing.router)
-app.include_router(analytics.router)
-app.include_router(automl.router)
+for _module in _routers:
+    app.include_router(_module.router)
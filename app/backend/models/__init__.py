@@ -4,8 +4,11 @@ from .schemas import (
     TripleResponse,
     BulkTripleOperation,
     WorkOrder,
+    WorkOrderUpdate,
     QualityControl,
+    MaintenanceEvent,
     EquipmentStatus,
+    EquipmentStatusUpdate,
 )
 
 __all__ = [
@@ -14,6 +17,9 @@ __all__ = [
     "TripleResponse",
     "BulkTripleOperation",
     "WorkOrder",
+    "WorkOrderUpdate",
     "QualityControl",
+    "MaintenanceEvent",
     "EquipmentStatus",
+    "EquipmentStatusUpdate",
 ]
@@ -30,6 +30,8 @@ class TripleResponse(BaseModel):
 class BulkTripleOperation(BaseModel):
     add: List[Triple] = []
     delete: List[Triple] = []
+    # True면 전체를 하나의 트랜잭션으로 처리하고, 항목 오류가 하나라도 있으면 전부 롤백
+    atomic: bool = False
 
 
 class WorkOrder(BaseModel):
@@ -40,10 +42,24 @@ class WorkOrder(BaseModel):
     equipment_id: Optional[str] = None
 
 
+class WorkOrderUpdate(BaseModel):
+    status: Optional[str] = None
+    actualQuantity: Optional[int] = None
+
+
 class QualityControl(BaseModel):
     product_id: str
     qualityResult: str
     timestamp: datetime
+    # 같은 키로 다시 보내면 중복 생성하지 않음 (재전송 안전)
+    idempotency_key: Optional[str] = None
+
+
+class MaintenanceEvent(BaseModel):
+    equipment_id: str
+    maintenanceType: str
+    timestamp: datetime
+    idempotency_key: Optional[str] = None
 
 
 class EquipmentStatus(BaseModel):
@@ -51,3 +67,7 @@ class EquipmentStatus(BaseModel):
     status: str
     lastMaintenance: Optional[datetime] = None
     nextMaintenance: Optional[datetime] = None
+
+
+class EquipmentStatusUpdate(BaseModel):
+    status: str
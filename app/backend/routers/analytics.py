@@ -1,42 +1,99 @@
 """
 분석 API (품질 트렌드, 설비 효율 OEE).
 """
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
 
-from db.neo4j import neo4j_run
+from db.neo4j import neo4j_write, neo4j_read_async
+from db.queries import register_query
+from services.oee import COUNTER_RETURN, REBUILD_COUNTERS, efficiency_from_counter
+from services.quality import GRANULARITIES, REBUILD_ROLLUPS, TREND_QUERY, trend_range
+from services.serialization import json_response, table
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
+def _fleet_query(where_clauses: List[str]) -> str:
+    where_clause = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+    return f"""
+    MATCH (c:OEECounter)
+    {where_clause}
+    {COUNTER_RETURN}
+    ORDER BY equipmentId
+    """
+
+
+# 카운터는 설비당 1개라 전체·부분 문자열 조회의 라벨 스캔은 허용
+register_query("analytics.efficiency.fleet", _fleet_query([]), allow=("NodeByLabelScan",))
+register_query(
+    "analytics.efficiency.fleet.ids", _fleet_query(["c.equipment IN $equipment_ids"]),
+    equipment_ids=["ex:Equipment_1"],
+)
+register_query(
+    "analytics.efficiency.fleet.contains", _fleet_query(["c.equipment CONTAINS $contains"]),
+    allow=("NodeByLabelScan",), contains="Equipment",
+)
+
+EFFICIENCY_QUERY = register_query("analytics.efficiency", f"""
+MATCH (c:OEECounter {{equipment: $equipment_id}})
+{COUNTER_RETURN}
+""", equipment_id="ex:Equipment_1")
+
+
 @router.get("/quality-trend")
-def get_quality_trend(period: str = "7d"):
-    """품질 트렌드 분석."""
-    rows = neo4j_run("""
-    MATCH (q:QualityControl)
-    WHERE q.timestamp >= datetime() - duration('P7D')
-    RETURN date(q.timestamp) AS date,
-           q.qualityResult AS result,
-           count(*) AS count
-    ORDER BY date
-    """)
-    return {"trend": [dict(row) for row in rows]}
+async def get_quality_trend(
+    period: str = Query("7d", description="조회 기간 (예: 24h, 7d, 12w)"),
+    granularity: str = Query("day", description="버킷 단위 (hour, day, week)"),
+    shape: str = Query("records", description="records 또는 columns"),
+):
+    """품질 트렌드 분석. 사전 집계된 롤업 버킷만 읽으므로 원본 측정값 수와 무관."""
+    start, n_buckets = trend_range(period, granularity)
+    rows = await neo4j_read_async(TREND_QUERY, granularity=granularity, start=start)
+    return json_response({
+        "period": period,
+        "granularity": granularity,
+        "start": start,
+        "buckets": n_buckets,
+        "trend": table(rows, shape),
+    })
+
+
+@router.post("/quality-trend/rebuild")
+def rebuild_quality_trend():
+    """기존 품질 데이터 전체로 롤업 재계산 (최초 도입·데이터 불일치 복구용)."""
+    rows = neo4j_write(REBUILD_ROLLUPS, granularities=list(GRANULARITIES))
+    return {"bucketCount": rows[0]["bucketCount"] if rows else 0}
+
+
+@router.get("/equipment-efficiency")
+async def get_fleet_efficiency(
+    equipment_ids: Optional[List[str]] = Query(None, description="조회할 설비 URI (반복 지정)"),
+    contains: Optional[str] = Query(None, description="설비 URI 부분 문자열 필터"),
+):
+    """전체(또는 필터된) 설비의 OEE를 한 번에 조회. 누적 카운터만 읽으므로 작업지시 스캔 없음."""
+    where_clauses = []
+    params = {}
+    if equipment_ids:
+        where_clauses.append("c.equipment IN $equipment_ids")
+        params["equipment_ids"] = equipment_ids
+    if contains:
+        where_clauses.append("c.equipment CONTAINS $contains")
+        params["contains"] = contains
+    rows = await neo4j_read_async(_fleet_query(where_clauses), **params)
+    return {"efficiency": [efficiency_from_counter(row) for row in rows]}
+
+
+@router.post("/equipment-efficiency/rebuild")
+def rebuild_equipment_efficiency():
+    """기존 작업지시 전체로 OEE 카운터 재계산 (최초 도입·데이터 불일치 복구용)."""
+    rows = neo4j_write(REBUILD_COUNTERS)
+    return {"equipmentCount": rows[0]["equipmentCount"] if rows else 0}
 
 
 @router.get("/equipment-efficiency/{equipment_id}")
-def get_equipment_efficiency(equipment_id: str):
-    """설비 효율성 (OEE) 계산."""
-    rows = neo4j_run("""
-    MATCH (e:Equipment {uri: $equipment_id})-[:executedBy]<-()-[w:WorkOrder]
-    RETURN
-        count(w) AS totalOrders,
-        sum(w.plannedQuantity) AS plannedQuantity,
-        sum(w.actualQuantity) AS actualQuantity,
-        avg(CASE WHEN w.status = 'completed' THEN 1.0 ELSE 0.0 END) AS availability,
-        avg(CASE WHEN w.actualQuantity >= w.plannedQuantity THEN 1.0 ELSE 0.0 END) AS performance,
-        avg(CASE WHEN w.status = 'completed' AND w.actualQuantity >= w.plannedQuantity THEN 1.0 ELSE 0.0 END) AS quality
-    """, equipment_id=equipment_id)
+async def get_equipment_efficiency(equipment_id: str):
+    """설비 효율성 (OEE). 작업지시 생성·상태 변경 시 갱신되는 누적 카운터에서 계산."""
+    rows = await neo4j_read_async(EFFICIENCY_QUERY, equipment_id=equipment_id)
     if rows:
-        data = dict(rows[0])
-        data["oee"] = data["availability"] * data["performance"] * data["quality"]
-        return {"efficiency": data}
+        return {"efficiency": efficiency_from_counter(rows[0])}
     return {"efficiency": None}
@@ -1,12 +1,22 @@
 """
 AutoML API: 산업데이터 기반 적합 모델 도출 (scikit-learn).
 """
+import asyncio
+import os
+import shutil
+import tempfile
 from typing import List, Literal, Optional
 import numpy as np
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
+from pydantic import BaseModel, Field
 
-from services.automl import select_best_model
+from config import AUTOML_TIME_BUDGET_SECONDS, AUTOML_MAX_UPLOAD_BYTES, UPLOAD_SPOOL_DIR
+from services.datasets import detect_format, load_table, load_training_data
+from services.jobs import automl_jobs, JobQueueFull, SUCCEEDED, FAILED
+from services.model_registry import (
+    fit_and_register, check_save_name, predict, list_models, list_versions, get_metadata,
+)
+from services.uploads import spool_upload
 
 router = APIRouter(prefix="/automl", tags=["automl"])
 
@@ -18,6 +28,109 @@ class AutoMLFitRequest(BaseModel):
     task: Literal["classification", "regression"] = "classification"
     cv: Optional[int] = 3
     scoring: Optional[str] = None
+    # 요청당 시간 예산(초). 초과 시 끝난 후보들 중 최적 결과 반환
+    time_budget: Optional[float] = Field(None, gt=0)
+    # 최적 모델을 전체 데이터로 재학습해 레지스트리에 저장 (이름 기본값: automl-{task})
+    save_model: bool = True
+    save_as: Optional[str] = None
+
+
+class AutoMLPredictRequest(BaseModel):
+    """등록된 모델로 배치 예측. version 미지정 시 최신 버전."""
+    model: str
+    version: Optional[int] = None
+    features: List[List[float]]
+    proba: bool = False
+
+
+def _to_arrays(req: AutoMLFitRequest):
+    """요청 본문을 학습용 numpy 배열로 변환·검증."""
+    try:
+        X = np.array(req.features, dtype=float)
+        y = np.array(req.target, dtype=float)
+    except (ValueError, TypeError):
+        X = y = None
+    if X is None or X.ndim != 2 or y.ndim != 1 or len(X) != len(y) or len(X) < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="features must be 2D array, target 1D array, same length and at least 2 samples.",
+        )
+    return X, y
+
+
+def _fit_kwargs(req, n_samples: int) -> dict:
+    """select_best_model 옵션 (JSON 요청·업로드 폼 공통)."""
+    return {
+        "task": req.task,
+        "cv": min(req.cv or 3, max(2, n_samples // 2)),
+        "scoring": req.scoring,
+        "time_budget": min(req.time_budget or AUTOML_TIME_BUDGET_SECONDS, AUTOML_TIME_BUDGET_SECONDS),
+    }
+
+
+class AutoMLUploadForm:
+    """파일 업로드 학습 옵션 (multipart form 필드)."""
+
+    def __init__(
+        self,
+        task: Literal["classification", "regression"] = Form("classification"),
+        cv: Optional[int] = Form(3),
+        scoring: Optional[str] = Form(None),
+        time_budget: Optional[float] = Form(None, gt=0),
+        save_model: bool = Form(True),
+        save_as: Optional[str] = Form(None),
+        format: Optional[str] = Form(None, description="npy | csv | parquet | arrow (기본: 확장자로 판단)"),
+        target_column: Optional[str] = Form(None, description="target 열 이름 또는 인덱스 (기본: 마지막 열)"),
+        header: bool = Form(True, description="CSV 첫 줄이 열 이름인지 여부"),
+    ):
+        self.task = task
+        self.cv = cv
+        self.scoring = scoring
+        self.time_budget = time_budget
+        self.save_model = save_model
+        self.save_as = save_as
+        self.format = format
+        self.target_column = target_column
+        self.header = header
+
+
+def _check_request(req) -> None:
+    """교차 검증·재학습 전에 거절할 수 있는 입력 오류 확인 (잘못된 save_as는 학습 후가 아니라 요청 시 400)."""
+    if req.save_model:
+        check_save_name(req.save_as)
+
+
+def _select_and_register(X, y, req, job=None) -> dict:
+    """모델 선택 후 req.save_model이면 최적 모델을 재학습·등록해 결과에 registered_model로 포함."""
+    # scikit-learn(수백 ms)은 첫 학습 요청 시 import해 앱 기동을 늦추지 않음
+    from services.automl import select_best_model, AutoMLCancelled
+    hooks = {"progress": job.set_progress, "cancel_event": job.cancel_event} if job else {}
+    result = select_best_model(X, y, **_fit_kwargs(req, len(X)), **hooks)
+    if req.save_model:
+        if job is not None and job.cancel_event.is_set():
+            raise AutoMLCancelled()
+        result["registered_model"] = fit_and_register(X, y, result, req.save_as)
+    return result
+
+
+async def _load_upload(tmp: str, file: UploadFile, target_file: Optional[UploadFile], form: AutoMLUploadForm):
+    """업로드를 tmp에 스풀링 후 (X, y) 로드. .npy(와 Arrow IPC 단일 열)는 파일 memmap view이므로 tmp는 학습이 끝날 때까지 유지해야 함."""
+    fmt = detect_format(file.filename, form.format)
+    features_path = os.path.join(tmp, "features." + fmt)
+    await spool_upload(file, features_path, AUTOML_MAX_UPLOAD_BYTES)
+    target_path, target_fmt = None, None
+    if target_file is not None:
+        target_fmt = detect_format(target_file.filename)
+        target_path = os.path.join(tmp, "target." + target_fmt)
+        await spool_upload(target_file, target_path, AUTOML_MAX_UPLOAD_BYTES)
+    try:
+        return await asyncio.to_thread(
+            load_training_data, features_path, fmt, target_path, target_fmt, form.target_column, form.header
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not read training data: {e}")
 
 
 @router.post("/fit")
@@ -26,20 +139,158 @@ def automl_fit(req: AutoMLFitRequest):
     입력된 산업데이터(features, target)로 여러 모델을 비교해
     적합한 모델 이름과 검증 점수를 반환합니다. (scikit-learn 기반)
     """
-    X = np.array(req.features, dtype=float)
-    y = np.array(req.target, dtype=float)
-    if X.ndim != 2 or y.ndim != 1 or len(X) != len(y) or len(X) < 2:
-        raise HTTPException(
-            status_code=400,
-            detail="features must be 2D array, target 1D array, same length and at least 2 samples.",
-        )
+    _check_request(req)
+    X, y = _to_arrays(req)
     try:
-        result = select_best_model(
-            X, y,
-            task=req.task,
-            cv=min(req.cv or 3, max(2, len(X) // 2)),
-            scoring=req.scoring,
-        )
-        return result
+        return _select_and_register(X, y, req)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/fit/upload")
+async def automl_fit_upload(
+    file: UploadFile = File(..., description="학습 데이터 (.npy / .csv / .parquet / .arrow)"),
+    target_file: Optional[UploadFile] = File(None, description="별도 target 파일 (선택)"),
+    form: AutoMLUploadForm = Depends(),
+):
+    """
+    /automl/fit과 같지만 학습 데이터를 파일로 업로드.
+    JSON float 리스트 변환 없이 numpy로 직접 읽어 파싱 시간·메모리 사용을 줄임.
+    """
+    _check_request(form)
+    with tempfile.TemporaryDirectory(dir=UPLOAD_SPOOL_DIR) as tmp:
+        X, y = await _load_upload(tmp, file, target_file, form)
+        try:
+            return await asyncio.to_thread(_select_and_register, X, y, form)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+def _get_job(job_id: str):
+    job = automl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/jobs", status_code=202)
+def submit_automl_job(req: AutoMLFitRequest):
+    """AutoML 학습을 비동기 작업으로 등록하고 job_id 반환. 대기열이 가득 차면 429."""
+    _check_request(req)
+    X, y = _to_arrays(req)
+
+    def run(job):
+        return _select_and_register(X, y, req, job)
+
+    try:
+        job = automl_jobs.submit("automl.fit", run)
+    except JobQueueFull:
+        raise HTTPException(status_code=429, detail="AutoML job queue is full, retry later")
+    return job.to_dict()
+
+
+@router.post("/jobs/upload", status_code=202)
+async def submit_automl_upload_job(
+    file: UploadFile = File(..., description="학습 데이터 (.npy / .csv / .parquet / .arrow)"),
+    target_file: Optional[UploadFile] = File(None, description="별도 target 파일 (선택)"),
+    form: AutoMLUploadForm = Depends(),
+):
+    """파일 업로드 학습을 비동기 작업으로 등록. 스풀 파일은 작업 종료 시 삭제."""
+    _check_request(form)
+    tmp = tempfile.mkdtemp(dir=UPLOAD_SPOOL_DIR)
+    try:
+        X, y = await _load_upload(tmp, file, target_file, form)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    def run(job):
+        return _select_and_register(X, y, form, job)
+
+    try:
+        # 대기 중 취소·종료 시 폐기처럼 run이 실행되지 않는 경우에도 스풀 파일 삭제
+        job = automl_jobs.submit("automl.fit", run, on_finish=lambda: shutil.rmtree(tmp, ignore_errors=True))
+    except JobQueueFull:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise HTTPException(status_code=429, detail="AutoML job queue is full, retry later")
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}")
+def get_automl_job(job_id: str):
+    """작업 상태·진행률 (완료 task 수 / 전체 후보×fold 수)."""
+    return _get_job(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/result")
+def get_automl_job_result(job_id: str):
+    """완료된 작업 결과. 진행 중·취소 시 409, 실패 시 500."""
+    job = _get_job(job_id)
+    if job.status == SUCCEEDED:
+        return job.result
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+
+@router.delete("/jobs/{job_id}")
+def cancel_automl_job(job_id: str):
+    """작업 취소. 실행 중인 작업은 다음 확인 시점(최대 수백 ms)에 중단."""
+    job = automl_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.post("/predict")
+def automl_predict(req: AutoMLPredictRequest):
+    """등록된 모델로 배치 예측 (한 번의 벡터화 predict 호출). proba=true면 클래스 확률 포함."""
+    try:
+        X = np.array(req.features, dtype=float)
+    except (ValueError, TypeError):
+        X = None
+    if X is None or X.ndim != 2:
+        raise HTTPException(status_code=400, detail="features must be 2D array with rows of equal length.")
+    return predict(req.model, X, req.version, req.proba)
+
+
+@router.post("/predict/upload")
+async def automl_predict_upload(
+    file: UploadFile = File(..., description="예측할 feature 행렬 (.npy / .csv / .parquet / .arrow)"),
+    model: str = Form(...),
+    version: Optional[int] = Form(None),
+    proba: bool = Form(False),
+    format: Optional[str] = Form(None),
+    header: bool = Form(True),
+):
+    """대용량 배치 예측: feature 파일을 numpy로 직접 읽어 예측."""
+    fmt = detect_format(file.filename, format)
+    with tempfile.TemporaryDirectory(dir=UPLOAD_SPOOL_DIR) as tmp:
+        path = os.path.join(tmp, "features." + fmt)
+        await spool_upload(file, path, AUTOML_MAX_UPLOAD_BYTES)
+        try:
+            X, _ = await asyncio.to_thread(load_table, path, fmt, header)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Could not read features: {e}")
+        return await asyncio.to_thread(predict, model, X, version, proba)
+
+
+@router.get("/models")
+def list_registered_models():
+    """등록된 모델 이름·버전 목록."""
+    return {"models": list_models()}
+
+
+@router.get("/models/{name}")
+def get_registered_model(name: str, version: Optional[int] = None):
+    """모델 메타데이터 (version 미지정 시 최신)."""
+    versions = list_versions(name)
+    if not versions:
+        raise HTTPException(status_code=404, detail=f"Model {name} not found")
+    return get_metadata(name, version if version is not None else versions[-1])
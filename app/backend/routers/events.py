@@ -0,0 +1,141 @@
+"""
+설비·품질 이벤트 구독 API (SSE / WebSocket).
+작업지시·품질·보전 쓰기 경로와 설비 상태 변경이 발행한 이벤트를 push하므로 상태 polling이 필요 없음.
+"""
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket
+from fastapi.responses import StreamingResponse
+
+from config import EVENTS_KEEPALIVE_SECONDS
+from db.neo4j import neo4j_read_async
+from db.queries import register_query
+from services.events import (
+    event_bus, equipment_topic, quality_topic, Subscriber, SubscriberLimitReached,
+)
+from services.serialization import dumps
+
+router = APIRouter(prefix="/manufacturing/events", tags=["events"])
+
+SNAPSHOT_QUERY = register_query("manufacturing.events.snapshot", """
+MATCH (e:Equipment)
+WHERE e.uri IN $equipment_ids
+RETURN e.uri AS equipmentId, e.status AS status
+""", equipment_ids=["ex:Equipment_1"])
+
+
+def _topics(equipment: Optional[List[str]], product: Optional[List[str]]) -> List[str]:
+    return [equipment_topic(e) for e in equipment or []] + [quality_topic(p) for p in product or []]
+
+
+async def _snapshot(equipment: Optional[List[str]]) -> List[dict]:
+    """구독 시작 시 현재 설비 상태 (연결당 1회 조회)."""
+    if not equipment:
+        return []
+    rows = await neo4j_read_async(SNAPSHOT_QUERY, equipment_ids=equipment)
+    return [
+        {"type": "status", "topic": equipment_topic(row["equipmentId"]), "snapshot": True, **dict(row)}
+        for row in rows
+    ]
+
+
+def _overflow(sub: Subscriber) -> Optional[dict]:
+    """느린 구독자에서 버려진 이벤트 수 알림 (보고 후 0으로)."""
+    if not sub.dropped:
+        return None
+    event = {"type": "overflow", "dropped": sub.dropped}
+    sub.dropped = 0
+    return event
+
+
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {dumps(event).decode()}\n\n"
+
+
+async def _send(websocket: WebSocket, message: dict) -> None:
+    await websocket.send_text(dumps(message).decode())
+
+
+@router.get("")
+async def subscribe_sse(
+    request: Request,
+    equipment: Optional[List[str]] = Query(None, description="구독할 설비 URI (반복 지정)"),
+    product: Optional[List[str]] = Query(None, description="품질 이벤트를 구독할 제품 URI (반복 지정)"),
+    snapshot: bool = Query(True, description="시작 시 구독 설비의 현재 상태 전송"),
+):
+    """
+    Server-Sent Events 구독. equipment·product를 모두 생략하면 전체 이벤트.
+    구독을 먼저 등록한 뒤 snapshot을 조회하므로 그 사이 발행된 상태 변경도 snapshot 뒤에 전달됨.
+    """
+    try:
+        sub = event_bus.subscribe(_topics(equipment, product))
+    except SubscriberLimitReached:
+        raise HTTPException(status_code=503, detail="Too many event subscribers", headers={"Retry-After": "30"})
+    try:
+        initial = await _snapshot(equipment) if snapshot else []
+    except BaseException:
+        event_bus.unsubscribe(sub)
+        raise
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            for event in initial:
+                yield _sse(event)
+            while not await request.is_disconnected():
+                events = await sub.get(EVENTS_KEEPALIVE_SECONDS)
+                overflow = _overflow(sub)
+                if overflow:
+                    yield _sse(overflow)
+                if not events:
+                    yield ": keepalive\n\n"
+                for event in events:
+                    yield _sse(event)
+        finally:
+            event_bus.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def subscribe_ws(
+    websocket: WebSocket,
+    equipment: Optional[List[str]] = Query(None),
+    product: Optional[List[str]] = Query(None),
+    snapshot: bool = Query(True),
+):
+    """WebSocket 구독. 메시지 형식: {"events": [...], "overflow": {...}|null}. 클라이언트 메시지는 무시."""
+    await websocket.accept()
+    try:
+        sub = event_bus.subscribe(_topics(equipment, product))
+    except SubscriberLimitReached:
+        await websocket.close(code=1013, reason="Too many event subscribers")
+        return
+    receiver = asyncio.ensure_future(websocket.receive())
+    getter = None
+    try:
+        initial = await _snapshot(equipment) if snapshot else []
+        if initial:
+            await _send(websocket, {"events": initial, "overflow": None})
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(sub.get())
+            done, _ = await asyncio.wait({receiver, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                if receiver.result()["type"] == "websocket.disconnect":
+                    break
+                receiver = asyncio.ensure_future(websocket.receive())
+            if getter in done:
+                events = getter.result()
+                getter = None
+                await _send(websocket, {"events": events, "overflow": _overflow(sub)})
+    finally:
+        for task in (receiver, getter):
+            if task is not None and not task.done():
+                task.cancel()
+        event_bus.unsubscribe(sub)
@@ -1,67 +1,151 @@
 """
-그래프 조회 API (Cytoscape 요소, 프로세스 플로우, 설비 계층).
+그래프 조회 API (Cytoscape 요소 페이지·이웃 확장, 프로세스 플로우, 설비 계층).
 """
+import asyncio
 import logging
 import traceback
-from fastapi import APIRouter, Query, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Query, HTTPException, Request
 
-from db.neo4j import neo4j_run
+from db.neo4j import neo4j_read_async
+from db.queries import register_query
+from services.cache import cached_response, rel_tag, label_tag, node_tag
+from services.serialization import table
+from config import PROCESS_FLOW_MAX_DEPTH
+from services.process_flow import FLOW_QUERY, compute_flow
+from services.equipment_index import equipment_index, EquipmentIndex
+from services.graph_elements import (
+    decode_cursor, encode_cursor, elements_query, expand_query,
+    elements_from_rows, expansion_from_row, render,
+)
 
 router = APIRouter(prefix="/graph", tags=["graph"])
 
+# 계층 전체 조회이므로 Equipment 라벨 스캔 허용
+EQUIPMENT_HIERARCHY_QUERY = register_query("graph.equipment_hierarchy", """
+MATCH (parent:Equipment)-[:hasPart]->(child:Equipment)
+RETURN parent.uri AS parentId,
+       parent.`rdfs__label` AS parentName,
+       child.uri AS childId,
+       child.`rdfs__label` AS childName
+""", allow=("NodeByLabelScan",))
+
 
 @router.get("/elements")
-def graph_elements(limit: int = Query(100, ge=1, le=1000)):
-    """Cytoscape.js용 노드/엣지 elements JSON."""
+async def graph_elements(
+    limit: int = Query(100, ge=1, le=1000, description="페이지당 노드 수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    edge_limit: int = Query(50, ge=0, le=1000, description="노드당 최대 나가는 관계 수"),
+    format: str = Query("cytoscape", description="cytoscape 또는 columnar"),
+):
+    """그래프 노드를 uri 순 페이지로 조회 (각 노드의 나가는 관계 포함). Cytoscape.js elements 또는 columnar."""
+    after = decode_cursor(cursor)
     try:
-        rows = neo4j_run("""
-        MATCH (n)-[r]->(m)
-        RETURN id(n) AS sid,
-               labels(n) AS sTypes,
-               coalesce(n.`rdfs__label`, n.name, head(labels(n))) AS sLabel,
-               type(r) AS rel,
-               id(m) AS tid,
-               labels(m) AS tTypes,
-               coalesce(m.`rdfs__label`, m.name, head(labels(m))) AS tLabel
-        LIMIT $limit
-        """, limit=limit)
-        if not rows:
-            return {"elements": []}
-        nodes = {}
-        edges = []
-        for row in rows:
-            sid, tid = f"n{row['sid']}", f"n{row['tid']}"
-            nodes[sid] = {"data": {"id": sid, "label": row["sLabel"] or "node", "types": row.get("sTypes", [])}}
-            nodes[tid] = {"data": {"id": tid, "label": row["tLabel"] or "node", "types": row.get("tTypes", [])}}
-            edges.append({"data": {"id": f"{sid}->{tid}:{row['rel']}", "source": sid, "target": tid, "label": row["rel"]}})
-        return {"elements": list(nodes.values()) + edges}
+        rows = await neo4j_read_async(
+            elements_query(after), after=after, fetch=limit + 1, edge_limit=edge_limit
+        )
+        next_cursor = encode_cursor(rows[limit - 1]["id"]) if len(rows) > limit else None
+        nodes, edges = elements_from_rows(rows[:limit])
+        return {**render(nodes, edges, format), "nextCursor": next_cursor}
     except HTTPException:
         raise
     except Exception as e:
         logging.error(f"Error in graph_elements: {e}\n{traceback.format_exc()}")
-        return {"elements": []}
+        return {**render({}, [], format), "nextCursor": None}
+
+
+@router.get("/expand/{node_id}")
+async def expand_node(
+    node_id: str,
+    direction: str = Query("both", description="out, in, both"),
+    rel_types: Optional[List[str]] = Query(None, description="관계 타입 필터 (반복 지정)"),
+    limit: int = Query(100, ge=1, le=1000, description="페이지당 관계 수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    format: str = Query("cytoscape", description="cytoscape 또는 columnar"),
+):
+    """노드 하나의 이웃을 관계 단위 페이지로 조회 (UI에서 클릭 시 점진적 확장용)."""
+    after = decode_cursor(cursor)
+    rows = await neo4j_read_async(
+        expand_query(direction, after),
+        node_id=node_id, rel_types=rel_types, after=after, fetch=limit + 1,
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Node not found")
+    row = dict(rows[0])
+    edges = row["edges"]
+    next_cursor = encode_cursor(edges[limit - 1]["id"]) if len(edges) > limit else None
+    row["edges"] = edges[:limit]
+    nodes, edges = expansion_from_row(row)
+    return {**render(nodes, edges, format), "nextCursor": next_cursor}
 
 
 @router.get("/process-flow/{process_id}")
-def get_process_flow(process_id: str):
-    """프로세스 플로우 조회."""
-    rows = neo4j_run("""
-    MATCH (p:Process {uri: $process_id})-[:precedes*]->(ops:Operation)
-    RETURN ops.uri AS operationId,
-           ops.`rdfs__label` AS operationName,
-           ops.precedes AS nextOperation
-    """, process_id=process_id)
-    return {"processFlow": [dict(row) for row in rows]}
+async def get_process_flow(
+    process_id: str,
+    request: Request,
+    depth: int = Query(PROCESS_FLOW_MAX_DEPTH, ge=1, le=PROCESS_FLOW_MAX_DEPTH, description="precedes 탐색 깊이"),
+):
+    """
+    프로세스 플로우 조회: 공정 위상 순서·단계, 분기·합류, 임계 경로.
+    계산 결과를 캐시하고 precedes 관계 변경 시 무효화. depth 안에서 끝나지 않으면 truncated=true.
+    """
+    async def load():
+        rows = await neo4j_read_async(FLOW_QUERY, process_id=process_id, max_depth=depth)
+        if not rows:
+            raise HTTPException(status_code=404, detail="Process not found")
+        row = rows[0]
+        flow = compute_flow(process_id, row["operations"], row["edges"])
+        return {"processId": process_id, "depth": depth, "truncated": row["truncated"], **flow}
+    return await cached_response(
+        request, f"process-flow:{process_id}:{depth}", [rel_tag("precedes"), node_tag(process_id)], load
+    )
 
 
 @router.get("/equipment-hierarchy")
-def get_equipment_hierarchy():
-    """설비 계층구조 조회."""
-    rows = neo4j_run("""
-    MATCH (parent:Equipment)-[:hasPart]->(child:Equipment)
-    RETURN parent.uri AS parentId,
-           parent.`rdfs__label` AS parentName,
-           child.uri AS childId,
-           child.`rdfs__label` AS childName
-    """)
-    return {"hierarchy": [dict(row) for row in rows]}
+async def get_equipment_hierarchy(
+    request: Request,
+    shape: str = Query("records", description="records 또는 columns"),
+):
+    """설비 계층구조 조회. (hasPart 관계·Equipment 노드 변경 시 캐시 무효화)"""
+    async def load():
+        rows = await neo4j_read_async(EQUIPMENT_HIERARCHY_QUERY)
+        return {"hierarchy": table(rows, shape)}
+    return await cached_response(
+        request, f"equipment-hierarchy:{shape}", [rel_tag("hasPart"), label_tag("Equipment")], load
+    )
+
+
+async def _equipment_index(equipment_id: Optional[str] = None) -> EquipmentIndex:
+    """로드된 설비 계층 인덱스 (stale이면 재로드). equipment_id가 인덱스에 없으면 404."""
+    if equipment_index.stale:
+        await asyncio.to_thread(equipment_index.ensure_loaded)
+    if equipment_id is not None and equipment_id not in equipment_index:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    return equipment_index
+
+
+@router.get("/equipment-hierarchy/tree")
+async def get_equipment_tree(depth: Optional[int] = Query(None, ge=0, description="루트로부터 최대 깊이")):
+    """설비 계층 중첩 트리 (부모가 없는 설비가 루트). in-memory 인덱스에서 응답."""
+    index = await _equipment_index()
+    return {"tree": index.tree(depth=depth)}
+
+
+@router.get("/equipment-hierarchy/{equipment_id}/subtree")
+async def get_equipment_subtree(
+    equipment_id: str,
+    depth: Optional[int] = Query(None, ge=0, description="최대 깊이 (생략 시 전체)"),
+    nested: bool = Query(False, description="true면 중첩 트리, 아니면 BFS 순 목록"),
+):
+    """설비 하위 트리. in-memory 인덱스에서 응답."""
+    index = await _equipment_index(equipment_id)
+    if nested:
+        return {"tree": index.tree(root=equipment_id, depth=depth)[0]}
+    return {"equipmentId": equipment_id, "subtree": index.subtree(equipment_id, depth)}
+
+
+@router.get("/equipment-hierarchy/{equipment_id}/ancestors")
+async def get_equipment_ancestors(equipment_id: str):
+    """설비의 상위 설비 (가까운 순). in-memory 인덱스에서 응답."""
+    index = await _equipment_index(equipment_id)
+    return {"equipmentId": equipment_id, "ancestors": index.ancestors(equipment_id)}
@@ -0,0 +1,30 @@
+"""
+헬스 체크 API (liveness / readiness).
+"""
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from db.neo4j import NEO4J_CONNECT_STATUS
+from db.ontology_loader import ONTOLOGY_LOAD_STATUS
+from services.startup import startup_profile
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def liveness():
+    """프로세스 생존 여부. DB 상태와 무관하게 즉시 응답."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness():
+    """온톨로지 백그라운드 로드 완료 여부. 완료 전·실패 시 503."""
+    ready = ONTOLOGY_LOAD_STATUS["state"] == "ready"
+    return JSONResponse(status_code=200 if ready else 503, content={"ontology": ONTOLOGY_LOAD_STATUS})
+
+
+@router.get("/startup")
+async def startup():
+    """기동 프로파일: 라우터별 import 시간, lifespan 단계, Neo4j 연결 확인 결과, 로드된 무거운 모듈."""
+    return {**startup_profile(), "neo4j": NEO4J_CONNECT_STATUS}
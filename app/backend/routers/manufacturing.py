@@ -1,137 +1,237 @@
 """
 제조 데이터 관리 API (라인, 작업지시, 품질, 설비).
 """
-from datetime import datetime
-from fastapi import APIRouter, HTTPException
-
-from db.neo4j import neo4j_run
-from models.schemas import WorkOrder, QualityControl
+from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from db.neo4j import neo4j_write, neo4j_read_async
+from db.queries import register_query
+from models.schemas import (
+    WorkOrder, WorkOrderUpdate, QualityControl, MaintenanceEvent, EquipmentStatusUpdate,
+)
+from services.cache import read_cache, cached_response, rel_tag, label_tag, node_tag
+from services.oee import CREATE_WORK_ORDER, UPDATE_WORK_ORDER
+from services.ingest import ingest_batch, ingest_ndjson, ingest_one
+from services.events import event_bus, equipment_topic
+from services.serialization import json_response, table
 
 router = APIRouter(prefix="/manufacturing", tags=["manufacturing"])
 
+LINES_QUERY = register_query("manufacturing.lines", """
+MATCH (e:Equipment)
+WHERE e.uri CONTAINS 'Equipment'
+RETURN e.uri AS id,
+       coalesce(e.`rdfs__label`, e.name, 'Unnamed Equipment') AS name,
+       labels(e) AS types
+""")
+
+LINE_QUERY = register_query("manufacturing.line", """
+MATCH (e:Equipment {uri: $line_id})
+OPTIONAL MATCH (e)-[r]->(related)
+RETURN e, r, related
+""", line_id="ex:Equipment_1")
+
+# 전체 목록 조회이므로 WorkOrder 라벨 스캔 허용
+WORK_ORDERS_QUERY = register_query("manufacturing.work_orders", """
+MATCH (w:WorkOrder)
+OPTIONAL MATCH (w)-[:executedBy]->(e:Equipment)
+RETURN w.uri AS id,
+       w.workOrderNumber AS workOrderNumber,
+       w.plannedQuantity AS plannedQuantity,
+       w.actualQuantity AS actualQuantity,
+       w.status AS status,
+       coalesce(e.`rdfs__label`, e.name) AS equipmentName
+""", allow=("NodeByLabelScan",))
+
+QUALITY_QUERY = register_query("manufacturing.quality", """
+MATCH (p:Product {uri: $product_id})-[:hasQuality]->(q:QualityControl)
+RETURN q.uri AS id, q.qualityResult AS qualityResult, q.timestamp AS timestamp
+""", product_id="ex:Product_1")
+
+EQUIPMENT_STATUS_QUERY = register_query("manufacturing.equipment.status", """
+MATCH (e:Equipment {uri: $equipment_id})
+OPTIONAL MATCH (e)-[:hasMaintenance]->(m:Maintenance)
+RETURN e.uri AS id, e.status AS status,
+       m.timestamp AS lastMaintenance,
+       m.maintenanceType AS maintenanceType
+ORDER BY m.timestamp DESC
+LIMIT 1
+""", equipment_id="ex:Equipment_1")
+
+SET_EQUIPMENT_STATUS_QUERY = register_query("manufacturing.equipment.status.update", """
+MATCH (e:Equipment {uri: $equipment_id})
+SET e.status = $status
+RETURN e.uri AS id, e.status AS status
+""", equipment_id="ex:Equipment_1", status="running")
+
+MAINTENANCE_HISTORY_QUERY = register_query("manufacturing.equipment.maintenance_history", """
+MATCH (e:Equipment {uri: $equipment_id})-[:hasMaintenance]->(m:Maintenance)
+RETURN m.uri AS id, m.maintenanceType AS maintenanceType, m.timestamp AS timestamp
+ORDER BY m.timestamp DESC
+""", equipment_id="ex:Equipment_1")
+
 
 @router.get("/lines")
-def get_manufacturing_lines():
-    """제조 라인 목록 조회."""
-    rows = neo4j_run("""
-    MATCH (e:Equipment)
-    WHERE e.uri CONTAINS 'Equipment'
-    RETURN e.uri AS id,
-           coalesce(e.`rdfs__label`, e.name, 'Unnamed Equipment') AS name,
-           labels(e) AS types
-    """)
-    return {"lines": [dict(row) for row in rows]}
+async def get_manufacturing_lines(
+    request: Request,
+    shape: str = Query("records", description="records 또는 columns"),
+):
+    """제조 라인 목록 조회. (Equipment 노드 변경 시 캐시 무효화)"""
+    async def load():
+        rows = await neo4j_read_async(LINES_QUERY)
+        return {"lines": table(rows, shape)}
+    return await cached_response(request, f"lines:{shape}", [label_tag("Equipment")], load)
 
 
 @router.get("/lines/{line_id}")
-def get_manufacturing_line(line_id: str):
+async def get_manufacturing_line(line_id: str):
     """특정 제조 라인 상세 조회."""
-    rows = neo4j_run("""
-    MATCH (e:Equipment {uri: $line_id})
-    OPTIONAL MATCH (e)-[r]->(related)
-    RETURN e, r, related
-    """, line_id=line_id)
+    rows = await neo4j_read_async(LINE_QUERY, line_id=line_id)
     if not rows:
         raise HTTPException(status_code=404, detail="Line not found")
-    return {"line": dict(rows[0])}
+    return json_response({"line": rows[0]})
 
 
 @router.get("/work-orders")
-def get_work_orders():
+async def get_work_orders(shape: str = Query("records", description="records 또는 columns")):
     """작업지시서 목록 조회."""
-    rows = neo4j_run("""
-    MATCH (w:WorkOrder)
-    OPTIONAL MATCH (w)-[:executedBy]->(e:Equipment)
-    RETURN w.uri AS id,
-           w.workOrderNumber AS workOrderNumber,
-           w.plannedQuantity AS plannedQuantity,
-           w.actualQuantity AS actualQuantity,
-           w.status AS status,
-           coalesce(e.`rdfs__label`, e.name) AS equipmentName
-    """)
-    return {"workOrders": [dict(row) for row in rows]}
+    rows = await neo4j_read_async(WORK_ORDERS_QUERY)
+    return json_response({"workOrders": table(rows, shape)})
 
 
 @router.post("/work-orders")
 def create_work_order(work_order: WorkOrder):
-    """작업지시서 생성."""
+    """작업지시서 생성. 설비 연결과 설비 OEE 카운터 갱신을 같은 쿼리에서 수행."""
     work_order_id = f"ex:WO_{work_order.workOrderNumber}"
-    neo4j_run("""
-    CREATE (w:WorkOrder {
-        uri: $id,
-        workOrderNumber: $workOrderNumber,
-        plannedQuantity: $plannedQuantity,
-        actualQuantity: $actualQuantity,
-        status: $status
-    })
-    """,
-    id=work_order_id,
-    workOrderNumber=work_order.workOrderNumber,
-    plannedQuantity=work_order.plannedQuantity,
-    actualQuantity=work_order.actualQuantity,
-    status=work_order.status)
-    if work_order.equipment_id:
-        neo4j_run("""
-        MATCH (w:WorkOrder {uri: $workOrderId})
-        MATCH (e:Equipment {uri: $equipmentId})
-        CREATE (w)-[:executedBy]->(e)
-        """, workOrderId=work_order_id, equipmentId=work_order.equipment_id)
+    rows = neo4j_write(
+        CREATE_WORK_ORDER,
+        id=work_order_id,
+        workOrderNumber=work_order.workOrderNumber,
+        plannedQuantity=work_order.plannedQuantity,
+        actualQuantity=work_order.actualQuantity,
+        status=work_order.status,
+        equipmentId=work_order.equipment_id,
+    )
+    read_cache.invalidate(label_tag("WorkOrder"), rel_tag("executedBy", work_order_id))
+    if rows and rows[0]["linked"]:
+        event_bus.publish(
+            equipment_topic(work_order.equipment_id), "workOrder",
+            equipmentId=work_order.equipment_id, workOrderId=work_order_id, status=work_order.status,
+            plannedQuantity=work_order.plannedQuantity, actualQuantity=work_order.actualQuantity,
+        )
     return {"id": work_order_id, "message": "Work order created successfully"}
 
 
+@router.post("/work-orders/batch")
+async def ingest_work_orders_batch(work_orders: List[WorkOrder]):
+    """작업지시 일괄 수집 (JSON 배열). 작업지시 번호가 같으면 중복으로 보고 건너뜀."""
+    return await ingest_batch("work-orders", work_orders)
+
+
+@router.post("/work-orders/stream")
+async def ingest_work_orders_stream(request: Request):
+    """작업지시 스트리밍 수집 (NDJSON 본문)."""
+    return await ingest_ndjson("work-orders", request.stream())
+
+
+@router.patch("/work-orders/{work_order_id}")
+def update_work_order(work_order_id: str, update: WorkOrderUpdate):
+    """작업지시 상태·실적 수량 변경. 설비 OEE 카운터는 이전 값을 빼고 새 값을 더해 갱신."""
+    rows = neo4j_write(
+        UPDATE_WORK_ORDER,
+        id=work_order_id,
+        status=update.status,
+        actualQuantity=update.actualQuantity,
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Work order not found")
+    read_cache.invalidate(label_tag("WorkOrder"))
+    work_order = dict(rows[0])
+    if work_order["equipmentId"]:
+        event_bus.publish(
+            equipment_topic(work_order["equipmentId"]), "workOrder",
+            equipmentId=work_order["equipmentId"], workOrderId=work_order["id"],
+            status=work_order["status"], actualQuantity=work_order["actualQuantity"],
+        )
+    return {"workOrder": work_order, "message": "Work order updated successfully"}
+
+
 @router.get("/quality/{product_id}")
-def get_quality_data(product_id: str):
-    """제품 품질 데이터 조회."""
-    rows = neo4j_run("""
-    MATCH (p:Product {uri: $product_id})-[:hasQuality]->(q:QualityControl)
-    RETURN q.uri AS id, q.qualityResult AS qualityResult, q.timestamp AS timestamp
-    """, product_id=product_id)
-    return {"qualityData": [dict(row) for row in rows]}
+async def get_quality_data(
+    product_id: str,
+    shape: str = Query("records", description="records 또는 columns"),
+):
+    """제품 품질 데이터 조회. timestamp는 ISO 8601 문자열."""
+    rows = await neo4j_read_async(QUALITY_QUERY, product_id=product_id)
+    return json_response({"qualityData": table(rows, shape)})
 
 
 @router.post("/quality")
 def create_quality_data(quality: QualityControl):
-    """품질 데이터 생성."""
-    quality_id = f"ex:QC_{quality.product_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    neo4j_run("""
-    MATCH (p:Product {uri: $productId})
-    CREATE (q:QualityControl {
-        uri: $qualityId,
-        qualityResult: $qualityResult,
-        timestamp: $timestamp
-    })
-    CREATE (p)-[:hasQuality]->(q)
-    """,
-    productId=quality.product_id,
-    qualityId=quality_id,
-    qualityResult=quality.qualityResult,
-    timestamp=quality.timestamp)
+    """품질 데이터 생성. 시간 버킷 롤업(hour/day/week) 카운트도 같은 쿼리에서 증가. idempotency_key 재전송은 중복 생성 안 함."""
+    quality_id = ingest_one("quality", quality)
+    if quality_id is None:
+        raise HTTPException(status_code=404, detail="Product not found")
     return {"id": quality_id, "message": "Quality data created successfully"}
 
 
+@router.post("/quality/batch")
+async def ingest_quality_batch(readings: List[QualityControl]):
+    """품질 측정값 일괄 수집 (JSON 배열)."""
+    return await ingest_batch("quality", readings)
+
+
+@router.post("/quality/stream")
+async def ingest_quality_stream(request: Request):
+    """품질 측정값 스트리밍 수집 (NDJSON 본문, 한 줄에 한 건)."""
+    return await ingest_ndjson("quality", request.stream())
+
+
+@router.post("/maintenance/batch")
+async def ingest_maintenance_batch(events: List[MaintenanceEvent]):
+    """보전 이벤트 일괄 수집 (JSON 배열)."""
+    return await ingest_batch("maintenance", events)
+
+
+@router.post("/maintenance/stream")
+async def ingest_maintenance_stream(request: Request):
+    """보전 이벤트 스트리밍 수집 (NDJSON 본문)."""
+    return await ingest_ndjson("maintenance", request.stream())
+
+
 @router.get("/equipment/{equipment_id}/status")
-def get_equipment_status(equipment_id: str):
+async def get_equipment_status(equipment_id: str):
     """설비 상태 조회."""
-    rows = neo4j_run("""
-    MATCH (e:Equipment {uri: $equipment_id})
-    OPTIONAL MATCH (e)-[:hasMaintenance]->(m:Maintenance)
-    RETURN e.uri AS id, e.status AS status,
-           m.timestamp AS lastMaintenance,
-           m.maintenanceType AS maintenanceType
-    ORDER BY m.timestamp DESC
-    LIMIT 1
-    """, equipment_id=equipment_id)
+    rows = await neo4j_read_async(EQUIPMENT_STATUS_QUERY, equipment_id=equipment_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    return json_response({"equipment": rows[0]})
+
+
+@router.put("/equipment/{equipment_id}/status")
+def set_equipment_status(equipment_id: str, update: EquipmentStatusUpdate):
+    """설비 상태 변경. /manufacturing/events 구독자에게 status 이벤트 발행."""
+    rows = neo4j_write(SET_EQUIPMENT_STATUS_QUERY, equipment_id=equipment_id, status=update.status)
     if not rows:
         raise HTTPException(status_code=404, detail="Equipment not found")
-    return {"equipment": dict(rows[0])}
+    read_cache.invalidate(node_tag(equipment_id))
+    event_bus.publish(equipment_topic(equipment_id), "status", equipmentId=equipment_id, status=update.status)
+    return {"equipment": dict(rows[0]), "message": "Equipment status updated successfully"}
 
 
 @router.get("/equipment/{equipment_id}/maintenance-history")
-def get_maintenance_history(equipment_id: str):
-    """설비 유지보수 이력 조회."""
-    rows = neo4j_run("""
-    MATCH (e:Equipment {uri: $equipment_id})-[:hasMaintenance]->(m:Maintenance)
-    RETURN m.uri AS id, m.maintenanceType AS maintenanceType, m.timestamp AS timestamp
-    ORDER BY m.timestamp DESC
-    """, equipment_id=equipment_id)
-    return {"maintenanceHistory": [dict(row) for row in rows]}
+async def get_maintenance_history(
+    equipment_id: str,
+    request: Request,
+    shape: str = Query("records", description="records 또는 columns"),
+):
+    """설비 유지보수 이력 조회. (해당 설비의 hasMaintenance 변경 시 캐시 무효화)"""
+    async def load():
+        rows = await neo4j_read_async(MAINTENANCE_HISTORY_QUERY, equipment_id=equipment_id)
+        return {"maintenanceHistory": table(rows, shape)}
+    return await cached_response(
+        request,
+        f"maintenance-history:{equipment_id}:{shape}",
+        [rel_tag("hasMaintenance", equipment_id), node_tag(equipment_id)],
+        load,
+    )
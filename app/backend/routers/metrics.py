@@ -0,0 +1,21 @@
+"""
+운영 메트릭 API (Prometheus 스크레이프, 느린 쿼리 로그).
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from db.metrics import SLOW_QUERIES, render_prometheus
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", response_class=PlainTextResponse)
+async def metrics():
+    """쿼리 템플릿별 지연 히스토그램·행 수·오류 수·풀 대기 (Prometheus 텍스트 형식)."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get("/slow-queries")
+async def slow_queries():
+    """최근 느린 쿼리 (최신순). PROFILE 샘플은 dbHits 포함."""
+    return {"slowQueries": list(reversed(SLOW_QUERIES))}
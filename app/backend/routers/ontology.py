@@ -1,38 +1,83 @@
 """
 온톨로지 검증·임포트 및 Triple CRUD API.
 """
+import asyncio
+import os
+import tempfile
 from typing import Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from rdflib import Graph
-from pyshacl import validate
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from db.neo4j import neo4j_run
+from config import (
+    TRIPLES_PAGE_SIZE, TRIPLES_MAX_PAGE_SIZE, TRIPLE_INDEX_ENABLED,
+    UPLOAD_SPOOL_DIR, SHACL_MAX_UPLOAD_BYTES, ONTOLOGY_INLINE_MAX_BYTES,
+)
+from db.neo4j import neo4j_write, neo4j_read_async, neo4j_stream_async
+from db.queries import register_query
+from db.ontology_loader import import_turtle_file, import_ntriples_file
 from models.schemas import ImportResult, Triple, BulkTripleOperation
+from services.cache import read_cache, invalidate_triples, invalidate_node
+from services.equipment_index import equipment_index, HIERARCHY_PREDICATE
+from services.serialization import dumps, json_response, table, tuple_table
+from services.shacl import validate_files
+from services.triples import apply_bulk_operation, encode_cursor, decode_cursor
+from services.triple_index import triple_index, cursor_row
+from services.triple_query import (
+    TripleFilter, graph_stats, choose_start, triples_query, estimate_total, SUBJECT, OBJECT,
+)
+from services.uploads import spool_upload
 
 router = APIRouter(prefix="/ontology", tags=["ontology"])
 
+CREATE_TRIPLE_QUERY = register_query("ontology.triples.create", """
+MATCH (s:Resource {uri: $subject})
+MATCH (o:Resource {uri: $object})
+CALL apoc.create.relationship(s, $predicate, {}, o) YIELD rel
+RETURN rel
+""", subject="ex:Equipment_1", predicate="hasPart", object="ex:Equipment_2")
+
+DELETE_TRIPLE_QUERY = register_query("ontology.triples.delete", """
+MATCH (s:Resource {uri: $subject})-[r]->(o:Resource {uri: $object})
+WHERE type(r) = $predicate
+DELETE r
+RETURN count(r) AS deleted
+""", subject="ex:Equipment_1", predicate="hasPart", object="ex:Equipment_2")
+
+DELETE_NODE_QUERY = register_query("ontology.nodes.delete", """
+MATCH (n:Resource {uri: $node_id})
+WITH n, labels(n) AS labels,
+     [(x)-[r]->(n) | [type(r), x.uri]] + [(n)-[r]->() | [type(r), n.uri]] AS rels
+DETACH DELETE n
+RETURN count(n) AS deleted, labels, rels
+""", node_id="ex:Equipment_1")
 
 @router.post("/validate-and-import", response_model=ImportResult)
 async def validate_and_import(
     data_ttl: UploadFile = File(...),
     shapes_ttl: UploadFile = File(...),
 ):
-    """SHACL 검증 후 Neo4j n10s로 임포트."""
-    data_bytes = await data_ttl.read()
-    shapes_bytes = await shapes_ttl.read()
-    data_g = Graph().parse(data=data_bytes.decode("utf-8"), format="turtle")
-    shapes_g = Graph().parse(data=shapes_bytes.decode("utf-8"), format="turtle")
-    conforms, report_graph, report_text = validate(
-        data_g, shacl_graph=shapes_g, inference="rdfs", serialize_report_graph=True
-    )
-    if not conforms:
-        return ImportResult(triplesLoaded=0, validationConforms=False, report=report_text)
-    res = neo4j_run("""
-    CALL n10s.rdf.import.inline($ttl, "Turtle")
-    YIELD terminationStatus, triplesLoaded
-    RETURN terminationStatus AS status, triplesLoaded AS count
-    """, ttl=data_bytes.decode("utf-8"))
-    count = res[0]["count"] if res else 0
+    """
+    SHACL 검증 후 Neo4j n10s로 임포트.
+    업로드는 디스크로 스풀링하고, 검증은 프로세스 풀에서 크기·시간 제한 하에 실행.
+    큰 파일은 워커가 만든 N-Triples를 청크 단위로 임포트.
+    """
+    with tempfile.TemporaryDirectory(dir=UPLOAD_SPOOL_DIR) as tmp:
+        data_path = os.path.join(tmp, "data.ttl")
+        shapes_path = os.path.join(tmp, "shapes.ttl")
+        data_size = await spool_upload(data_ttl, data_path, SHACL_MAX_UPLOAD_BYTES)
+        await spool_upload(shapes_ttl, shapes_path, SHACL_MAX_UPLOAD_BYTES)
+        nt_path = os.path.join(tmp, "data.nt") if data_size > ONTOLOGY_INLINE_MAX_BYTES else None
+        conforms, report_text = await validate_files(data_path, shapes_path, nt_path)
+        if not conforms:
+            return ImportResult(triplesLoaded=0, validationConforms=False, report=report_text)
+        if nt_path:
+            count = await asyncio.to_thread(import_ntriples_file, nt_path)
+        else:
+            count = await asyncio.to_thread(import_turtle_file, data_path)
+    # 임포트 내용은 임의이므로 캐시 전체 무효화
+    read_cache.clear()
+    equipment_index.mark_stale()
+    triple_index.mark_stale()
     return ImportResult(triplesLoaded=count, validationConforms=True)
 
 
@@ -40,57 +85,116 @@ async def validate_and_import(
 def create_triple(triple: Triple):
     """관계(Triple) 추가."""
     try:
-        neo4j_run("""
-        MATCH (s:Resource {uri: $subject})
-        MATCH (o:Resource {uri: $object})
-        CALL apoc.create.relationship(s, $predicate, {}, o) YIELD rel
-        RETURN rel
-        """, subject=triple.subject, predicate=triple.predicate, object=triple.object)
-        return {"message": "Triple created successfully"}
+        result = neo4j_write(CREATE_TRIPLE_QUERY, subject=triple.subject, predicate=triple.predicate, object=triple.object)
+        if result:
+            invalidate_triples([triple])
+            equipment_index.apply_triples(added=[triple])
+            triple_index.apply_triples(added=[triple])
+            return {"message": "Triple created successfully"}
+        raise HTTPException(status_code=404, detail="Subject or object not found")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/triples")
-def get_triples(
+async def get_triples(
     subject: Optional[str] = None,
     predicate: Optional[str] = None,
     object: Optional[str] = None,
+    subject_prefix: Optional[str] = Query(None, description="subject uri 접두사 (네임스페이스) 필터"),
+    object_prefix: Optional[str] = Query(None, description="object uri 접두사 (네임스페이스) 필터"),
+    limit: Optional[int] = Query(None, ge=1, le=TRIPLES_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    shape: str = Query("records", description="records 또는 columns (stream=true면 무시)"),
 ):
-    """관계 조회."""
-    where_clauses = []
-    params = {}
-    if subject:
-        where_clauses.append("s.uri = $subject")
-        params["subject"] = subject
-    if predicate:
-        where_clauses.append("type(r) = $predicate")
-        params["predicate"] = predicate
-    if object:
-        where_clauses.append("o.uri = $object")
-        params["object"] = object
-    where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-    rows = neo4j_run(f"""
-    MATCH (s)-[r]->(o)
-    WHERE {where_clause}
-    RETURN s.uri AS subject, type(r) AS predicate, o.uri AS object,
-           coalesce(s.`rdfs__label`, s.name) AS subject_label,
-           coalesce(o.`rdfs__label`, o.name) AS object_label
-    """, **params)
-    return {"triples": [dict(row) for row in rows]}
+    """
+    관계 조회. (subject, predicate, object) 순 keyset pagination.
+    응답의 nextCursor를 cursor로 넘기면 다음 페이지. plan은 선택된 시작 지점,
+    estimatedTotal은 count store·노드 degree 기반 추정 건수 (prefix 필터·cursor 미반영 상한).
+    TRIPLE_INDEX_ENABLED이고 predicate가 미러 대상이면 in-process 인덱스에서 응답 (plan=memoryIndex, 정확한 건수).
+    stream=true면 NDJSON으로 레코드를 lazy하게 스트리밍 (limit 미지정 시 전체).
+    """
+    f = TripleFilter(subject, predicate, object, subject_prefix, object_prefix)
+    params = f.params()
+    if cursor:
+        params.update(decode_cursor(cursor))
+    if not stream:
+        limit = limit or TRIPLES_PAGE_SIZE
+    if TRIPLE_INDEX_ENABLED and triple_index.covers(predicate):
+        response = await _triples_from_index(f, params if cursor else None, limit, stream, shape)
+        if response is not None:
+            return response
+    # 전체 스트리밍(limit·cursor 없음)은 정렬 없이 바로 흘려보냄
+    ordered = bool(limit or cursor)
+    stats = await graph_stats()
+    start = choose_start(f, limit, ordered, stats)
+    with_estimate = not stream and start in (SUBJECT, OBJECT)
+    cypher = triples_query(f, start, bool(cursor), ordered, bool(limit), with_estimate)
+    if limit:
+        # 다음 페이지 존재 여부 판단용으로 1건 더 조회
+        params["limit"] = limit if stream else limit + 1
+    if stream:
+        async def ndjson():
+            async for row in neo4j_stream_async(cypher, **params):
+                triple = dict(row)
+                triple.pop("rid")
+                yield dumps(triple) + b"\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    rows = await neo4j_read_async(cypher, **params)
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    estimate = (rows[0]["estimate"] if rows else 0) if with_estimate else estimate_total(f, start, stats)
+    return json_response({
+        "triples": table(rows[:limit], shape, exclude=("rid", "estimate")),
+        "nextCursor": next_cursor,
+        "plan": start,
+        "estimatedTotal": estimate,
+    })
+
+
+async def _triples_from_index(f: TripleFilter, after: Optional[dict], limit: Optional[int], stream: bool, shape: str):
+    """in-process 미러에서 응답. 로드 실패 시 None → Neo4j 플래너 사용."""
+    if triple_index.stale:
+        try:
+            await asyncio.to_thread(triple_index.ensure_loaded)
+        except Exception as e:
+            print(f"Warning: triple index load failed, falling back to Neo4j: {e}")
+            return None
+    rows, total = triple_index.match(
+        f.subject, f.predicate, f.object, f.subject_prefix, f.object_prefix,
+        after=after, limit=limit if stream or limit is None else limit + 1,
+    )
+    if stream:
+        async def ndjson():
+            for row in rows:
+                yield dumps(dict(zip(triple_index.COLUMNS, row))) + b"\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    return json_response({
+        "triples": tuple_table(triple_index.COLUMNS, rows[:limit], shape),
+        "nextCursor": encode_cursor(cursor_row(rows[limit - 1])) if len(rows) > limit else None,
+        "plan": "memoryIndex",
+        "estimatedTotal": total,
+    })
+
+
+@router.get("/triples/index")
+def get_triple_index():
+    """in-process Triple 미러 상태 (Triple·term 수, 메모리 사용량)."""
+    return {"enabled": TRIPLE_INDEX_ENABLED, **triple_index.stats()}
 
 
 @router.delete("/triples")
 def delete_triple(triple: Triple):
     """관계 삭제."""
     try:
-        result = neo4j_run("""
-        MATCH (s:Resource {uri: $subject})-[r]->(o:Resource {uri: $object})
-        WHERE type(r) = $predicate
-        DELETE r
-        RETURN count(r) AS deleted
-        """, subject=triple.subject, predicate=triple.predicate, object=triple.object)
+        result = neo4j_write(DELETE_TRIPLE_QUERY, subject=triple.subject, predicate=triple.predicate, object=triple.object)
         if result and result[0]["deleted"] > 0:
+            invalidate_triples([triple])
+            equipment_index.apply_triples(deleted=[triple])
+            triple_index.apply_triples(deleted=[triple])
             return {"message": "Triple deleted successfully"}
         raise HTTPException(status_code=404, detail="Triple not found")
     except HTTPException:
@@ -103,12 +207,11 @@ def delete_triple(triple: Triple):
 def delete_node(node_id: str):
     """노드 삭제 (관련 관계 모두 삭제)."""
     try:
-        result = neo4j_run("""
-        MATCH (n:Resource {uri: $node_id})
-        DETACH DELETE n
-        RETURN count(n) AS deleted
-        """, node_id=node_id)
+        result = neo4j_write(DELETE_NODE_QUERY, node_id=node_id)
         if result and result[0]["deleted"] > 0:
+            invalidate_node(node_id, result[0]["labels"], result[0]["rels"])
+            equipment_index.remove_node(node_id)
+            triple_index.remove_node(node_id)
             return {"message": "Node and all related relationships deleted successfully"}
         raise HTTPException(status_code=404, detail="Node not found")
     except HTTPException:
@@ -119,27 +222,13 @@ def delete_node(node_id: str):
 
 @router.post("/triples/bulk")
 def bulk_triple_operation(operation: BulkTripleOperation):
-    """Triple 벌크 추가/삭제."""
-    results = {"added": 0, "deleted": 0, "errors": []}
-    for triple in operation.add:
-        try:
-            neo4j_run("""
-            MATCH (s:Resource {uri: $subject})
-            MATCH (o:Resource {uri: $object})
-            CALL apoc.create.relationship(s, $predicate, {}, o) YIELD rel
-            RETURN rel
-            """, subject=triple.subject, predicate=triple.predicate, object=triple.object)
-            results["added"] += 1
-        except Exception as e:
-            results["errors"].append(f"Add error: {str(e)}")
-    for triple in operation.delete:
-        try:
-            neo4j_run("""
-            MATCH (s:Resource {uri: $subject})-[r]->(o:Resource {uri: $object})
-            WHERE type(r) = $predicate
-            DELETE r
-            """, subject=triple.subject, predicate=triple.predicate, object=triple.object)
-            results["deleted"] += 1
-        except Exception as e:
-            results["errors"].append(f"Delete error: {str(e)}")
+    """Triple 벌크 추가/삭제. predicate별 UNWIND 배치, atomic=true면 전부 또는 전무."""
+    results = apply_bulk_operation(operation)
+    if results["committed"]:
+        invalidate_triples(operation.add + operation.delete)
+        # 항목별 성공 여부가 섞일 수 있으므로 hasPart가 포함되면 다음 조회 때 재로드
+        if any(t.predicate == HIERARCHY_PREDICATE for t in operation.add + operation.delete):
+            equipment_index.mark_stale()
+        if any(triple_index.covers(t.predicate) for t in operation.add + operation.delete):
+            triple_index.mark_stale()
     return results
@@ -2,9 +2,17 @@
 scikit-learn 기반 간단 AutoML: 여러 모델을 비교해 최적 모델·점수 반환.
 산업데이터에 적합한 모델 도출용 (분류/회귀).
 """
-from typing import Any, List, Optional, Literal
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, List, Optional, Literal
 import numpy as np
-from sklearn.model_selection import cross_val_score
+from joblib.externals.loky import ProcessPoolExecutor
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import check_cv
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.linear_model import LogisticRegression, Ridge
@@ -12,6 +20,11 @@ from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, Grad
 from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
 from sklearn.svm import SVC, SVR
 
+from config import (
+    AUTOML_N_JOBS, AUTOML_TIME_BUDGET_SECONDS,
+    AUTOML_PARALLEL_MIN_SAMPLES, AUTOML_MEMMAP_MIN_BYTES,
+)
+
 # 분류용 후보 (5개)
 CLASSIFIERS = [
     ("LogisticRegression", LogisticRegression(max_iter=1000)),
@@ -40,6 +53,14 @@ DEFAULT_PREPROCESSING = ["StandardScaler", "이상치 IQR 클리핑"]
 DEFAULT_VISUALIZATION = ["산점도", "상관관계 히트맵"]
 
 
+# 병렬 실행 중 취소 여부 확인 주기(초)
+CANCEL_POLL_SECONDS = 0.5
+
+
+class AutoMLCancelled(Exception):
+    """cancel_event로 중단된 경우."""
+
+
 def _get_pipeline(name: str, estimator: Any) -> Pipeline:
     """스케일링 + 추정기 파이프라인."""
     return Pipeline([
@@ -48,6 +69,15 @@ def _get_pipeline(name: str, estimator: Any) -> Pipeline:
     ])
 
 
+def build_pipeline(task: str, name: str) -> Pipeline:
+    """후보 이름으로 학습 전(unfitted) 파이프라인 생성."""
+    candidates = CLASSIFIERS if task == "classification" else REGRESSORS
+    for candidate_name, est in candidates:
+        if candidate_name == name:
+            return _get_pipeline(name, clone(est))
+    raise ValueError(f"Unknown {task} model: {name}")
+
+
 def _recommend_preprocessing_and_visualization(
     X: np.ndarray, y: np.ndarray, task: str
 ) -> tuple[List[str], List[str]]:
@@ -100,16 +130,113 @@ def _recommend_preprocessing_and_visualization(
     return preprocessing, visualization
 
 
+def _load_array(ref):
+    """워커에서 배열 참조 복원. 경로 문자열이면 memmap으로 로드."""
+    if isinstance(ref, str):
+        return np.load(ref, mmap_mode="r")
+    return ref
+
+
+def _fit_fold(
+    name: str,
+    estimator: Any,
+    X_ref,
+    y_ref,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    scoring: str,
+) -> dict:
+    """후보 하나의 fold 하나 학습·평가 (워커 프로세스에서 실행)."""
+    X, y = _load_array(X_ref), _load_array(y_ref)
+    pipe = _get_pipeline(name, clone(estimator))
+    start = time.perf_counter()
+    pipe.fit(X[train_idx], y[train_idx])
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    score = get_scorer(scoring)(pipe, X[test_idx], y[test_idx])
+    score_time = time.perf_counter() - start
+    return {"score": float(score), "fit_time": fit_time, "score_time": score_time}
+
+
+def _resolve_n_jobs(n_jobs: int) -> int:
+    return max(1, os.cpu_count() or 1) if n_jobs <= 0 else n_jobs
+
+
+def _check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise AutoMLCancelled()
+
+
+def _run_sequential(tasks, X, y, scoring, deadline, cancel_event):
+    """
+    in-process 순차 실행. deadline·취소는 각 task 시작 전에만 확인하므로
+    실행 중인 fit 하나는 중단하지 못함 (소규모 데이터 전용이라 fit 1회는 짧음).
+    """
+    for key, args in tasks:
+        _check_cancelled(cancel_event)
+        if time.monotonic() >= deadline:
+            return
+        try:
+            yield key, _fit_fold(*args[:2], X, y, *args[2:], scoring), None
+        except Exception as e:
+            yield key, None, e
+
+
+def _run_parallel(tasks, X, y, scoring, deadline, n_jobs, cancel_event):
+    """
+    loky 프로세스 풀에서 (후보 × fold) 단위 병렬 실행.
+    큰 배열은 임시 .npy로 한 번만 저장해 워커가 memmap으로 공유.
+    deadline 도달·취소 시 남은 작업을 취소하고 워커를 종료.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        X_ref, y_ref = X, y
+        if X.nbytes >= AUTOML_MEMMAP_MIN_BYTES:
+            X_ref, y_ref = os.path.join(tmp, "X.npy"), os.path.join(tmp, "y.npy")
+            np.save(X_ref, X)
+            np.save(y_ref, y)
+        executor = ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks)))
+        try:
+            futures = {
+                executor.submit(_fit_fold, *args[:2], X_ref, y_ref, *args[2:], scoring): key
+                for key, args in tasks
+            }
+            pending = set(futures)
+            while pending:
+                _check_cancelled(cancel_event)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(
+                    pending, timeout=min(remaining, CANCEL_POLL_SECONDS), return_when=FIRST_COMPLETED
+                )
+                for f in done:
+                    try:
+                        yield futures[f], f.result(), None
+                    except Exception as e:
+                        yield futures[f], None, e
+        finally:
+            executor.shutdown(wait=False, kill_workers=True)
+
+
 def select_best_model(
     X: np.ndarray,
     y: np.ndarray,
     task: Literal["classification", "regression"] = "classification",
     cv: int = 3,
     scoring: Optional[str] = None,
+    n_jobs: int = AUTOML_N_JOBS,
+    time_budget: Optional[float] = AUTOML_TIME_BUDGET_SECONDS,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
 ) -> dict:
     """
     여러 모델을 교차검증으로 비교해 최적 모델 이름·평균 점수 반환.
     X, y: numpy array (2D, 1D). task가 classification이면 scoring 기본 accuracy, regression이면 r2.
+    후보 × fold를 n_jobs개 프로세스로 병렬 실행하며, time_budget(초)을 넘기면
+    끝나지 않은 후보는 제외하고 그때까지의 최적 결과를 반환.
+    단, 순차 경로(n_jobs == 1 또는 AUTOML_PARALLEL_MIN_SAMPLES 미만)는 fit 사이에서만
+    budget을 확인하므로 마지막 fit 1회만큼 초과할 수 있음.
+    progress(완료 task 수, 전체 task 수) 콜백, cancel_event가 set되면 AutoMLCancelled.
     """
     if task == "classification":
         candidates = CLASSIFIERS
@@ -118,20 +245,58 @@ def select_best_model(
         candidates = REGRESSORS
         scoring = scoring or "r2"
 
+    started = time.monotonic()
+    deadline = started + time_budget if time_budget else float("inf")
+    splits = list(check_cv(cv, y, classifier=(task == "classification")).split(X, y))
+    tasks = [
+        ((name, fold), (name, est, train_idx, test_idx))
+        for name, est in candidates
+        for fold, (train_idx, test_idx) in enumerate(splits)
+    ]
+
+    n_jobs = _resolve_n_jobs(n_jobs)
+    if n_jobs == 1 or len(X) < AUTOML_PARALLEL_MIN_SAMPLES:
+        outcomes = _run_sequential(tasks, X, y, scoring, deadline, cancel_event)
+    else:
+        outcomes = _run_parallel(tasks, X, y, scoring, deadline, n_jobs, cancel_event)
+
+    folds: dict = {name: {} for name, _ in candidates}
+    errors: dict = {}
+    for completed, ((name, fold), outcome, error) in enumerate(outcomes, start=1):
+        if progress is not None:
+            progress(completed, len(tasks))
+        if error is not None:
+            errors.setdefault(name, str(error))
+        else:
+            folds[name][fold] = outcome
+
     best_name, best_score = None, -np.inf
     results: List[dict] = []
-
-    for name, est in candidates:
-        pipe = _get_pipeline(name, est)
-        try:
-            scores = cross_val_score(pipe, X, y, cv=cv, scoring=scoring)
-            mean_score = float(np.mean(scores))
-            results.append({"model": name, "mean_score": mean_score, "cv_scores": scores.tolist()})
-            if mean_score > best_score:
-                best_score = mean_score
-                best_name = name
-        except Exception:
+    skipped: List[dict] = []
+    for name, _ in candidates:
+        if name in errors:
+            skipped.append({"model": name, "status": "error", "reason": errors[name]})
+            continue
+        if len(folds[name]) < len(splits):
+            skipped.append({
+                "model": name,
+                "status": "timeout",
+                "completed_folds": len(folds[name]),
+            })
             continue
+        fold_results = [folds[name][i] for i in range(len(splits))]
+        scores = [r["score"] for r in fold_results]
+        mean_score = float(np.mean(scores))
+        results.append({
+            "model": name,
+            "mean_score": mean_score,
+            "cv_scores": scores,
+            "fit_time": float(sum(r["fit_time"] for r in fold_results)),
+            "score_time": float(sum(r["score_time"] for r in fold_results)),
+        })
+        if mean_score > best_score:
+            best_score = mean_score
+            best_name = name
 
     # 업로드 데이터 특성 기반 전처리·시각화 추천 (프론트 UI용)
     preprocessing_methods, visualization_methods = _recommend_preprocessing_and_visualization(
@@ -144,6 +309,9 @@ def select_best_model(
         "task": task,
         "scoring": scoring,
         "all_results": results,
+        "skipped_models": skipped,
+        "timed_out": any(s["status"] == "timeout" for s in skipped),
+        "elapsed": time.monotonic() - started,
         "preprocessing_methods": preprocessing_methods,
         "visualization_methods": visualization_methods,
     }
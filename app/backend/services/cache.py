@@ -0,0 +1,153 @@
+"""
+참조 데이터 엔드포인트용 in-process read-through 캐시 (TTL + LRU).
+항목은 의존하는 데이터 태그(관계 타입·라벨·노드)를 가지며, 쓰기 경로가 해당 태그만 무효화.
+응답 본문(orjson으로 렌더링한 JSON bytes)과 ETag를 함께 저장해 If-None-Match 요청에는 304로 응답.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from fastapi import Request, Response
+
+from config import READ_CACHE_ENABLED, READ_CACHE_TTL_SECONDS, READ_CACHE_MAX_ENTRIES
+from services.serialization import dumps, json_response
+
+
+def rel_tag(predicate: str, subject: Optional[str] = None) -> str:
+    """관계 타입 태그. subject를 주면 해당 노드에서 나가는 관계로 범위 한정."""
+    return f"rel:{predicate}@{subject}" if subject else f"rel:{predicate}"
+
+
+def label_tag(label: str) -> str:
+    """노드 라벨 태그 (해당 라벨 노드 생성·삭제 시 무효화)."""
+    return f"label:{label}"
+
+
+def node_tag(uri: str) -> str:
+    """개별 노드 태그."""
+    return f"node:{uri}"
+
+
+class _Entry:
+    __slots__ = ("body", "etag", "expires_at", "tags")
+
+    def __init__(self, body: bytes, etag: str, expires_at: float, tags: Set[str]):
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+        self.tags = tags
+
+
+class ReadCache:
+    """스레드 안전 TTL + LRU 캐시. 태그 단위 무효화 지원."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        # 무효화마다 증가. 로드 도중 무효화가 있었다면 그 결과는 저장하지 않음 (stale 방지)
+        self.version = 0
+
+    def get(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, body: bytes, tags: Iterable[str], version: int) -> _Entry:
+        entry = _Entry(
+            body=body,
+            etag='"' + hashlib.sha1(body).hexdigest() + '"',
+            expires_at=time.monotonic() + self.ttl_seconds,
+            tags=set(tags),
+        )
+        with self._lock:
+            if version != self.version:
+                return entry
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            self.version += 1
+            for tag in tags:
+                for key in self._tag_index.pop(tag, set()):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._tag_index.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+read_cache = ReadCache(READ_CACHE_MAX_ENTRIES, READ_CACHE_TTL_SECONDS)
+
+
+async def cached_response(
+    request: Request,
+    key: str,
+    tags: Iterable[str],
+    loader: Callable[[], Awaitable[dict]],
+) -> Response:
+    """
+    read-through 조회. 캐시 미스 시 loader() 결과를 JSON으로 렌더링해 저장.
+    If-None-Match가 현재 ETag와 같으면 본문 없이 304 반환.
+    """
+    if not READ_CACHE_ENABLED:
+        return json_response(await loader())
+    entry = read_cache.get(key)
+    if entry is None:
+        version = read_cache.version
+        entry = read_cache.set(key, dumps(await loader()), tags, version)
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def invalidate_triples(triples: Iterable) -> None:
+    """Triple 쓰기(추가·삭제) 후 관련 관계 태그 무효화."""
+    tags = set()
+    for t in triples:
+        tags.add(rel_tag(t.predicate))
+        tags.add(rel_tag(t.predicate, t.subject))
+    if tags:
+        read_cache.invalidate(*tags)
+
+
+def invalidate_node(uri: str, labels: Iterable[str], rels: Iterable) -> None:
+    """노드 삭제 후 무효화. rels: 삭제된 관계의 [type, 시작 노드 uri] 목록."""
+    tags = {node_tag(uri)}
+    tags.update(label_tag(label) for label in labels)
+    for rel, subject in rels:
+        tags.add(rel_tag(rel))
+        if subject:
+            tags.add(rel_tag(rel, subject))
+    read_cache.invalidate(*tags)
@@ -0,0 +1,149 @@
+"""
+AutoML 학습 데이터 파일 로더 (.npy / CSV / Parquet / Arrow IPC).
+JSON 리스트를 거치지 않고 파일에서 바로 numpy 배열로 읽음. .npy는 memory-map (복사 없음).
+Arrow IPC·Parquet은 열 단위 저장이라 여러 열 테이블은 float64 2D 배열로 한 번 복사하고,
+단일 열(target 파일 등)만 Arrow 버퍼의 zero-copy view.
+Parquet·Arrow는 pyarrow가 설치된 경우에만 지원.
+"""
+import os
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from fastapi import HTTPException
+
+FORMATS = {
+    ".npy": "npy",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def detect_format(filename: Optional[str], fmt: Optional[str] = None) -> str:
+    """명시된 형식 또는 파일 확장자로 형식 결정. 알 수 없으면 415."""
+    if fmt:
+        fmt = fmt.lower()
+        if fmt in FORMATS.values():
+            return fmt
+    else:
+        ext = os.path.splitext(filename or "")[1].lower()
+        if ext in FORMATS:
+            return FORMATS[ext]
+    raise HTTPException(
+        status_code=415,
+        detail=f"Unsupported training data format. Supported: {sorted(set(FORMATS.values()))}",
+    )
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise HTTPException(status_code=415, detail="Parquet/Arrow upload requires pyarrow on the server")
+
+
+def _table_to_array(table) -> np.ndarray:
+    """
+    Arrow Table → 2D 배열. 단일 청크·null 없는 숫자 단일 열은 zero-copy view (n, 1),
+    그 외에는 열 단위로 채운 float64 복사본 (중간 객체 생성 없음).
+    """
+    import pyarrow as pa
+
+    if table.num_columns == 1:
+        column = table.column(0)
+        if column.num_chunks == 1 and column.null_count == 0 and (
+            pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+        ):
+            return column.chunk(0).to_numpy(zero_copy_only=True).reshape(-1, 1)
+    out = np.empty((table.num_rows, table.num_columns), dtype=np.float64)
+    for j, column in enumerate(table.columns):
+        out[:, j] = column.to_numpy()
+    return out
+
+
+def _read_csv(path: str, header: bool) -> Tuple[np.ndarray, Optional[List[str]]]:
+    try:
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        pa_csv = None
+    if pa_csv is not None:
+        read_options = pa_csv.ReadOptions(autogenerate_column_names=not header)
+        table = pa_csv.read_csv(path, read_options=read_options)
+        return _table_to_array(table), table.column_names if header else None
+    names = None
+    if header:
+        with open(path, "r", encoding="utf-8") as f:
+            names = [c.strip() for c in f.readline().rstrip("\r\n").split(",")]
+    return np.loadtxt(path, delimiter=",", skiprows=1 if header else 0, dtype=np.float64, ndmin=2), names
+
+
+def load_table(path: str, fmt: str, header: bool = True) -> Tuple[np.ndarray, Optional[List[str]]]:
+    """파일을 2D 배열(+ 열 이름)로 로드."""
+    if fmt == "npy":
+        return np.load(path, mmap_mode="r", allow_pickle=False), None
+    if fmt == "csv":
+        return _read_csv(path, header)
+    _require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, memory_map=True)
+    else:
+        import pyarrow as pa
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    return _table_to_array(table), table.column_names
+
+
+def _column_index(target_column: Union[str, int, None], names: Optional[List[str]], n_cols: int) -> int:
+    if target_column is None or target_column == "":
+        return n_cols - 1
+    if isinstance(target_column, int) or target_column.lstrip("-").isdigit():
+        idx = int(target_column)
+    elif names is not None and target_column in names:
+        idx = names.index(target_column)
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown target column: {target_column}")
+    if not -n_cols <= idx < n_cols:
+        raise HTTPException(status_code=400, detail=f"Target column index out of range: {idx}")
+    return idx % n_cols
+
+
+def load_training_data(
+    features_path: str,
+    fmt: str,
+    target_path: Optional[str] = None,
+    target_fmt: Optional[str] = None,
+    target_column: Union[str, int, None] = None,
+    header: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (X, y) 로드. target 파일이 있으면 그 첫 열(또는 1D 배열)을 y로,
+    없으면 features 파일의 target_column(기본: 마지막 열)을 y로 분리.
+    첫/마지막 열 분리는 복사 없이 view(memmap 유지).
+    """
+    table, names = load_table(features_path, fmt, header)
+    if table.ndim != 2:
+        raise HTTPException(status_code=400, detail="Training data must be a 2D table.")
+    if target_path:
+        X = table
+        y, _ = load_table(target_path, target_fmt or fmt, header)
+        y = y.reshape(-1) if y.ndim == 1 or y.shape[1] == 1 else y[:, 0]
+    else:
+        if table.shape[1] < 2:
+            raise HTTPException(status_code=400, detail="Training data needs at least one feature and a target column.")
+        idx = _column_index(target_column, names, table.shape[1])
+        y = table[:, idx]
+        if idx == table.shape[1] - 1:
+            X = table[:, :-1]
+        elif idx == 0:
+            X = table[:, 1:]
+        else:
+            X = np.delete(table, idx, axis=1)
+    if not np.issubdtype(X.dtype, np.number) or not np.issubdtype(y.dtype, np.number):
+        raise HTTPException(status_code=400, detail="Training data must be numeric.")
+    if len(X) != len(y) or len(X) < 2:
+        raise HTTPException(status_code=400, detail="features and target must have the same length and at least 2 samples.")
+    return X, np.asarray(y, dtype=float)
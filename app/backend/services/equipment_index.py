@@ -0,0 +1,177 @@
+"""
+설비 계층(hasPart) in-memory 인접 인덱스.
+Neo4j에서 한 번 읽어 부모→자식 / 자식→부모 맵을 만들고, Triple 쓰기 경로가 hasPart 변경을 증분 반영.
+하위 트리·조상·중첩 트리 조회는 DB 왕복 없이 메모리에서 응답.
+인덱스에 없는 노드가 관련된 쓰기, 벌크·임포트처럼 범위를 알기 어려운 쓰기는 stale로 표시해 다음 조회 때 다시 로드.
+"""
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+from db.neo4j import neo4j_read
+from db.queries import register_query
+
+HIERARCHY_PREDICATE = "hasPart"
+# 중첩 트리 최대 깊이. 한 단계가 JSON 2단계(객체·children 배열)이므로 orjson 중첩 한도(255) 안에 들도록 제한
+MAX_TREE_DEPTH = 100
+
+# 전체 설비 목록을 읽으므로 Equipment 라벨 스캔 허용
+INDEX_QUERY = register_query("graph.equipment_index.load", """
+MATCH (e:Equipment)
+OPTIONAL MATCH (e)-[:hasPart]->(c:Equipment)
+RETURN e.uri AS id, e.`rdfs__label` AS name, collect(c.uri) AS children
+""", allow=("NodeByLabelScan",))
+
+
+class EquipmentIndex:
+    """스레드 안전 설비 계층 인덱스. 조회 전 ensure_loaded() 호출."""
+
+    def __init__(self):
+        self._names: Dict[str, Optional[str]] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._parents: Dict[str, Set[str]] = {}
+        self._stale = True
+        # 쓰기마다 증가. 로드 도중 쓰기가 있었다면 로드 후에도 stale 유지
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    def ensure_loaded(self) -> None:
+        if not self._stale:
+            return
+        with self._load_lock:
+            if self._stale:
+                self.load()
+
+    def load(self) -> int:
+        """Neo4j에서 전체 재구성. 설비 수 반환."""
+        with self._lock:
+            generation = self._generation
+        rows = neo4j_read(INDEX_QUERY)
+        names = {row["id"]: row["name"] for row in rows}
+        children = {row["id"]: set(row["children"]) for row in rows}
+        parents: Dict[str, Set[str]] = {node: set() for node in names}
+        for parent, kids in children.items():
+            for child in kids:
+                parents[child].add(parent)
+        with self._lock:
+            self._names, self._children, self._parents = names, children, parents
+            self._stale = generation != self._generation
+        return len(names)
+
+    def mark_stale(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._stale = True
+
+    def apply_triples(self, added: Iterable = (), deleted: Iterable = ()) -> None:
+        """단건 Triple 추가·삭제 반영. 인덱스에 없는 노드(설비 여부 불명)가 있으면 stale로 표시."""
+        with self._lock:
+            self._generation += 1
+            for t in added:
+                if t.predicate != HIERARCHY_PREDICATE:
+                    continue
+                if t.subject not in self._names or t.object not in self._names:
+                    self._stale = True
+                    continue
+                self._children[t.subject].add(t.object)
+                self._parents[t.object].add(t.subject)
+            for t in deleted:
+                if t.predicate != HIERARCHY_PREDICATE:
+                    continue
+                self._children.get(t.subject, set()).discard(t.object)
+                self._parents.get(t.object, set()).discard(t.subject)
+
+    def remove_node(self, uri: str) -> None:
+        with self._lock:
+            self._generation += 1
+            if uri not in self._names:
+                return
+            del self._names[uri]
+            for child in self._children.pop(uri, set()):
+                self._parents[child].discard(uri)
+            for parent in self._parents.pop(uri, set()):
+                self._children[parent].discard(uri)
+
+    def __contains__(self, uri: str) -> bool:
+        return uri in self._names
+
+    def _node(self, uri: str) -> dict:
+        return {"id": uri, "name": self._names.get(uri)}
+
+    def subtree(self, root: str, depth: Optional[int] = None) -> List[dict]:
+        """root 하위 설비 (BFS 순, root 제외). depth: root로부터 최대 거리."""
+        with self._lock:
+            result = []
+            seen = {root}
+            queue = deque([(root, 0)])
+            while queue:
+                node, dist = queue.popleft()
+                if depth is not None and dist >= depth:
+                    continue
+                for child in sorted(self._children.get(node, ())):
+                    if child in seen:
+                        continue
+                    seen.add(child)
+                    result.append({**self._node(child), "parentId": node, "depth": dist + 1})
+                    queue.append((child, dist + 1))
+            return result
+
+    def ancestors(self, uri: str) -> List[dict]:
+        """상위 설비 (가까운 순). 부모가 여럿이면 모두 포함."""
+        with self._lock:
+            result = []
+            seen = {uri}
+            queue = deque([(uri, 0)])
+            while queue:
+                node, dist = queue.popleft()
+                for parent in sorted(self._parents.get(node, ())):
+                    if parent in seen:
+                        continue
+                    seen.add(parent)
+                    result.append({**self._node(parent), "childId": node, "distance": dist + 1})
+                    queue.append((parent, dist + 1))
+            return result
+
+    def tree(self, root: Optional[str] = None, depth: Optional[int] = None) -> List[dict]:
+        """
+        중첩 트리 {id, name, children}. root가 없으면 부모가 없는 설비들을 루트로 사용.
+        각 설비는 루트에서 가장 가까운 위치에서 한 번만 펼치고, 다른 위치(공유 하위 설비·순환)에는
+        children 없이 repeated: true로 표시 (출력 크기 O(V+E)).
+        depth(최대 MAX_TREE_DEPTH)에서 펼치지 않은 하위 설비가 있으면 truncated: true.
+        """
+        with self._lock:
+            if root is not None:
+                roots = [root]
+            else:
+                roots = sorted(n for n in self._names if not self._parents.get(n))
+            expanded: Set[str] = set()
+            depth = MAX_TREE_DEPTH if depth is None else min(depth, MAX_TREE_DEPTH)
+            return [self._nest(r, depth, expanded) for r in roots]
+
+    def _nest(self, root: str, depth: int, expanded: Set[str]) -> dict:
+        """BFS로 중첩 트리 구성 (명시적 큐라 깊은 계층에서도 재귀 한도 없음)."""
+        out = {**self._node(root), "children": []}
+        expanded.add(root)
+        queue = deque([(out, root, depth)])
+        while queue:
+            node_out, node, remaining = queue.popleft()
+            if remaining <= 0:
+                if self._children.get(node):
+                    node_out["truncated"] = True
+                continue
+            for child in sorted(self._children.get(node, ())):
+                child_out = {**self._node(child), "children": []}
+                node_out["children"].append(child_out)
+                if child in expanded:
+                    child_out["repeated"] = True
+                    continue
+                expanded.add(child)
+                queue.append((child_out, child, remaining - 1))
+        return out
+
+equipment_index = EquipmentIndex()
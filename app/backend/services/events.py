@@ -0,0 +1,138 @@
+"""
+제조 이벤트 push (설비 상태·보전·작업지시, 품질 측정) — SSE / WebSocket 구독용 in-process 이벤트 버스.
+쓰기 경로가 한 번 publish하면 구독자에게 fan-out하므로 대시보드가 상태를 polling할 필요가 없음.
+설비 상태처럼 최신 값만 의미 있는 이벤트는 구독자별로 (topic, type)당 최신 것만 보관(coalescing)하고,
+작업지시·품질·보전 같은 개별 이벤트는 모두 보관. 버퍼가 상한을 넘으면 가장 오래된 것부터 버리고
+dropped로 세어 느린 클라이언트가 메모리를 점유하지 않게 함.
+"""
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config import EVENTS_MAX_SUBSCRIBERS, EVENTS_SUBSCRIBER_BUFFER
+
+# 최신 값으로 대체해도 되는 상태형 이벤트 (나머지는 개별 이벤트라 병합하지 않음)
+COALESCED_TYPES = frozenset({"status"})
+
+
+def equipment_topic(equipment_id: str) -> str:
+    return f"equipment:{equipment_id}"
+
+
+def quality_topic(product_id: str) -> str:
+    return f"quality:{product_id}"
+
+
+class SubscriberLimitReached(Exception):
+    """구독자 수 상한 초과."""
+
+
+class Subscriber:
+    """구독자 1명의 대기 이벤트 버퍼. 이벤트 루프 스레드에서만 접근."""
+
+    def __init__(self, topics: Optional[Set[str]], buffer_size: int):
+        # None이면 전체 topic 구독
+        self.topics = topics
+        self.buffer_size = buffer_size
+        self.dropped = 0
+        self._pending: "OrderedDict[Tuple[str, object], dict]" = OrderedDict()
+        self._seq = itertools.count()
+        self._ready = asyncio.Event()
+
+    def _offer(self, topic: str, event: dict) -> None:
+        if event["type"] in COALESCED_TYPES:
+            key = (topic, event["type"])
+        else:
+            # 개별 이벤트는 고유 키로 보관해 서로 대체되지 않음 (버퍼 상한으로만 버려짐)
+            key = (topic, next(self._seq))
+        if key in self._pending:
+            # 아직 전달되지 않은 같은 상태 이벤트는 최신 값으로 대체
+            self._pending.pop(key)
+        elif len(self._pending) >= self.buffer_size:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        self._pending[key] = event
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> List[dict]:
+        """대기 이벤트를 한 번에 가져옴 (발생 순). timeout 동안 없으면 빈 목록."""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        events = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        return events
+
+
+class EventBus:
+    def __init__(self, max_subscribers: int, buffer_size: int):
+        self.max_subscribers = max_subscribers
+        self.buffer_size = buffer_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._by_topic: Dict[str, Set[Subscriber]] = {}
+        self._all: Set[Subscriber] = set()
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None) -> Subscriber:
+        """구독 등록 (이벤트 루프에서 호출). topics가 비어 있으면 전체 구독."""
+        self._loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise SubscriberLimitReached()
+            self._count += 1
+        topics = set(topics) if topics else None
+        sub = Subscriber(topics, self.buffer_size)
+        if topics is None:
+            self._all.add(sub)
+        else:
+            for topic in topics:
+                self._by_topic.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            self._count -= 1
+        if sub.topics is None:
+            self._all.discard(sub)
+            return
+        for topic in sub.topics:
+            subs = self._by_topic.get(topic)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._by_topic[topic]
+
+    def _deliver(self, topic: str, event: dict) -> None:
+        for sub in self._by_topic.get(topic, ()):
+            sub._offer(topic, event)
+        for sub in self._all:
+            sub._offer(topic, event)
+
+    def publish(self, topic: str, event_type: str, **data) -> None:
+        """이벤트 발행. 동기 엔드포인트(스레드풀)·작업 스레드에서도 호출 가능. 구독자가 없으면 무시."""
+        loop = self._loop
+        if loop is None or self._count == 0:
+            return
+        event = {"type": event_type, "topic": topic, "at": time.time(), **data}
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(topic, event)
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, topic, event)
+        except RuntimeError:
+            # 루프 종료 후 (앱 shutdown 중)
+            pass
+
+
+event_bus = EventBus(EVENTS_MAX_SUBSCRIBERS, EVENTS_SUBSCRIBER_BUFFER)
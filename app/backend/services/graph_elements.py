@@ -0,0 +1,169 @@
+"""
+그래프 탐색용 페이지 조회와 응답 형식 변환.
+노드는 uri 순 keyset cursor로 나눠 가져오고(Resource.uri 유니크 인덱스 사용), 이웃 확장은 관계 elementId 순.
+응답은 Cytoscape elements(기본) 또는 columnar(노드 테이블 + 엣지 인덱스 배열, 라벨·관계 타입 intern).
+"""
+import base64
+import json
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from db.queries import register_query
+
+FORMATS = ("cytoscape", "columnar")
+
+_NODE_LABEL = "coalesce({v}.`rdfs__label`, {v}.name, head(labels({v})))"
+_NODE_ID = "coalesce({v}.uri, elementId({v}))"
+
+# 노드 페이지 + 각 노드의 나가는 관계(노드당 최대 $edge_limit개)
+ELEMENTS_QUERY = f"""
+MATCH (n:Resource)
+WHERE n.uri IS NOT NULL {{after_clause}}
+WITH n ORDER BY n.uri LIMIT $fetch
+CALL (n) {{{{
+    MATCH (n)-[r]->(m)
+    WITH r, m LIMIT $edge_limit
+    RETURN collect({{{{
+        id: elementId(r), rel: type(r),
+        target: {_NODE_ID.format(v="m")},
+        label: {_NODE_LABEL.format(v="m")},
+        types: labels(m)
+    }}}}) AS edges
+}}}}
+RETURN n.uri AS id, {_NODE_LABEL.format(v="n")} AS label, labels(n) AS types, edges
+ORDER BY id
+"""
+
+# 한 노드의 이웃 (관계 elementId 순 페이지)
+_EXPAND_PATTERNS = {
+    "out": "(n)-[r]->(m)",
+    "in": "(n)<-[r]-(m)",
+    "both": "(n)-[r]-(m)",
+}
+
+EXPAND_QUERY = f"""
+MATCH (n:Resource {{{{uri: $node_id}}}})
+CALL (n) {{{{
+    MATCH {{pattern}}
+    WHERE ($rel_types IS NULL OR type(r) IN $rel_types) {{after_clause}}
+    WITH r, m ORDER BY elementId(r) LIMIT $fetch
+    RETURN collect({{{{
+        id: elementId(r), rel: type(r), outgoing: startNode(r) = n,
+        neighbor: {_NODE_ID.format(v="m")},
+        label: {_NODE_LABEL.format(v="m")},
+        types: labels(m)
+    }}}}) AS edges
+}}}}
+RETURN n.uri AS id, {_NODE_LABEL.format(v="n")} AS label, labels(n) AS types, edges
+"""
+
+
+def encode_cursor(key: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    """cursor → 마지막 정렬 키. 형식 오류 시 400."""
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(key, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+def elements_query(after: Optional[str]) -> str:
+    return ELEMENTS_QUERY.format(after_clause="AND n.uri > $after" if after else "")
+
+
+def expand_query(direction: str, after: Optional[str]) -> str:
+    if direction not in _EXPAND_PATTERNS:
+        raise HTTPException(status_code=400, detail=f"Invalid direction: {direction} (out, in, both)")
+    return EXPAND_QUERY.format(
+        pattern=_EXPAND_PATTERNS[direction],
+        after_clause="AND elementId(r) > $after" if after else "",
+    )
+
+
+register_query("graph.elements", elements_query(None), fetch=101, edge_limit=50)
+register_query("graph.elements.after", elements_query("ex:A"), after="ex:A", fetch=101, edge_limit=50)
+for _direction in _EXPAND_PATTERNS:
+    register_query(
+        f"graph.expand.{_direction}", expand_query(_direction, None),
+        node_id="ex:Equipment_1", rel_types=None, fetch=101,
+    )
+
+
+def elements_from_rows(rows) -> Tuple[Dict[str, dict], List[dict]]:
+    """ELEMENTS_QUERY 결과 → (노드 dict, 엣지 목록). 노드는 id 기준 중복 제거."""
+    nodes: Dict[str, dict] = {}
+    edges: List[dict] = []
+    for row in rows:
+        nodes[row["id"]] = {"id": row["id"], "label": row["label"], "types": row["types"]}
+        for e in row["edges"]:
+            nodes.setdefault(e["target"], {"id": e["target"], "label": e["label"], "types": e["types"]})
+            edges.append({"id": e["id"], "source": row["id"], "target": e["target"], "rel": e["rel"]})
+    return nodes, edges
+
+
+def expansion_from_row(row) -> Tuple[Dict[str, dict], List[dict]]:
+    """EXPAND_QUERY 결과 행 → (노드 dict, 엣지 목록). 방향은 관계의 실제 방향을 따름."""
+    center = row["id"]
+    nodes = {center: {"id": center, "label": row["label"], "types": row["types"]}}
+    edges = []
+    for e in row["edges"]:
+        nodes.setdefault(e["neighbor"], {"id": e["neighbor"], "label": e["label"], "types": e["types"]})
+        source, target = (center, e["neighbor"]) if e["outgoing"] else (e["neighbor"], center)
+        edges.append({"id": e["id"], "source": source, "target": target, "rel": e["rel"]})
+    return nodes, edges
+
+
+def to_cytoscape(nodes: Dict[str, dict], edges: List[dict]) -> dict:
+    """Cytoscape.js elements 형식 (기존 /graph/elements 응답과 동일한 data 키)."""
+    elements = [
+        {"data": {"id": n["id"], "label": n["label"] or "node", "types": n["types"]}}
+        for n in nodes.values()
+    ]
+    elements.extend(
+        {"data": {"id": e["id"], "source": e["source"], "target": e["target"], "label": e["rel"]}}
+        for e in edges
+    )
+    return {"elements": elements}
+
+
+def to_columnar(nodes: Dict[str, dict], edges: List[dict]) -> dict:
+    """
+    columnar 형식: 노드 열 배열 + 엣지는 노드 행 번호 배열.
+    라벨 조합(types)과 관계 타입은 테이블에 한 번만 두고 번호로 참조.
+    """
+    node_index: Dict[str, int] = {}
+    type_sets: Dict[Tuple[str, ...], int] = {}
+    rel_types: Dict[str, int] = {}
+    node_ids, node_labels, node_types = [], [], []
+    for node_id, n in nodes.items():
+        node_index[node_id] = len(node_ids)
+        node_ids.append(node_id)
+        node_labels.append(n["label"])
+        node_types.append(type_sets.setdefault(tuple(n["types"]), len(type_sets)))
+    sources, targets, rels, edge_ids = [], [], [], []
+    for e in edges:
+        sources.append(node_index[e["source"]])
+        targets.append(node_index[e["target"]])
+        rels.append(rel_types.setdefault(e["rel"], len(rel_types)))
+        edge_ids.append(e["id"])
+    return {
+        "typeSets": [list(t) for t in type_sets],
+        "relTypes": list(rel_types),
+        "nodes": {"id": node_ids, "label": node_labels, "types": node_types},
+        "edges": {"id": edge_ids, "source": sources, "target": targets, "rel": rels},
+    }
+
+
+def render(nodes: Dict[str, dict], edges: List[dict], fmt: str) -> dict:
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format: {fmt} ({', '.join(FORMATS)})")
+    return to_columnar(nodes, edges) if fmt == "columnar" else to_cytoscape(nodes, edges)
@@ -0,0 +1,402 @@
+"""
+작업지시·품질 측정·보전 이벤트 일괄 수집 (JSON 배열 / NDJSON 스트림).
+청크 단위 UNWIND 트랜잭션으로 쓰고, 같은 쿼리에서 OEE 카운터·품질 롤업도 갱신.
+노드는 uri로 MERGE하므로 같은 작업지시 번호·idempotency_key의 재전송은 중복 생성되지 않음.
+동시 쓰기 청크 수를 제한해 Neo4j가 밀리면 429/503 + Retry-After로 역압.
+역압으로 거절된 청크에서 수집을 멈추고, 그 전까지 커밋된 건수와 재전송 시작 위치(resumeFrom)를 함께 반환.
+커밋된 신규 이벤트는 services.events 버스로 구독자에게 발행.
+"""
+import asyncio
+import json
+import uuid
+from typing import AsyncIterator, Callable, Dict, List, Optional, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from config import (
+    INGEST_CHUNK_SIZE, INGEST_MAX_BATCH,
+    INGEST_MAX_CONCURRENT, INGEST_MAX_WAITING,
+    INGEST_ACQUIRE_TIMEOUT_SECONDS, INGEST_RETRY_AFTER_SECONDS,
+)
+from db.neo4j import neo4j_write
+from db.queries import register_query
+from models.schemas import WorkOrder, QualityControl, MaintenanceEvent
+from services.cache import read_cache, rel_tag, label_tag
+from services.events import event_bus, equipment_topic, quality_topic
+from services.oee import counter_update
+from services.quality import rollup_buckets
+
+# idempotency_key → uri 변환용 네임스페이스 (같은 키는 항상 같은 uri)
+_ID_NAMESPACE = uuid.UUID("6f1c2b1e-4d1a-4f5e-9c7a-3b8e2a9d0c11")
+
+# 최대 오류 메시지 수 (초과분은 errorCount로만 집계)
+_MAX_ERRORS = 100
+
+
+def event_id(prefix: str, idempotency_key: Optional[str] = None) -> str:
+    """충돌 없는 이벤트 uri. 키가 있으면 키에서 결정적으로(uuid5), 없으면 무작위(uuid4)."""
+    u = uuid.uuid5(_ID_NAMESPACE, f"{prefix}:{idempotency_key}") if idempotency_key else uuid.uuid4()
+    return f"ex:{prefix}_{u.hex}"
+
+
+def work_order_id(work_order: WorkOrder) -> str:
+    return f"ex:WO_{work_order.workOrderNumber}"
+
+
+# MERGE 후 ingestedAt이 이번 문장의 datetime()과 같으면 이번에 생성된 노드
+_CREATED = "coalesce({v}.ingestedAt = datetime(), false)"
+
+WORK_ORDERS_INGEST = register_query("manufacturing.ingest.work_orders", f"""
+UNWIND $rows AS row
+MERGE (w:WorkOrder {{uri: row.id}})
+ON CREATE SET w.workOrderNumber = row.workOrderNumber,
+              w.plannedQuantity = row.plannedQuantity,
+              w.actualQuantity = row.actualQuantity,
+              w.status = row.status,
+              w.ingestedAt = datetime(),
+              w:Resource
+WITH w, row, {_CREATED.format(v="w")} AS created
+OPTIONAL MATCH (e:Equipment {{uri: row.equipmentId}})
+FOREACH (_ IN CASE WHEN created AND e IS NOT NULL THEN [1] ELSE [] END |
+    CREATE (w)-[:executedBy]->(e)
+    {counter_update("e", new=("w.status", "w.plannedQuantity", "w.actualQuantity"))}
+)
+RETURN row.idx AS idx, created, row.equipmentId IS NULL OR e IS NOT NULL AS linked
+""", rows=[{
+    "idx": 0, "id": "ex:WO_1", "workOrderNumber": "1", "plannedQuantity": 1,
+    "actualQuantity": 0, "status": "planned", "equipmentId": "ex:Equipment_1",
+}])
+
+QUALITY_INGEST = register_query("manufacturing.ingest.quality", f"""
+UNWIND $rows AS row
+MATCH (p:Product {{uri: row.productId}})
+MERGE (q:QualityControl {{uri: row.id}})
+ON CREATE SET q.qualityResult = row.qualityResult,
+              q.timestamp = row.timestamp,
+              q.idempotencyKey = row.key,
+              q.ingestedAt = datetime(),
+              q:Resource
+WITH p, q, row, {_CREATED.format(v="q")} AS created
+FOREACH (_ IN CASE WHEN created THEN [1] ELSE [] END |
+    CREATE (p)-[:hasQuality]->(q)
+    FOREACH (b IN row.buckets |
+        MERGE (r:QualityRollup {{granularity: b.granularity, bucket: b.bucket, result: row.qualityResult}})
+        ON CREATE SET r.count = 0
+        SET r.count = r.count + 1
+    )
+)
+RETURN row.idx AS idx, created, true AS linked
+""", rows=[{
+    "idx": 0, "id": "ex:QC_1", "productId": "ex:Product_1", "qualityResult": "pass",
+    "timestamp": "2024-01-01T00:00:00", "key": None, "buckets": [],
+}])
+
+MAINTENANCE_INGEST = register_query("manufacturing.ingest.maintenance", f"""
+UNWIND $rows AS row
+MATCH (e:Equipment {{uri: row.equipmentId}})
+MERGE (m:Maintenance {{uri: row.id}})
+ON CREATE SET m.maintenanceType = row.maintenanceType,
+              m.timestamp = row.timestamp,
+              m.idempotencyKey = row.key,
+              m.ingestedAt = datetime(),
+              m:Resource
+WITH e, m, row, {_CREATED.format(v="m")} AS created
+FOREACH (_ IN CASE WHEN created THEN [1] ELSE [] END |
+    CREATE (e)-[:hasMaintenance]->(m)
+)
+RETURN row.idx AS idx, created, true AS linked
+""", rows=[{
+    "idx": 0, "id": "ex:MT_1", "equipmentId": "ex:Equipment_1",
+    "maintenanceType": "preventive", "timestamp": "2024-01-01T00:00:00", "key": None,
+}])
+
+
+def _work_order_row(w: WorkOrder) -> dict:
+    return {
+        "id": work_order_id(w),
+        "workOrderNumber": w.workOrderNumber,
+        "plannedQuantity": w.plannedQuantity,
+        "actualQuantity": w.actualQuantity,
+        "status": w.status,
+        "equipmentId": w.equipment_id,
+    }
+
+
+def _quality_row(q: QualityControl) -> dict:
+    return {
+        "id": event_id("QC", q.idempotency_key),
+        "productId": q.product_id,
+        "qualityResult": q.qualityResult,
+        "timestamp": q.timestamp,
+        "key": q.idempotency_key,
+        "buckets": rollup_buckets(q.timestamp),
+    }
+
+
+def _maintenance_row(m: MaintenanceEvent) -> dict:
+    return {
+        "id": event_id("MT", m.idempotency_key),
+        "equipmentId": m.equipment_id,
+        "maintenanceType": m.maintenanceType,
+        "timestamp": m.timestamp,
+        "key": m.idempotency_key,
+    }
+
+
+def _invalidate_work_orders(rows: List[dict]) -> None:
+    read_cache.invalidate(label_tag("WorkOrder"), *(rel_tag("executedBy", r["id"]) for r in rows))
+
+
+def _invalidate_quality(rows: List[dict]) -> None:
+    read_cache.invalidate(label_tag("QualityControl"), *{rel_tag("hasQuality", r["productId"]) for r in rows})
+
+
+def _invalidate_maintenance(rows: List[dict]) -> None:
+    read_cache.invalidate(*{rel_tag("hasMaintenance", r["equipmentId"]) for r in rows})
+
+
+def _publish_work_order(row: dict) -> None:
+    if row["equipmentId"]:
+        event_bus.publish(
+            equipment_topic(row["equipmentId"]), "workOrder",
+            equipmentId=row["equipmentId"], workOrderId=row["id"], status=row["status"],
+            plannedQuantity=row["plannedQuantity"], actualQuantity=row["actualQuantity"],
+        )
+
+
+def _publish_quality(row: dict) -> None:
+    event_bus.publish(
+        quality_topic(row["productId"]), "quality",
+        productId=row["productId"], id=row["id"],
+        qualityResult=row["qualityResult"], timestamp=row["timestamp"].isoformat(),
+    )
+
+
+def _publish_maintenance(row: dict) -> None:
+    event_bus.publish(
+        equipment_topic(row["equipmentId"]), "maintenance",
+        equipmentId=row["equipmentId"], id=row["id"],
+        maintenanceType=row["maintenanceType"], timestamp=row["timestamp"].isoformat(),
+    )
+
+
+class _Kind:
+    def __init__(self, name: str, model: Type[BaseModel], to_row: Callable, cypher: str, missing: str,
+                 invalidate: Callable[[List[dict]], None], publish: Callable[[dict], None]):
+        self.name = name
+        self.model = model
+        self.to_row = to_row
+        self.cypher = cypher
+        self.missing = missing
+        self.invalidate = invalidate
+        self.publish = publish
+
+
+KINDS: Dict[str, _Kind] = {
+    "work-orders": _Kind("work-orders", WorkOrder, _work_order_row, WORK_ORDERS_INGEST,
+                         "equipment not found (order stored unlinked)",
+                         _invalidate_work_orders, _publish_work_order),
+    "quality": _Kind("quality", QualityControl, _quality_row, QUALITY_INGEST,
+                     "product not found", _invalidate_quality, _publish_quality),
+    "maintenance": _Kind("maintenance", MaintenanceEvent, _maintenance_row, MAINTENANCE_INGEST,
+                         "equipment not found", _invalidate_maintenance, _publish_maintenance),
+}
+
+
+class IngestLimiter:
+    """
+    동시에 Neo4j에 쓰는 청크 수 제한.
+    대기 중인 청크가 max_waiting을 넘으면 429, acquire_timeout 안에 차례가 오지 않으면 503 (둘 다 Retry-After).
+    """
+
+    def __init__(self, max_concurrent: int, max_waiting: int, acquire_timeout: float, retry_after: int):
+        self.max_waiting = max_waiting
+        self.acquire_timeout = acquire_timeout
+        self.retry_after = retry_after
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def _reject(self, status_code: int, detail: str) -> HTTPException:
+        return HTTPException(status_code=status_code, detail=detail, headers={"Retry-After": str(self.retry_after)})
+
+    async def run(self, fn: Callable, *args):
+        """차례가 오면 fn(*args)를 스레드에서 실행."""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        else:
+            if self.waiting >= self.max_waiting:
+                raise self._reject(429, "Ingest queue is full, retry later")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.acquire_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject(503, "Neo4j is lagging behind ingest, retry later")
+            finally:
+                self.waiting -= 1
+        try:
+            return await asyncio.to_thread(fn, *args)
+        finally:
+            self._semaphore.release()
+
+
+ingest_limiter = IngestLimiter(
+    INGEST_MAX_CONCURRENT, INGEST_MAX_WAITING, INGEST_ACQUIRE_TIMEOUT_SECONDS, INGEST_RETRY_AFTER_SECONDS
+)
+
+
+class _Results:
+    def __init__(self):
+        self.received = 0
+        self.created = 0
+        self.duplicates = 0
+        self.error_count = 0
+        self.errors: List[str] = []
+        # 역압으로 거절된 청크의 첫 항목 idx와 거절 응답 (이 idx부터는 쓰지 않음)
+        self.resume_from: Optional[int] = None
+        self.rejection: Optional[HTTPException] = None
+
+    def error(self, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < _MAX_ERRORS:
+            self.errors.append(message)
+
+    def to_dict(self) -> dict:
+        return {
+            "received": self.received,
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "errorCount": self.error_count,
+            "errors": self.errors,
+        }
+
+    def raise_if_rejected(self) -> None:
+        """
+        역압으로 중단됐으면 거절 상태 코드·Retry-After와 함께 부분 결과를 반환.
+        앞선 청크는 이미 커밋됐으므로 클라이언트는 resumeFrom 번째 항목부터 다시 보내면 중복 없이 이어짐.
+        """
+        if self.rejection is None:
+            return
+        raise HTTPException(
+            status_code=self.rejection.status_code,
+            headers=self.rejection.headers,
+            detail={"message": self.rejection.detail, "resumeFrom": self.resume_from, **self.to_dict()},
+        )
+
+
+def write_chunk(kind: _Kind, rows: List[dict]) -> List[dict]:
+    """
+    청크 하나를 한 쓰기 트랜잭션으로 쓰고 행별 결과(idx, created, linked) 반환. 커밋 후 새로 생성된 건만 구독자에게 발행.
+    idempotency key로 MERGE하므로 일시 오류로 재시도돼도 중복 생성되지 않음.
+    """
+    records = neo4j_write(kind.cypher, rows=rows)
+    kind.invalidate(rows)
+    created = {rec["idx"] for rec in records if rec["created"]}
+    for row in rows:
+        if row["idx"] in created:
+            kind.publish(row)
+    return records
+
+
+async def _flush(kind: _Kind, rows: List[dict], results: _Results) -> bool:
+    """청크 쓰기. 역압으로 거절되면 False (결과에 거절 정보 기록, 이후 청크는 쓰지 않음)."""
+    try:
+        records = await ingest_limiter.run(write_chunk, kind, rows)
+    except HTTPException as e:
+        if e.status_code in (429, 503) and e.headers:
+            results.resume_from, results.rejection = rows[0]["idx"], e
+            return False
+        for row in rows:
+            results.error(f"{kind.name} error [{row['idx']}]: {e.detail}")
+        return True
+    by_idx = {rec["idx"]: rec for rec in records}
+    for row in rows:
+        rec = by_idx.get(row["idx"])
+        if rec is None:
+            results.error(f"{kind.name} error [{row['idx']}]: {kind.missing}")
+            continue
+        if rec["created"]:
+            results.created += 1
+        else:
+            results.duplicates += 1
+        if not rec["linked"]:
+            results.error(f"{kind.name} warning [{row['idx']}]: {kind.missing}")
+    return True
+
+
+async def _ingest_items(kind: _Kind, items: AsyncIterator, results: _Results) -> None:
+    """(idx, 모델 또는 오류 메시지) 흐름을 청크로 모아 쓰기. 같은 요청 안의 중복 uri는 한 번만 씀."""
+    chunk: List[dict] = []
+    seen = set()
+    async for idx, item in items:
+        results.received += 1
+        if isinstance(item, str):
+            results.error(f"{kind.name} error [{idx}]: {item}")
+            continue
+        row = kind.to_row(item)
+        row["idx"] = idx
+        if row["id"] in seen:
+            results.duplicates += 1
+            continue
+        seen.add(row["id"])
+        chunk.append(row)
+        if len(chunk) >= INGEST_CHUNK_SIZE:
+            if not await _flush(kind, chunk, results):
+                return
+            chunk = []
+    if chunk:
+        await _flush(kind, chunk, results)
+
+
+async def ingest_batch(kind_name: str, items: List[BaseModel]) -> dict:
+    """검증된 모델 목록 수집."""
+    if len(items) > INGEST_MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {INGEST_MAX_BATCH} items")
+
+    async def gen():
+        for idx, item in enumerate(items):
+            yield idx, item
+
+    results = _Results()
+    await _ingest_items(KINDS[kind_name], gen(), results)
+    results.raise_if_rejected()
+    return results.to_dict()
+
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for data in chunks:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def ingest_ndjson(kind_name: str, chunks: AsyncIterator[bytes]) -> dict:
+    """NDJSON 요청 본문을 줄 단위로 읽으며 수집 (본문 전체를 메모리에 올리지 않음). 잘못된 줄은 오류로 보고."""
+    kind = KINDS[kind_name]
+
+    async def gen():
+        idx = 0
+        async for line in _ndjson_lines(chunks):
+            if not line.strip():
+                continue
+            try:
+                yield idx, kind.model(**json.loads(line))
+            except (ValueError, TypeError, ValidationError) as e:
+                yield idx, f"invalid record: {e}"
+            idx += 1
+
+    results = _Results()
+    await _ingest_items(kind, gen(), results)
+    results.raise_if_rejected()
+    return results.to_dict()
+
+
+def ingest_one(kind_name: str, item: BaseModel) -> Optional[str]:
+    """단건 쓰기 (동기 엔드포인트용). 생성·중복이면 uri, 대상 노드가 없으면 None."""
+    kind = KINDS[kind_name]
+    row = {**kind.to_row(item), "idx": 0}
+    return row["id"] if write_chunk(kind, [row]) else None
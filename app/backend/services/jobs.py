@@ -0,0 +1,128 @@
+"""
+백그라운드 작업 큐. 제한된 워커 스레드 풀과 대기열 상한으로 무거운 작업(AutoML 학습)을 실행.
+작업은 진행률·취소 이벤트를 받아 상태 조회·취소 API에서 사용.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config import AUTOML_MAX_CONCURRENT_JOBS, AUTOML_MAX_QUEUED_JOBS, AUTOML_JOB_RETENTION_SECONDS
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """대기열 상한 초과."""
+
+
+class Job:
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.completed = 0
+        self.total = 0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def set_progress(self, completed: int, total: int) -> None:
+        self.completed, self.total = completed, total
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": {"completed": self.completed, "total": self.total},
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """max_workers개 스레드로 실행, 실행+대기 중 작업이 max_workers + max_queued를 넘으면 거부."""
+
+    def __init__(self, max_workers: int, max_queued: int, retention_seconds: float):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[[Job], Any], on_finish: Optional[Callable[[], None]] = None) -> Job:
+        """
+        fn(job)을 실행할 작업 등록. 대기열이 가득 차면 JobQueueFull.
+        on_finish: 작업이 어떻게 끝나든(완료·실패·대기 중 취소·종료 시 폐기) 한 번 호출되는 정리 함수.
+        """
+        with self._lock:
+            self._prune()
+            active = sum(1 for j in self._jobs.values() if j.status in (QUEUED, RUNNING))
+            if active >= self.max_workers + self.max_queued:
+                raise JobQueueFull()
+            job = Job(kind)
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job, fn)
+            if on_finish is not None:
+                job.future.add_done_callback(lambda _: on_finish())
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """대기 중이면 즉시 취소, 실행 중이면 cancel_event를 set (작업이 다음 확인 시점에 중단)."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return job
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+        return job
+
+    def shutdown(self) -> None:
+        for job in list(self._jobs.values()):
+            job.cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        if job.cancel_event.is_set():
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job)
+        except Exception as e:
+            if job.cancel_event.is_set():
+                self._finish(job, CANCELLED)
+            else:
+                job.error = str(e)
+                self._finish(job, FAILED)
+            return
+        self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [
+            j.id for j in self._jobs.values()
+            if j.status in FINISHED_STATES and (j.finished_at or 0) < cutoff
+        ]:
+            del self._jobs[job_id]
+
+
+automl_jobs = JobManager(AUTOML_MAX_CONCURRENT_JOBS, AUTOML_MAX_QUEUED_JOBS, AUTOML_JOB_RETENTION_SECONDS)
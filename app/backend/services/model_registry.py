@@ -0,0 +1,172 @@
+"""
+학습된 AutoML 모델 레지스트리.
+최적 후보를 전체 데이터로 재학습해 MODEL_DIR/{name}/v{version}.joblib(+ 메타데이터 .json)으로 저장하고,
+예측 시에는 로드된 파이프라인을 LRU 캐시에 유지해 재로딩 없이 바로 사용.
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from config import MODEL_DIR, MODEL_CACHE_SIZE
+
+_NAME_RE = re.compile(r"^[A-Za-z0-9_.-]{1,100}$")
+_VERSION_RE = re.compile(r"^v(\d+)\.joblib$")
+
+_register_lock = threading.Lock()
+_cache: "OrderedDict[Tuple[str, int], object]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _check_name(name: str) -> str:
+    if not _NAME_RE.match(name) or name.startswith("."):
+        raise HTTPException(status_code=400, detail=f"Invalid model name: {name}")
+    return name
+
+
+def check_save_name(name: Optional[str]) -> None:
+    """등록 이름 사전 검증 (학습 시작 전에 400으로 거절). None이면 기본 이름 사용."""
+    if name is not None:
+        _check_name(name)
+
+
+def _model_dir(name: str) -> str:
+    return os.path.join(MODEL_DIR, _check_name(name))
+
+
+def list_versions(name: str) -> List[int]:
+    """저장된 버전 번호 (오름차순)."""
+    path = _model_dir(name)
+    if not os.path.isdir(path):
+        return []
+    versions = (_VERSION_RE.match(f) for f in os.listdir(path))
+    return sorted(int(m.group(1)) for m in versions if m)
+
+
+def list_models() -> List[dict]:
+    if not os.path.isdir(MODEL_DIR):
+        return []
+    models = []
+    for name in sorted(os.listdir(MODEL_DIR)):
+        if _NAME_RE.match(name) and os.path.isdir(os.path.join(MODEL_DIR, name)):
+            versions = list_versions(name)
+            if versions:
+                models.append({"name": name, "versions": versions, "latest": versions[-1]})
+    return models
+
+
+def get_metadata(name: str, version: int) -> dict:
+    path = os.path.join(_model_dir(name), f"v{version}.json")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Model {name} v{version} not found")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _atomic_write(path: str, write) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+
+
+def register_model(name: str, pipeline, metadata: dict) -> dict:
+    """파이프라인을 다음 버전으로 저장. 메타데이터를 먼저 쓰고 모델 파일을 마지막에 원자적으로 생성."""
+    path = _model_dir(name)
+    os.makedirs(path, exist_ok=True)
+    with _register_lock:
+        versions = list_versions(name)
+        version = versions[-1] + 1 if versions else 1
+        metadata = {**metadata, "name": name, "version": version, "created_at": time.time()}
+
+        def write_json(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False)
+
+        _atomic_write(os.path.join(path, f"v{version}.json"), write_json)
+        import joblib
+        _atomic_write(os.path.join(path, f"v{version}.joblib"), lambda tmp: joblib.dump(pipeline, tmp))
+    with _cache_lock:
+        _put_cache((name, version), pipeline)
+    return metadata
+
+
+def fit_and_register(X: np.ndarray, y: np.ndarray, result: dict, name: Optional[str] = None) -> Optional[dict]:
+    """select_best_model 결과의 최적 모델을 전체 데이터로 재학습해 등록. 최적 모델이 없으면 None."""
+    if not result.get("best_model"):
+        return None
+    from services.automl import build_pipeline  # scikit-learn은 첫 학습 시 import
+    task = result["task"]
+    pipeline = build_pipeline(task, result["best_model"])
+    start = time.perf_counter()
+    pipeline.fit(X, y)
+    fit_time = time.perf_counter() - start
+    metadata = register_model(name or f"automl-{task}", pipeline, {
+        "task": task,
+        "model": result["best_model"],
+        "scoring": result["scoring"],
+        "cv_score": result["best_score"],
+        "n_samples": int(X.shape[0]),
+        "n_features": int(X.shape[1]),
+        "fit_time": fit_time,
+    })
+    return {"name": metadata["name"], "version": metadata["version"]}
+
+
+def _put_cache(key: Tuple[str, int], pipeline) -> None:
+    _cache[key] = pipeline
+    _cache.move_to_end(key)
+    while len(_cache) > MODEL_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+def load_model(name: str, version: Optional[int] = None):
+    """(파이프라인, 버전) 반환. version 미지정 시 최신. 로드된 모델은 LRU 캐시에서 재사용."""
+    if version is None:
+        versions = list_versions(name)
+        if not versions:
+            raise HTTPException(status_code=404, detail=f"Model {name} not found")
+        version = versions[-1]
+    key = (name, version)
+    with _cache_lock:
+        pipeline = _cache.get(key)
+        if pipeline is not None:
+            _cache.move_to_end(key)
+            return pipeline, version
+    path = os.path.join(_model_dir(name), f"v{version}.joblib")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Model {name} v{version} not found")
+    import joblib
+    pipeline = joblib.load(path)
+    with _cache_lock:
+        _put_cache(key, pipeline)
+    return pipeline, version
+
+
+def predict(name: str, X: np.ndarray, version: Optional[int] = None, proba: bool = False) -> dict:
+    """배치 전체를 한 번의 predict 호출로 벡터화 예측."""
+    pipeline, version = load_model(name, version)
+    n_features = getattr(pipeline, "n_features_in_", None)
+    if X.ndim != 2 or (n_features is not None and X.shape[1] != n_features):
+        raise HTTPException(
+            status_code=400,
+            detail=f"features must be a 2D array with {n_features} columns.",
+        )
+    out = {"model": name, "version": version, "predictions": pipeline.predict(X).tolist()}
+    if proba:
+        if not hasattr(pipeline, "predict_proba"):
+            raise HTTPException(status_code=400, detail="Model does not support probabilities.")
+        out["classes"] = pipeline.classes_.tolist()
+        out["probabilities"] = pipeline.predict_proba(X).tolist()
+    return out
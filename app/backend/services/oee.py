@@ -0,0 +1,148 @@
+"""
+설비별 OEE 누적 카운터 (:OEECounter {equipment}).
+작업지시 생성·상태 변경 시 같은 쿼리 안에서 증분 갱신하므로 조회는 노드 하나 읽기로 끝남.
+availability = 완료 비율, performance = 목표 수량 달성 비율, quality = 완료 & 달성 비율.
+"""
+from typing import Dict, Optional, Tuple
+
+from db.queries import register_query
+
+COUNTER_FIELDS = (
+    "totalOrders",
+    "completedOrders",
+    "metTargetOrders",
+    "completedMetOrders",
+    "plannedQuantity",
+    "actualQuantity",
+)
+
+
+def _contribution(status: str, planned: str, actual: str) -> Dict[str, str]:
+    """작업지시 하나가 카운터에 기여하는 값 (Cypher 식)."""
+    completed = f"{status} = 'completed'"
+    met = f"{actual} >= {planned}"
+    return {
+        "totalOrders": "1",
+        "completedOrders": f"CASE WHEN {completed} THEN 1 ELSE 0 END",
+        "metTargetOrders": f"CASE WHEN {met} THEN 1 ELSE 0 END",
+        "completedMetOrders": f"CASE WHEN {completed} AND {met} THEN 1 ELSE 0 END",
+        "plannedQuantity": f"coalesce({planned}, 0)",
+        "actualQuantity": f"coalesce({actual}, 0)",
+    }
+
+
+def counter_update(
+    equipment: str,
+    new: Optional[Tuple[str, str, str]] = None,
+    old: Optional[Tuple[str, str, str]] = None,
+) -> str:
+    """
+    equipment 변수(Equipment 노드)의 카운터에 (new 기여 - old 기여)를 더하는 Cypher 절.
+    new/old: (status, plannedQuantity, actualQuantity) Cypher 식. FOREACH 안에서도 사용 가능.
+    """
+    add = _contribution(*new) if new else {}
+    sub = _contribution(*old) if old else {}
+    sets = []
+    for field in COUNTER_FIELDS:
+        delta = " ".join(
+            part for part in (
+                f"+ ({add[field]})" if field in add else "",
+                f"- ({sub[field]})" if field in sub else "",
+            ) if part
+        )
+        sets.append(f"c.{field} = coalesce(c.{field}, 0) {delta}")
+    sets.append("c.updatedAt = datetime()")
+    separator = ",\n        "
+    return f"""MERGE (c:OEECounter {{equipment: {equipment}.uri}})
+    SET {separator.join(sets)}"""
+
+
+# 작업지시 생성 + 설비 연결 + 카운터 증분을 한 번에 (1 round trip)
+CREATE_WORK_ORDER = register_query("manufacturing.work_order.create", f"""
+CREATE (w:Resource:WorkOrder {{
+    uri: $id,
+    workOrderNumber: $workOrderNumber,
+    plannedQuantity: $plannedQuantity,
+    actualQuantity: $actualQuantity,
+    status: $status
+}})
+WITH w
+OPTIONAL MATCH (e:Equipment {{uri: $equipmentId}})
+FOREACH (_ IN CASE WHEN e IS NULL THEN [] ELSE [1] END |
+    CREATE (w)-[:executedBy]->(e)
+    {counter_update("e", new=("w.status", "w.plannedQuantity", "w.actualQuantity"))}
+)
+RETURN w.uri AS id, e IS NOT NULL AS linked
+""", id="ex:WO_1", workOrderNumber="1", plannedQuantity=1, actualQuantity=0,
+    status="planned", equipmentId="ex:Equipment_1")
+
+# 상태·실적 변경: 이전 기여를 빼고 새 기여를 더함
+UPDATE_WORK_ORDER = register_query("manufacturing.work_order.update", f"""
+MATCH (w:WorkOrder {{uri: $id}})
+OPTIONAL MATCH (w)-[:executedBy]->(e:Equipment)
+WITH w, e, w.status AS oldStatus, w.plannedQuantity AS oldPlanned, w.actualQuantity AS oldActual
+SET w.status = coalesce($status, w.status),
+    w.actualQuantity = coalesce($actualQuantity, w.actualQuantity)
+WITH w, e, oldStatus, oldPlanned, oldActual
+FOREACH (_ IN CASE WHEN e IS NULL THEN [] ELSE [1] END |
+    {counter_update(
+        "e",
+        new=("w.status", "w.plannedQuantity", "w.actualQuantity"),
+        old=("oldStatus", "oldPlanned", "oldActual"),
+    )}
+)
+RETURN w.uri AS id, w.status AS status, w.actualQuantity AS actualQuantity, e.uri AS equipmentId
+""", id="ex:WO_1", status="completed", actualQuantity=1)
+
+# 기존 데이터로 전체 카운터 재계산 (초기 적재·불일치 복구용)
+REBUILD_COUNTERS = register_query("analytics.efficiency.rebuild", """
+MATCH (c:OEECounter) DETACH DELETE c
+WITH count(*) AS _
+MATCH (w:WorkOrder)-[:executedBy]->(e:Equipment)
+WITH e,
+     count(w) AS totalOrders,
+     sum(CASE WHEN w.status = 'completed' THEN 1 ELSE 0 END) AS completedOrders,
+     sum(CASE WHEN w.actualQuantity >= w.plannedQuantity THEN 1 ELSE 0 END) AS metTargetOrders,
+     sum(CASE WHEN w.status = 'completed' AND w.actualQuantity >= w.plannedQuantity THEN 1 ELSE 0 END) AS completedMetOrders,
+     sum(coalesce(w.plannedQuantity, 0)) AS plannedQuantity,
+     sum(coalesce(w.actualQuantity, 0)) AS actualQuantity
+CREATE (c:OEECounter {
+    equipment: e.uri,
+    totalOrders: totalOrders,
+    completedOrders: completedOrders,
+    metTargetOrders: metTargetOrders,
+    completedMetOrders: completedMetOrders,
+    plannedQuantity: plannedQuantity,
+    actualQuantity: actualQuantity,
+    updatedAt: datetime()
+})
+RETURN count(c) AS equipmentCount
+""", allow=("NodeByLabelScan",))
+
+COUNTER_RETURN = """
+RETURN c.equipment AS equipmentId,
+       c.totalOrders AS totalOrders,
+       c.completedOrders AS completedOrders,
+       c.metTargetOrders AS metTargetOrders,
+       c.completedMetOrders AS completedMetOrders,
+       c.plannedQuantity AS plannedQuantity,
+       c.actualQuantity AS actualQuantity
+"""
+
+
+def efficiency_from_counter(row) -> dict:
+    """카운터 행 → OEE 지표 (기존 /equipment-efficiency 응답 형식)."""
+    total = row["totalOrders"] or 0
+    availability = row["completedOrders"] / total if total else 0.0
+    performance = row["metTargetOrders"] / total if total else 0.0
+    quality = row["completedMetOrders"] / total if total else 0.0
+    return {
+        "equipmentId": row["equipmentId"],
+        "totalOrders": total,
+        "plannedQuantity": row["plannedQuantity"],
+        "actualQuantity": row["actualQuantity"],
+        "availability": availability,
+        "performance": performance,
+        "quality": quality,
+        "oee": availability * performance * quality,
+    }
@@ -0,0 +1,89 @@
+"""
+품질 검사 결과의 시간 버킷 롤업 (:QualityRollup {granularity, bucket, result, count}).
+품질 데이터 생성 시(services.ingest) hour/day/week 버킷 카운트를 같은 쿼리에서 증가시키므로,
+트렌드 조회는 원본 QualityControl 노드를 스캔하지 않고 기간 내 버킷만 읽음.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from fastapi import HTTPException
+
+from config import QUALITY_TREND_MAX_BUCKETS
+from db.queries import register_query
+
+GRANULARITIES = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+_PERIOD_RE = re.compile(r"^(\d+)([hdw])$")
+_PERIOD_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_period(period: str) -> timedelta:
+    """'24h', '7d', '12w' 형식의 기간 → timedelta. 형식이 틀리면 400."""
+    m = _PERIOD_RE.match(period.strip().lower())
+    if not m or int(m.group(1)) == 0:
+        raise HTTPException(status_code=400, detail=f"Invalid period: {period} (e.g. 24h, 7d, 12w)")
+    return timedelta(**{_PERIOD_UNITS[m.group(2)]: int(m.group(1))})
+
+
+def _as_utc(ts: datetime) -> datetime:
+    """타임존 없는 시각은 UTC로 간주."""
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def truncate(ts: datetime, granularity: str) -> datetime:
+    """버킷 시작 시각 (UTC). week는 월요일 00:00 (Neo4j datetime.truncate('week')와 동일)."""
+    ts = _as_utc(ts)
+    if granularity == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    return day - timedelta(days=day.weekday())
+
+
+def rollup_buckets(ts: datetime) -> List[Dict]:
+    """측정 시각이 속하는 단위별 버킷 목록 (수집 쿼리의 row.buckets)."""
+    return [{"granularity": g, "bucket": truncate(ts, g)} for g in GRANULARITIES]
+
+
+def trend_range(period: str, granularity: str, now: datetime = None) -> Tuple[datetime, int]:
+    """(시작 버킷, 버킷 수). 단위가 잘못되었거나 버킷 수가 상한을 넘으면 400."""
+    if granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid granularity: {granularity} (one of {', '.join(GRANULARITIES)})",
+        )
+    span = parse_period(period)
+    n_buckets = -(-span // GRANULARITIES[granularity])
+    if n_buckets > QUALITY_TREND_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{period} by {granularity} is {n_buckets} buckets (max {QUALITY_TREND_MAX_BUCKETS})",
+        )
+    now = now or datetime.now(timezone.utc)
+    return truncate(now - span, granularity), n_buckets
+
+
+TREND_QUERY = register_query("analytics.quality_trend", """
+MATCH (r:QualityRollup)
+WHERE r.granularity = $granularity AND r.bucket >= $start
+RETURN r.bucket AS bucket, r.result AS result, r.count AS count
+ORDER BY bucket, result
+""", granularity="day", start=datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+# 기존 품질 데이터로 전체 롤업 재계산 (초기 적재·불일치 복구용)
+REBUILD_ROLLUPS = register_query("analytics.quality_trend.rebuild", """
+MATCH (r:QualityRollup) DETACH DELETE r
+WITH count(*) AS _
+MATCH (q:QualityControl)
+WHERE q.timestamp IS NOT NULL
+UNWIND $granularities AS g
+WITH g, datetime.truncate(g, datetime({datetime: q.timestamp, timezone: '+00:00'})) AS bucket, q.qualityResult AS result, count(*) AS n
+CREATE (r:QualityRollup {granularity: g, bucket: bucket, result: result, count: n})
+RETURN count(r) AS bucketCount
+""", allow=("NodeByLabelScan",), granularities=list(GRANULARITIES))
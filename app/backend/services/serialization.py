@@ -0,0 +1,88 @@
+"""
+orjson 기반 응답 직렬화.
+드라이버 레코드·Neo4j 타입(temporal·spatial·Node 등)을 jsonable_encoder 없이 바로 JSON bytes로 변환하고,
+목록 응답은 records(행마다 객체) 또는 columns(columns + rows 배열) 형태로 반환.
+"""
+from decimal import Decimal
+from typing import Iterable, List, Optional, Sequence
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response
+from neo4j import Record
+from neo4j.graph import Node, Path, Relationship
+from neo4j.spatial import Point
+from neo4j.time import Date, DateTime, Duration, Time
+
+SHAPES = ("records", "columns")
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+_TEMPORAL = (DateTime, Date, Time, Duration)
+
+
+def _default(obj):
+    """orjson이 기본 지원하지 않는 타입 변환. Node·Relationship은 기존 응답과 같이 속성 dict."""
+    if isinstance(obj, Record):
+        return dict(obj)
+    if isinstance(obj, _TEMPORAL):
+        return obj.iso_format()
+    if isinstance(obj, (Node, Relationship)):
+        return dict(obj)
+    if isinstance(obj, Path):
+        return [dict(node) for node in obj.nodes]
+    if isinstance(obj, Point):
+        return {"srid": obj.srid, "coordinates": list(obj)}
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(payload) -> bytes:
+    return orjson.dumps(payload, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson으로 렌더링하는 JSONResponse (앱 기본 응답 클래스)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def json_response(payload, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """payload를 바로 직렬화한 응답. 엔드포인트가 dict를 반환할 때의 jsonable_encoder 변환을 건너뜀."""
+    return Response(content=dumps(payload), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def _check_shape(shape: str) -> None:
+    if shape not in SHAPES:
+        raise HTTPException(status_code=400, detail=f"Invalid shape: {shape} ({', '.join(SHAPES)})")
+
+
+def table(rows: List[Record], shape: str = "records", exclude: Iterable[str] = ()):
+    """
+    레코드 목록을 응답 형태로 변환.
+    records: 레코드 목록 그대로 (직렬화 시 행마다 객체).
+    columns: {"columns": [...], "rows": [[...], ...]} (행마다 dict를 만들지 않음).
+    exclude: 응답에서 뺄 컬럼 (cursor 계산용 컬럼 등).
+    """
+    _check_shape(shape)
+    keys = list(rows[0].keys()) if rows else []
+    if exclude:
+        keys = [k for k in keys if k not in exclude]
+    if shape == "columns":
+        if exclude:
+            return {"columns": keys, "rows": [[row[k] for k in keys] for row in rows]}
+        return {"columns": keys, "rows": [row.values() for row in rows]}
+    if exclude:
+        return [{k: row[k] for k in keys} for row in rows]
+    return rows
+
+
+def tuple_table(columns: Sequence[str], rows: List[tuple], shape: str = "records"):
+    """메모리 조회 결과(컬럼 순 튜플 목록)를 table()과 같은 응답 형태로 변환."""
+    _check_shape(shape)
+    if shape == "columns":
+        return {"columns": list(columns), "rows": rows}
+    return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,113 @@
+"""
+SHACL 검증을 별도 프로세스 풀에서 실행 (이벤트 루프·API 프로세스 메모리와 분리).
+검증 통과 시 큰 데이터 파일은 워커가 N-Triples로 변환해 두어 청크 임포트에 사용.
+"""
+import asyncio
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+from config import SHACL_MAX_WORKERS, SHACL_TIMEOUT_SECONDS
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# 워커 내부 타이머가 먼저 중단하도록 바깥 대기에는 여유를 둠
+_OUTER_TIMEOUT_GRACE_SECONDS = 10.0
+
+
+class ValidationTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise ValidationTimeout()
+
+
+def _validate_worker(
+    data_path: str, shapes_path: str, nt_path: Optional[str], timeout: float
+) -> Tuple[bool, str]:
+    """워커 프로세스: 파싱 + pyshacl 검증. nt_path가 주어지고 통과하면 N-Triples로 변환."""
+    from rdflib import Graph
+    from pyshacl import validate
+
+    use_alarm = hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        data_g = Graph().parse(data_path, format="turtle")
+        shapes_g = Graph().parse(shapes_path, format="turtle")
+        conforms, _, report_text = validate(
+            data_g, shacl_graph=shapes_g, inference="rdfs", serialize_report_graph=True
+        )
+        del shapes_g
+        if conforms and nt_path:
+            data_g.skolemize().serialize(destination=nt_path, format="nt", encoding="utf-8")
+        return conforms, report_text
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=SHACL_MAX_WORKERS)
+        return _pool
+
+
+def _reset_pool() -> None:
+    """응답 없는 워커 강제 종료 후 풀 재생성 (다음 요청 시)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is None:
+        return
+    for process in list(getattr(pool, "_processes", {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def validate_files(
+    data_path: str,
+    shapes_path: str,
+    nt_path: Optional[str] = None,
+    timeout: float = SHACL_TIMEOUT_SECONDS,
+) -> Tuple[bool, str]:
+    """
+    프로세스 풀에서 SHACL 검증. (conforms, report_text) 반환.
+    시간 초과 시 504, 파싱 오류 등은 400.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        _get_pool(), _validate_worker, data_path, shapes_path, nt_path, timeout
+    )
+    try:
+        return await asyncio.wait_for(future, timeout + _OUTER_TIMEOUT_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        # 워커 내부 타이머로 중단되지 않은 경우: 워커를 강제 종료
+        _reset_pool()
+        raise HTTPException(status_code=504, detail=f"SHACL validation exceeded {timeout:.0f}s budget")
+    except ValidationTimeout:
+        raise HTTPException(status_code=504, detail=f"SHACL validation exceeded {timeout:.0f}s budget")
+    except BrokenProcessPool:
+        _reset_pool()
+        raise HTTPException(status_code=503, detail="SHACL worker pool was restarted, please retry")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Validation failed: {e}")
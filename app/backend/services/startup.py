@@ -0,0 +1,35 @@
+"""
+기동 프로파일: 라우터 모듈 import·lifespan 단계별 소요 시간 (GET /health/startup).
+무거운 의존성(scikit-learn·rdflib·pyshacl 등)은 해당 엔드포인트 첫 사용 시 import되므로 현재 로드 여부도 함께 보고.
+"""
+import importlib
+import sys
+import time
+from types import ModuleType
+from typing import Dict
+
+# 기동 경로에서 import되면 안 되는 모듈 (첫 사용 시 lazy import). pyarrow·pandas는 neo4j 드라이버가 설치 여부를 확인하며 import
+HEAVY_MODULES = ("sklearn", "scipy", "joblib", "rdflib", "pyshacl")
+
+_imports: Dict[str, float] = {}
+_phases: Dict[str, float] = {}
+
+
+def timed_import(name: str) -> ModuleType:
+    """모듈 import 후 소요 시간(초) 기록 (이미 로드된 하위 모듈은 포함되지 않음)."""
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    _imports[name] = time.perf_counter() - started
+    return module
+
+
+def record_phase(name: str, seconds: float) -> None:
+    _phases[name] = seconds
+
+
+def startup_profile() -> dict:
+    return {
+        "imports": {name: round(sec, 4) for name, sec in _imports.items()},
+        "phases": {name: round(sec, 4) for name, sec in _phases.items()},
+        "heavyModulesLoaded": [m for m in HEAVY_MODULES if m in sys.modules],
+    }
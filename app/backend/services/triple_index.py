@@ -0,0 +1,347 @@
+"""
+온톨로지 계층 Triple in-process 미러 (TRIPLE_INDEX_ENABLED).
+URI·predicate를 정수 id로 사전 인코딩(정렬된 term 목록의 위치라 id 순서 = 문자열 순서)하고,
+SPO / POS / OSP 순으로 정렬된 int32 컬럼 배열(NumPy)에서 이진 탐색으로 패턴 조회.
+TRIPLE_INDEX_PREDICATES의 관계만 담으며 Neo4j 또는 ONTOLOGY_DIR의 TTL에서 한 번 로드하고,
+Triple 쓰기 경로의 변경은 대기열에 모았다가 다음 조회 때 배열을 재구성해 반영.
+인덱스에 없는 노드가 관련된 쓰기, 벌크·임포트처럼 범위를 알기 어려운 쓰기는 stale로 표시해 다음 조회 때 다시 로드.
+"""
+import bisect
+import glob
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config import ONTOLOGY_DIR, TRIPLE_INDEX_PREDICATES, TRIPLE_INDEX_SOURCE
+from db.neo4j import neo4j_read
+from db.queries import register_query
+from services.triples import rel_type
+
+NEO4J, TTL = "neo4j", "ttl"
+SOURCES = (NEO4J, TTL)
+
+# 컬럼 순서: 각 인덱스가 (s, p, o) 중 어느 위치를 앞에서부터 정렬 키로 쓰는지
+_ORDERS = {"spo": (0, 1, 2), "pos": (1, 2, 0), "osp": (2, 0, 1)}
+# n10s SHORTEN과 같은 접두사를 쓰는 표준 어휘. 그 외 네임스페이스의 predicate는 local name (기존 관계 타입 표기)
+_VOCAB_PREFIXES = {
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#": "rdf",
+    "http://www.w3.org/2000/01/rdf-schema#": "rdfs",
+    "http://www.w3.org/2002/07/owl#": "owl",
+    "http://www.w3.org/2004/02/skos/core#": "skos",
+}
+# prefix 범위의 상한 (prefix로 시작하는 모든 문자열보다 큼)
+_MAX_CHAR = "\U0010ffff"
+
+
+def _load_query(predicate: str) -> str:
+    return f"""
+    MATCH (s:Resource)-[:{rel_type(predicate)}]->(o:Resource)
+    RETURN s.uri AS subject, o.uri AS object,
+           coalesce(s.`rdfs__label`, s.name) AS subject_label,
+           coalesce(o.`rdfs__label`, o.name) AS object_label
+    """
+
+
+# 감사용 대표 predicate (실행 계획은 타입과 무관)
+register_query("ontology.triple_index.load", _load_query("hasPart"))
+
+
+def cursor_row(row: tuple) -> dict:
+    """
+    match() 결과 행 → encode_cursor 입력. 미러에는 관계 id가 없으므로 rid는 모든 elementId보다 큰 값으로 두어
+    같은 (s, p, o)의 관계들을 이미 지나간 것으로 취급 (Neo4j로 이어 조회해도 중복 없음).
+    """
+    return {"subject": row[0], "predicate": row[1], "object": row[2], "rid": _MAX_CHAR}
+
+
+def _predicate_name(uri: str) -> str:
+    """TTL predicate URI → Neo4j 관계 타입 이름."""
+    for namespace, prefix in _VOCAB_PREFIXES.items():
+        if uri.startswith(namespace):
+            return f"{prefix}__{uri[len(namespace):]}"
+    return uri.rsplit("#", 1)[-1].rsplit("/", 1)[-1]
+
+
+def _range(cols: Sequence[np.ndarray], keys: Sequence[int]) -> Tuple[int, int]:
+    """앞쪽 컬럼부터 keys와 일치하는 행 구간 [lo, hi)."""
+    lo, hi = 0, len(cols[0])
+    for col, key in zip(cols, keys):
+        segment = col[lo:hi]
+        lo, hi = lo + int(segment.searchsorted(key, "left")), lo + int(segment.searchsorted(key, "right"))
+    return lo, hi
+
+
+def _build(s: np.ndarray, p: np.ndarray, o: np.ndarray) -> Dict[str, Tuple[np.ndarray, ...]]:
+    """(s, p, o) 컬럼에서 중복을 제거하고 세 정렬 순서의 컬럼 배열 생성."""
+    perm = np.lexsort((o, p, s))
+    s, p, o = s[perm], p[perm], o[perm]
+    if len(s):
+        keep = np.ones(len(s), dtype=bool)
+        keep[1:] = (s[1:] != s[:-1]) | (p[1:] != p[:-1]) | (o[1:] != o[:-1])
+        s, p, o = s[keep], p[keep], o[keep]
+    cols = (s, p, o)
+    orders = {"spo": cols}
+    for name, (a, b, c) in _ORDERS.items():
+        if name == "spo":
+            continue
+        perm = np.lexsort((cols[c], cols[b], cols[a]))
+        orders[name] = tuple(np.ascontiguousarray(cols[i][perm]) for i in (a, b, c))
+    return orders
+
+
+def _choose_order(s: Optional[int], p: Optional[int], o: Optional[int]) -> Tuple[str, List[int]]:
+    """지정된 term이 모두 앞쪽 정렬 키가 되는 인덱스와 그 키."""
+    if s is not None:
+        if p is not None:
+            return "spo", [k for k in (s, p, o) if k is not None]
+        if o is not None:
+            return "osp", [o, s]
+        return "spo", [s]
+    if p is not None:
+        return "pos", [k for k in (p, o) if k is not None]
+    if o is not None:
+        return "osp", [o]
+    return "spo", []
+
+
+class TripleIndex:
+    """스레드 안전 Triple 미러. 조회 전 ensure_loaded() 호출."""
+
+    COLUMNS = ("subject", "predicate", "object", "subject_label", "object_label")
+
+    def __init__(self, predicates: Iterable[str], source: str = NEO4J):
+        if source not in SOURCES:
+            raise ValueError(f"Invalid triple index source: {source} ({', '.join(SOURCES)})")
+        self.predicates = frozenset(predicates)
+        self.source = source
+        # term id → URI/predicate (정렬), 라벨
+        self._terms: List[str] = []
+        self._labels: List[Optional[str]] = []
+        self._orders: Dict[str, Tuple[np.ndarray, ...]] = _build(*(np.empty(0, dtype=np.int32),) * 3)
+        # 다음 조회 때 반영할 변경 (term id 튜플)
+        self._added: Set[Tuple[int, int, int]] = set()
+        self._deleted: Set[Tuple[int, int, int]] = set()
+        self._removed: Set[int] = set()
+        self._stale = True
+        # 쓰기마다 증가. 로드 도중 쓰기가 있었다면 로드 후에도 stale 유지
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def covers(self, predicate: Optional[str]) -> bool:
+        return predicate in self.predicates
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    def ensure_loaded(self) -> None:
+        if not self._stale:
+            return
+        with self._load_lock:
+            if self._stale:
+                self.load()
+
+    def load(self) -> int:
+        """원본(Neo4j 또는 TTL)에서 전체 재구성. Triple 수 반환."""
+        with self._lock:
+            generation = self._generation
+        triples, labels = self._read_ttl() if self.source == TTL else self._read_neo4j()
+        terms = sorted({term for triple in triples for term in triple})
+        ids = {term: i for i, term in enumerate(terms)}
+        encoded = np.array([ids[term] for triple in triples for term in triple], dtype=np.int32).reshape(-1, 3)
+        orders = _build(encoded[:, 0], encoded[:, 1], encoded[:, 2])
+        with self._lock:
+            self._terms = terms
+            self._labels = [labels.get(term) for term in terms]
+            self._orders = orders
+            self._added, self._deleted, self._removed = set(), set(), set()
+            self._stale = generation != self._generation
+        return len(orders["spo"][0])
+
+    def _read_neo4j(self) -> Tuple[List[Tuple[str, str, str]], Dict[str, Optional[str]]]:
+        triples, labels = [], {}
+        for predicate in sorted(self.predicates):
+            for row in neo4j_read(_load_query(predicate)):
+                triples.append((row["subject"], predicate, row["object"]))
+                labels[row["subject"]] = row["subject_label"]
+                labels[row["object"]] = row["object_label"]
+        return triples, labels
+
+    def _read_ttl(self) -> Tuple[List[Tuple[str, str, str]], Dict[str, Optional[str]]]:
+        """ONTOLOGY_DIR의 TTL (shapes 제외). 파일 단위로 파싱 후 필요한 Triple만 남김."""
+        from rdflib import Graph, Literal, URIRef
+        from rdflib.namespace import RDFS
+
+        triples, labels = [], {}
+        paths = [
+            f for f in glob.glob(os.path.join(ONTOLOGY_DIR, "*.ttl"))
+            if not os.path.basename(f).lower().startswith("shapes")
+        ]
+        for path in sorted(paths):
+            g = Graph().parse(path, format="turtle")
+            for s, p, o in g:
+                if not isinstance(s, URIRef):
+                    continue
+                if p == RDFS.label and isinstance(o, Literal):
+                    labels.setdefault(str(s), str(o))
+                    continue
+                if not isinstance(o, URIRef):
+                    continue
+                name = _predicate_name(str(p))
+                if name in self.predicates:
+                    triples.append((str(s), name, str(o)))
+        return triples, labels
+
+    def mark_stale(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._stale = True
+
+    def _id(self, term: str) -> Optional[int]:
+        i = bisect.bisect_left(self._terms, term)
+        return i if i < len(self._terms) and self._terms[i] == term else None
+
+    def apply_triples(self, added: Iterable = (), deleted: Iterable = ()) -> None:
+        """단건 Triple 추가·삭제 반영. 인덱스에 없는 term(새 노드·라벨 불명)이 있으면 stale로 표시."""
+        with self._lock:
+            self._generation += 1
+            for t in added:
+                if t.predicate not in self.predicates:
+                    continue
+                key = (self._id(t.subject), self._id(t.predicate), self._id(t.object))
+                if None in key:
+                    self._stale = True
+                    continue
+                self._deleted.discard(key)
+                self._added.add(key)
+            for t in deleted:
+                if t.predicate not in self.predicates:
+                    continue
+                key = (self._id(t.subject), self._id(t.predicate), self._id(t.object))
+                if None in key:
+                    continue
+                self._added.discard(key)
+                self._deleted.add(key)
+
+    def remove_node(self, uri: str) -> None:
+        with self._lock:
+            self._generation += 1
+            node = self._id(uri)
+            if node is None:
+                return
+            self._removed.add(node)
+            self._added = {k for k in self._added if k[0] != node and k[2] != node}
+
+    def _flush(self) -> None:
+        """대기 중인 변경을 반영해 정렬 배열 재구성 (lock 안에서 호출)."""
+        if not (self._added or self._deleted or self._removed):
+            return
+        cols = self._orders["spo"]
+        s, p, o = cols
+        keep = np.ones(len(s), dtype=bool)
+        for key in self._deleted:
+            lo, hi = _range(cols, key)
+            keep[lo:hi] = False
+        if self._removed:
+            removed = np.fromiter(self._removed, dtype=np.int32)
+            keep &= ~(np.isin(s, removed) | np.isin(o, removed))
+        added = np.array(sorted(self._added), dtype=np.int32).reshape(-1, 3)
+        self._orders = _build(
+            np.concatenate([s[keep], added[:, 0]]),
+            np.concatenate([p[keep], added[:, 1]]),
+            np.concatenate([o[keep], added[:, 2]]),
+        )
+        self._added, self._deleted, self._removed = set(), set(), set()
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        return bisect.bisect_left(self._terms, prefix), bisect.bisect_left(self._terms, prefix + _MAX_CHAR)
+
+    def _after_mask(self, s: np.ndarray, p: np.ndarray, o: np.ndarray, after: dict) -> np.ndarray:
+        """(s, p, o) > cursor 인 행. 문자열 비교를 id 비교로 변환 (cursor term이 인덱스에 없어도 동작)."""
+        def greater(col, term):
+            return col >= bisect.bisect_right(self._terms, term)
+
+        def equal(col, term):
+            tid = self._id(term)
+            return col == tid if tid is not None else np.zeros(len(col), dtype=bool)
+
+        c_s, c_p, c_o = after["c_s"], after["c_p"], after["c_o"]
+        return greater(s, c_s) | (equal(s, c_s) & (greater(p, c_p) | (equal(p, c_p) & greater(o, c_o))))
+
+    def match(
+        self,
+        subject: Optional[str] = None,
+        predicate: Optional[str] = None,
+        object: Optional[str] = None,
+        subject_prefix: Optional[str] = None,
+        object_prefix: Optional[str] = None,
+        after: Optional[dict] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[tuple], int]:
+        """
+        패턴 조회. COLUMNS 순 튜플 목록을 (subject, predicate, object) 순으로 cursor(after) 이후 limit건.
+        두 번째 값은 cursor·limit 적용 전 일치 건수 (정확한 값).
+        """
+        with self._lock:
+            self._flush()
+            bound = []
+            for term in (subject, predicate, object):
+                tid = None if term is None else self._id(term)
+                if term is not None and tid is None:
+                    return [], 0
+                bound.append(tid)
+            name, keys = _choose_order(*bound)
+            cols = self._orders[name]
+            lo, hi = _range(cols, keys)
+            order = _ORDERS[name]
+            s, p, o = (cols[order.index(i)][lo:hi] for i in range(3))
+            mask = None
+            for col, prefix in ((s, subject_prefix), (o, object_prefix)):
+                if prefix:
+                    first, last = self._prefix_range(prefix)
+                    cond = (col >= first) & (col < last)
+                    mask = cond if mask is None else mask & cond
+            total = (hi - lo) if mask is None else int(mask.sum())
+            if after:
+                cond = self._after_mask(s, p, o, after)
+                mask = cond if mask is None else mask & cond
+            rows = np.arange(hi - lo) if mask is None else np.flatnonzero(mask)
+            # pos에서 predicate만 고정하면 (object, subject) 순이므로 재정렬. 그 외에는 이미 (s, p, o) 순
+            if name == "pos" and len(keys) == 1 and len(rows):
+                sort_key = s[rows].astype(np.int64) * len(self._terms) + o[rows]
+                if limit is not None and len(rows) > limit:
+                    top = np.argpartition(sort_key, limit - 1)[:limit]
+                    rows = rows[top[np.argsort(sort_key[top], kind="stable")]]
+                else:
+                    rows = rows[np.argsort(sort_key, kind="stable")]
+            if limit is not None:
+                rows = rows[:limit]
+            terms, labels = self._terms, self._labels
+            result = [
+                (terms[si], terms[pi], terms[oi], labels[si], labels[oi])
+                for si, pi, oi in zip(s[rows].tolist(), p[rows].tolist(), o[rows].tolist())
+            ]
+            return result, total
+
+    def stats(self) -> dict:
+        """Triple·term 수와 메모리 사용량(bytes, 정렬 배열 + term·라벨 문자열)."""
+        with self._lock:
+            arrays = sum(col.nbytes for cols in self._orders.values() for col in cols)
+            strings = sys.getsizeof(self._terms) + sum(sys.getsizeof(t) for t in self._terms)
+            strings += sys.getsizeof(self._labels) + sum(sys.getsizeof(label) for label in self._labels if label is not None)
+            return {
+                "source": self.source,
+                "predicates": sorted(self.predicates),
+                "stale": self._stale,
+                "triples": len(self._orders["spo"][0]),
+                "terms": len(self._terms),
+                "pendingChanges": len(self._added) + len(self._deleted) + len(self._removed),
+                "memoryBytes": {"arrays": arrays, "strings": strings},
+            }
+
+
+triple_index = TripleIndex(TRIPLE_INDEX_PREDICATES, TRIPLE_INDEX_SOURCE)
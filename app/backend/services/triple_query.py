@@ -0,0 +1,186 @@
+"""
+Triple 조회 플래너 (GET /ontology/triples).
+필터 조합과 count store 통계로 시작 지점을 골라, 관계 타입을 패턴에 넣고 :Resource {uri}로 앵커링한 Cypher 생성.
+  subject / object 지정 → uri unique index seek 후 확장 (해당 노드 degree로 총 건수 추정)
+  predicate만 → 관계 타입 스캔 후 정렬과 subject uri 인덱스 순서로 확장(LIMIT에서 중단) 중 예상 탐색량이 작은 쪽
+  subject_prefix / object_prefix → uri 인덱스 STARTS WITH range seek
+정렬은 항상 (subject, predicate, object, rid) keyset.
+"""
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+
+from config import TRIPLES_PAGE_SIZE, TRIPLES_STATS_TTL_SECONDS
+from db.neo4j import neo4j_read_async
+from db.queries import register_query
+from services.triples import KEYSET_CONDITION, rel_type
+
+# count store 통계 (apoc.meta.stats는 카운트 저장소만 읽으므로 그래프 크기와 무관)
+STATS_QUERY = register_query("ontology.triples.stats", """
+CALL apoc.meta.stats() YIELD labels, relCount, relTypesCount
+RETURN labels['Resource'] AS resources, relCount AS relationships, relTypesCount AS types
+""")
+
+# 시작 지점
+SUBJECT, OBJECT, TYPE_SCAN, SUBJECT_INDEX, OBJECT_INDEX, SCAN = (
+    "subject", "object", "typeScan", "subjectIndex", "objectIndex", "scan",
+)
+
+_RETURN = """RETURN s.uri AS subject, type(r) AS predicate, o.uri AS object,
+       coalesce(s.`rdfs__label`, s.name) AS subject_label,
+       coalesce(o.`rdfs__label`, o.name) AS object_label,
+       elementId(r) AS rid{estimate}"""
+_ORDER = "ORDER BY subject, predicate, object, rid"
+
+_stats: Optional[dict] = None
+_stats_at = 0.0
+
+
+async def graph_stats() -> Optional[dict]:
+    """
+    Resource 노드 수·전체/타입별 관계 수 (TTL 캐시). 조회 실패(apoc 없음 등) 시 마지막 값 또는 None → 기본 계획 사용.
+    실패도 조회 시각을 기록해 TTL 동안은 다시 시도하지 않음 (요청마다 실패 왕복 방지).
+    """
+    global _stats, _stats_at
+    if _stats_at == 0.0 or time.monotonic() - _stats_at > TRIPLES_STATS_TTL_SECONDS:
+        try:
+            rows = await neo4j_read_async(STATS_QUERY)
+        except HTTPException:
+            _stats_at = time.monotonic()
+            return _stats
+        row = rows[0] if rows else {}
+        _stats = {
+            "resources": row.get("resources") or 0,
+            "relationships": row.get("relationships") or 0,
+            "types": dict(row.get("types") or {}),
+        }
+        _stats_at = time.monotonic()
+    return _stats
+
+
+class TripleFilter:
+    def __init__(
+        self,
+        subject: Optional[str] = None,
+        predicate: Optional[str] = None,
+        object: Optional[str] = None,
+        subject_prefix: Optional[str] = None,
+        object_prefix: Optional[str] = None,
+    ):
+        self.subject = subject
+        self.predicate = predicate
+        self.object = object
+        self.subject_prefix = subject_prefix
+        self.object_prefix = object_prefix
+
+    def params(self) -> dict:
+        return {
+            k: v for k, v in (
+                ("subject", self.subject), ("object", self.object),
+                ("subject_prefix", self.subject_prefix), ("object_prefix", self.object_prefix),
+            ) if v
+        }
+
+
+def choose_start(f: TripleFilter, limit: Optional[int], ordered: bool, stats: Optional[dict]) -> str:
+    """
+    시작 지점 선택. predicate만 있으면 비용 비교:
+    타입 스캔은 해당 타입 관계 전체를 읽고 정렬(typed), subject 인덱스 순회는 limit건을 찾을 때까지
+    평균 limit × resources / typed 개 노드를 확장.
+    """
+    if f.subject:
+        return SUBJECT
+    if f.object:
+        return OBJECT
+    if not ordered:
+        return SUBJECT_INDEX if f.subject_prefix else OBJECT_INDEX if f.object_prefix else SCAN
+    if f.predicate and stats is not None and not f.subject_prefix:
+        typed = stats["types"].get(f.predicate, 0)
+        walk = (limit or TRIPLES_PAGE_SIZE) * stats["resources"] / max(typed, 1)
+        if typed <= walk:
+            return TYPE_SCAN
+    if f.object_prefix and not f.subject_prefix:
+        return OBJECT_INDEX
+    return SUBJECT_INDEX
+
+
+def triples_query(f: TripleFilter, start: str, after: bool, ordered: bool, limited: bool, with_estimate: bool) -> str:
+    """시작 지점에 맞는 Cypher 생성. with_estimate면 앵커 노드의 degree를 estimate 컬럼으로 반환."""
+    rel = f"[r:{rel_type(f.predicate)}]" if f.predicate else "[r]"
+    degree = f"[:{rel_type(f.predicate)}]" if f.predicate else "[]"
+    lines, where = [], []
+    estimate = ""
+    if start == SUBJECT:
+        lines.append("MATCH (s:Resource {uri: $subject})")
+        if with_estimate:
+            lines.append(f"WITH s, COUNT {{ (s)-{degree}->() }} AS estimate")
+            estimate = ",\n       estimate"
+        lines.append(f"MATCH (s)-{rel}->(o:Resource)")
+    elif start == OBJECT:
+        lines.append("MATCH (o:Resource {uri: $object})")
+        if with_estimate:
+            lines.append(f"WITH o, COUNT {{ (o)<-{degree}-() }} AS estimate")
+            estimate = ",\n       estimate"
+        lines.append(f"MATCH (s:Resource)-{rel}->(o)")
+    else:
+        lines.append(f"MATCH (s:Resource)-{rel}->(o:Resource)")
+        if start == SUBJECT_INDEX:
+            lines.append("USING INDEX s:Resource(uri)")
+            if not f.subject_prefix:
+                where.append("s.uri >= $c_s" if after else "s.uri IS NOT NULL")
+        elif start == OBJECT_INDEX:
+            lines.append("USING INDEX o:Resource(uri)")
+    if f.object and start != OBJECT:
+        where.append("o.uri = $object")
+    if f.subject_prefix:
+        where.append("s.uri STARTS WITH $subject_prefix")
+    if f.object_prefix:
+        where.append("o.uri STARTS WITH $object_prefix")
+    if after:
+        where.append(KEYSET_CONDITION)
+    if where:
+        lines.append("WHERE " + "\n  AND ".join(where))
+    lines.append(_RETURN.format(estimate=estimate))
+    if ordered:
+        lines.append(_ORDER)
+    if limited:
+        lines.append("LIMIT $limit")
+    return "\n".join(lines)
+
+
+def estimate_total(f: TripleFilter, start: str, stats: Optional[dict]) -> Optional[int]:
+    """
+    count store 기반 추정 총 건수 (subject/object 앵커는 쿼리 결과의 degree 사용).
+    prefix 필터는 반영하지 않으므로 상한. 통계가 없으면 None.
+    """
+    if start in (SUBJECT, OBJECT) or stats is None:
+        return None
+    if f.predicate:
+        return stats["types"].get(f.predicate, 0)
+    return stats["relationships"]
+
+
+# 감사용 대표 조합 (predicate는 hasPart, 실행 계획은 타입과 무관)
+_SAMPLE = {"subject": "ex:Equipment_1", "object": "ex:Equipment_2", "subject_prefix": "ex:Equipment_",
+           "object_prefix": "ex:Equipment_", "c_s": "ex:A", "c_p": "hasPart", "c_o": "ex:B", "c_r": ""}
+for _name, _filter, _start, _after, _allow in (
+    ("ontology.triples", TripleFilter(), SUBJECT_INDEX, False, ()),
+    ("ontology.triples.after", TripleFilter(), SUBJECT_INDEX, True, ()),
+    ("ontology.triples.subject", TripleFilter(subject="x"), SUBJECT, False, ()),
+    ("ontology.triples.object", TripleFilter(object="x"), OBJECT, False, ()),
+    ("ontology.triples.predicate", TripleFilter(predicate="hasPart"), TYPE_SCAN, False, ()),
+    ("ontology.triples.predicate.index", TripleFilter(predicate="hasPart"), SUBJECT_INDEX, False, ()),
+    ("ontology.triples.subject_prefix", TripleFilter(subject_prefix="x"), SUBJECT_INDEX, False, ()),
+    ("ontology.triples.object_prefix", TripleFilter(object_prefix="x"), OBJECT_INDEX, False, ()),
+):
+    register_query(
+        _name, triples_query(_filter, _start, _after, True, True, _start in (SUBJECT, OBJECT)),
+        allow=_allow, limit=TRIPLES_PAGE_SIZE + 1,
+        **{k: v for k, v in _SAMPLE.items() if k in _filter.params() or (_after and k.startswith("c_"))},
+    )
+# 정렬 없는 전체 스트리밍 (stream=true, 필터 없음)
+register_query(
+    "ontology.triples.scan", triples_query(TripleFilter(), SCAN, False, False, False, False),
+    allow=("NodeByLabelScan",),
+)
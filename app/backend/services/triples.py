@@ -0,0 +1,144 @@
+"""
+Triple 벌크 연산: predicate별로 묶어 UNWIND 배치로 적용.
+항목별 오류(노드 없음·관계 없음)를 보고하고, atomic 모드에서는 전체를 한 트랜잭션으로 처리.
+Triple 조회용 keyset cursor 인코딩 포함.
+"""
+import base64
+import json
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+from fastapi import HTTPException
+
+from config import BULK_CHUNK_SIZE
+from db.neo4j import neo4j_transaction
+from db.queries import register_query
+from models.schemas import BulkTripleOperation, Triple
+
+
+# (subject, predicate, object, relationship elementId) 순 keyset 조건
+KEYSET_CONDITION = """(
+        s.uri > $c_s
+        OR (s.uri = $c_s AND type(r) > $c_p)
+        OR (s.uri = $c_s AND type(r) = $c_p AND o.uri > $c_o)
+        OR (s.uri = $c_s AND type(r) = $c_p AND o.uri = $c_o AND elementId(r) > $c_r)
+    )"""
+
+
+def encode_cursor(row) -> str:
+    """마지막 행의 정렬 키를 불투명한 cursor 문자열로 인코딩."""
+    key = [row["subject"], row["predicate"], row["object"], row["rid"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """cursor를 keyset 조건 파라미터로 디코딩. 형식 오류 시 400."""
+    try:
+        c_s, c_p, c_o, c_r = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"c_s": c_s, "c_p": c_p, "c_o": c_o, "c_r": c_r}
+
+
+class _BulkAborted(Exception):
+    """atomic 모드에서 항목 오류 발생 시 트랜잭션 롤백용."""
+
+
+def rel_type(predicate: str) -> str:
+    """predicate를 Cypher 관계 타입 식별자로 이스케이프 (백틱 인용)."""
+    return "`" + predicate.replace("`", "``") + "`"
+
+
+def _add_cypher(predicate: str) -> str:
+    return f"""
+    UNWIND $rows AS row
+    OPTIONAL MATCH (s:Resource {{uri: row.subject}})
+    OPTIONAL MATCH (o:Resource {{uri: row.object}})
+    FOREACH (_ IN CASE WHEN s IS NOT NULL AND o IS NOT NULL THEN [1] ELSE [] END |
+        CREATE (s)-[:{rel_type(predicate)}]->(o))
+    RETURN row.idx AS idx, s IS NOT NULL AS subjectFound, o IS NOT NULL AS objectFound
+    """
+
+
+def _delete_cypher(predicate: str) -> str:
+    return f"""
+    UNWIND $rows AS row
+    OPTIONAL MATCH (:Resource {{uri: row.subject}})-[r:{rel_type(predicate)}]->(:Resource {{uri: row.object}})
+    WITH row, collect(r) AS rels
+    FOREACH (r IN rels | DELETE r)
+    RETURN row.idx AS idx, size(rels) AS deleted
+    """
+
+
+# 감사용 대표 쿼리 (predicate만 다르고 실행 계획은 동일)
+_SAMPLE_ROWS = [{"idx": 0, "subject": "ex:Equipment_1", "object": "ex:Equipment_2"}]
+register_query("ontology.triples.bulk_add", _add_cypher("hasPart"), rows=_SAMPLE_ROWS)
+register_query("ontology.triples.bulk_delete", _delete_cypher("hasPart"), rows=_SAMPLE_ROWS)
+
+
+def _chunks(triples: List[Triple], chunk_size: int) -> Iterator[Tuple[str, List[dict]]]:
+    """(predicate, rows) 배치 생성. rows에는 원래 요청 내 인덱스(idx)를 포함."""
+    by_predicate: Dict[str, List[dict]] = defaultdict(list)
+    for idx, t in enumerate(triples):
+        by_predicate[t.predicate].append({"idx": idx, "subject": t.subject, "object": t.object})
+    for predicate, rows in by_predicate.items():
+        for i in range(0, len(rows), chunk_size):
+            yield predicate, rows[i:i + chunk_size]
+
+
+def _apply_add_chunk(tx, predicate: str, rows: List[dict], results: dict) -> None:
+    for rec in tx.run(_add_cypher(predicate), rows=rows):
+        if rec["subjectFound"] and rec["objectFound"]:
+            results["added"] += 1
+        else:
+            missing = "subject" if not rec["subjectFound"] else "object"
+            results["errors"].append(f"Add error [{rec['idx']}]: {missing} node not found")
+
+
+def _apply_delete_chunk(tx, predicate: str, rows: List[dict], results: dict) -> None:
+    for rec in tx.run(_delete_cypher(predicate), rows=rows):
+        if rec["deleted"] > 0:
+            results["deleted"] += rec["deleted"]
+        else:
+            results["errors"].append(f"Delete error [{rec['idx']}]: triple not found")
+
+
+def _batches(operation: BulkTripleOperation, chunk_size: int):
+    for predicate, rows in _chunks(operation.add, chunk_size):
+        yield "Add", _apply_add_chunk, predicate, rows
+    for predicate, rows in _chunks(operation.delete, chunk_size):
+        yield "Delete", _apply_delete_chunk, predicate, rows
+
+
+def apply_bulk_operation(operation: BulkTripleOperation, chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+    """
+    add → delete 순으로 predicate별 UNWIND 배치 적용.
+    기본 모드: 배치(청크)마다 트랜잭션 커밋, 실패한 배치는 해당 항목 오류로 보고 후 계속 진행.
+    atomic 모드: 하나의 트랜잭션, 항목 오류가 하나라도 있으면 전체 롤백.
+    """
+    results = {"added": 0, "deleted": 0, "errors": [], "committed": True}
+    if operation.atomic:
+        try:
+            with neo4j_transaction("ontology.triples.bulk") as tx:
+                for _, apply, predicate, rows in _batches(operation, chunk_size):
+                    apply(tx, predicate, rows, results)
+                if results["errors"]:
+                    raise _BulkAborted()
+        except (_BulkAborted, HTTPException) as e:
+            if isinstance(e, HTTPException):
+                results["errors"].append(f"Transaction error: {e.detail}")
+            results.update(added=0, deleted=0, committed=False)
+        return results
+
+    for kind, apply, predicate, rows in _batches(operation, chunk_size):
+        chunk_results = {"added": 0, "deleted": 0, "errors": []}
+        try:
+            with neo4j_transaction("ontology.triples.bulk") as tx:
+                apply(tx, predicate, rows, chunk_results)
+        except HTTPException as e:
+            results["errors"].extend(f"{kind} error [{row['idx']}]: {e.detail}" for row in rows)
+            continue
+        results["added"] += chunk_results["added"]
+        results["deleted"] += chunk_results["deleted"]
+        results["errors"].extend(chunk_results["errors"])
+    return results
@@ -0,0 +1,88 @@
+"""
+업로드 파일을 디스크로 스풀링. 전체 내용을 메모리에 올리지 않고 크기 제한을 적용.
+Starlette는 엔드포인트 호출 전에 multipart 본문 전체를 받아 스풀링하므로,
+요청 본문 크기 제한은 UploadLimitMiddleware에서 수신 단계에 적용 (파일별 제한은 spool_upload).
+"""
+import asyncio
+from typing import BinaryIO, Dict
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from config import AUTOML_MAX_UPLOAD_BYTES, SHACL_MAX_UPLOAD_BYTES
+
+COPY_BLOCK_BYTES = 1024 * 1024
+# multipart 경계·헤더·폼 필드 여유분
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+
+
+def body_limit(max_file_bytes: int, files: int) -> int:
+    return max_file_bytes * files + MULTIPART_OVERHEAD_BYTES
+
+
+# 업로드 엔드포인트별 요청 본문 최대 크기 (파일 수 × 파일별 제한)
+UPLOAD_BODY_LIMITS: Dict[str, int] = {
+    "/ontology/validate-and-import": body_limit(SHACL_MAX_UPLOAD_BYTES, files=2),
+    "/automl/fit/upload": body_limit(AUTOML_MAX_UPLOAD_BYTES, files=2),
+    "/automl/jobs/upload": body_limit(AUTOML_MAX_UPLOAD_BYTES, files=2),
+    "/automl/predict/upload": body_limit(AUTOML_MAX_UPLOAD_BYTES, files=1),
+}
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Request body exceeds limit of {limit} bytes")
+
+
+class UploadLimitMiddleware:
+    """
+    업로드 요청 본문 크기 제한 (ASGI). Content-Length가 제한을 넘으면 본문을 받기 전에 413,
+    chunked 전송 등 길이를 모르는 요청은 받은 바이트를 세다가 초과 시점에 413.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > limit:
+            error = _too_large(limit)
+            await JSONResponse({"detail": error.detail}, status_code=error.status_code)(scope, receive, send)
+            return
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # 폼 파싱 중 발생 → FastAPI가 HTTPException을 그대로 413 응답으로 변환
+                    raise _too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def _copy_limited(src: BinaryIO, dst_path: str, max_bytes: int) -> int:
+    written = 0
+    with open(dst_path, "wb") as dst:
+        for block in iter(lambda: src.read(COPY_BLOCK_BYTES), b""):
+            written += len(block)
+            if written > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Upload exceeds limit of {max_bytes} bytes",
+                )
+            dst.write(block)
+    return written
+
+
+async def spool_upload(upload: UploadFile, dst_path: str, max_bytes: int) -> int:
+    """UploadFile을 dst_path로 블록 단위 복사 (스레드에서 실행). 쓴 바이트 수 반환, 초과 시 413."""
+    await upload.seek(0)
+    return await asyncio.to_thread(_copy_limited, upload.file, dst_path, max_bytes)